@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Per-category totals for the Expense Tracker
+Keeps running totals for every (category, month) pair so the category summary
+never has to read the transactions again
+
+Think of it like a Redux store slice that every "add transaction" action
+updates: instead of recomputing totals from the full list on every render,
+we keep them up to date as rows come in.
+
+category_totals.json is an APPEND-ONLY log: the first line holds every total, and
+each save adds one line with just the totals that changed (last line wins).
+Saving after an add costs one short write however many months there are;
+once COMPACT_EVERY lines pile up, the file is rewritten as a single line.
+"""
+
+from money import from_cents  # Totals are kept in whole cents
+from side_files import JsonLinesLog  # Append-only JSON-lines file handling
+
+
+class CategoryAggregates(JsonLinesLog):
+    """count / income / expenses / min / max per (category, "YYYY-MM"), in cents"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        # DICTIONARY - {(category, month): [count, income, expenses, min, max]}
+        # Money values are whole cents (ints), so the sums never drift
+        self.totals = {}
+        self.covered = 0  # Storage bookmark the totals are up to date with
+        self.changed = set()  # Keys added to since the last save
+        self._load()
+
+    def _load(self):
+        """Read saved totals from disk if there are any"""
+        for data in self._read_log():
+            self.covered = data["covered"]
+            # JSON has no tuple keys, so each entry is saved as a flat list
+            for category, month, *values in data["totals"]:
+                self.totals[(category, month)] = values
+
+    def save(self, covered):
+        """Write the totals to disk, noting which storage position they cover"""
+        self.covered = covered
+        if self._can_append():
+            # Just the changed totals, as one appended line
+            self._append_line({
+                "covered": covered,
+                "totals": [[*key, *self.totals[key]] for key in self.changed],
+            })
+        else:
+            self._rewrite_log({
+                "covered": covered,
+                "totals": [[*key, *values] for key, values in self.totals.items()],
+            })
+        self.changed.clear()
+
+    def add(self, date, amount, category):
+        """Fold one transaction (amount in whole cents) into the running totals - O(1)"""
+        key = (category, str(date)[:7])  # "YYYY-MM-DD ..." -> "YYYY-MM"
+        self.changed.add(key)
+        entry = self.totals.get(key)
+        if entry is None:
+            self.totals[key] = [
+                1,
+                amount if amount > 0 else 0,
+                -amount if amount < 0 else 0,
+                amount,
+                amount,
+            ]
+            return
+        entry[0] += 1
+        if amount > 0:
+            entry[1] += amount
+        else:
+            entry[2] -= amount  # Expenses are stored as a positive total
+        entry[3] = min(entry[3], amount)
+        entry[4] = max(entry[4], amount)
+
+    def catch_up(self, storage):
+        """
+        Make sure the totals agree with `storage`
+
+        Only rows after the saved bookmark are read. If the storage shrank
+        (reset/replaced outside the tracker) everything is rebuilt. Callers
+        hold the tracker lock, so the saved file can't race another tracker.
+        """
+        end = storage.end_position()
+        if end == self.covered:
+            return False  # Already in sync
+        if end < self.covered:
+            self.totals = {}
+            self.covered = 0
+            self.rewrite = True
+        for bookmark, transaction in storage.scan_from(self.covered):
+            if bookmark > end:
+                break  # Added after we measured `end` - the next catch_up gets it
+            self.add(transaction.date, transaction.amount, transaction.category)
+        self.save(end)
+        return True
+
+    def rebuild(self, storage):
+        """Throw the totals away and recompute them from every row"""
+        self.totals = {}
+        self.covered = 0
+        self.rewrite = True
+        self.catch_up(storage)
+        if not self.totals:  # Nothing to scan - still write an empty cache
+            self.save(storage.end_position())
+
+    def summary(self, month=None):
+        """
+        Combine the months into one row per category
+
+        Returns {category: (count, income, expenses, min, max)} with the money
+        in dollars. The work depends on how many categories/months there
+        are, not on row count.
+        """
+        combined = {}
+        for (category, entry_month), values in self.totals.items():
+            if month is not None and entry_month != month:
+                continue
+            count, income, expenses, low, high = values
+            if category in combined:
+                c, i, e, lo, hi = combined[category]
+                combined[category] = (
+                    c + count,
+                    i + income,
+                    e + expenses,
+                    min(lo, low),
+                    max(hi, high),
+                )
+            else:
+                combined[category] = (count, income, expenses, low, high)
+        # Cents -> dollars only at the very end, after all the adding up
+        return {
+            category: (count, *(from_cents(cents) for cents in money))
+            for category, (count, *money) in combined.items()
+        }
+
+    def clear(self):
+        """Forget every total (used by reset)"""
+        self._remove_log()
+        self.totals = {}
+        self.covered = 0
+        self.changed.clear()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Balance snapshots for the Expense Tracker
+Checks that balance.txt agrees with the Balance column in the transactions
+
+Every `interval` rows (and whenever the balance is set by hand) we write a
+snapshot line: "where the rows ended" + "what the balance was there".
+To verify or rebuild the balance we start from the newest snapshot and only
+replay the rows added after it - like a video game save point instead of
+replaying the whole game from the start.
+"""
+
+import csv  # Snapshots are stored as a tiny CSV file
+import os  # For checking/removing files
+from collections import namedtuple  # Lightweight record types
+
+from money import format_cents, from_cents, to_cents  # Exact integer-cents money
+
+# One save point: storage bookmark (byte offset / row id), rows so far, balance
+Snapshot = namedtuple("Snapshot", ["position", "rows", "balance"])
+
+# The result of a verify/recompute run
+BalanceCheck = namedtuple(
+    "BalanceCheck",
+    [
+        "balance",  # Balance recomputed from the rows
+        "rows_replayed",  # How many rows we had to read (the "delta")
+        "jumps",  # Rows whose Balance didn't follow from the row before (replay restarts there)
+        "from_snapshot",  # The snapshot we started from (None = full replay)
+    ],
+)
+
+
+class BalanceLedger:
+    """Periodic balance snapshots plus an O(delta) verify/recompute"""
+
+    def __init__(self, storage, path, interval=1000):
+        self.storage = storage  # Any backend with end_position()/scan_from()
+        self.path = path  # Where snapshot lines are appended
+        self.interval = interval  # Take a snapshot every N rows
+        self.last = None
+        self._file_size = None  # Size of the snapshot file when we last read it
+        self.refresh()
+        # Rows since the last snapshot (we only need the count, not the rows)
+        self.pending = 0
+
+    def refresh(self):
+        """
+        Re-read the newest snapshot if the file changed on disk
+
+        Another tracker process (Set Balance, a verify) may have added one
+        since we loaded it. Snapshots are only ever appended, so an
+        unchanged size means there is nothing new - one stat() call.
+        """
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else None
+        if size == self._file_size:
+            return
+        self._file_size = size
+        self.last = None
+        if size is None:
+            return
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            for position, rows, balance in csv.reader(f):
+                self.last = Snapshot(int(position), int(rows), from_cents(to_cents(balance)))
+
+    def snapshot(self, balance, rows=None):
+        """Write a save point at the current end of the storage"""
+        if rows is None:
+            rows = (self.last.rows if self.last else 0) + self.pending
+        self.last = Snapshot(self.storage.end_position(), rows, balance)
+        self.pending = 0
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([self.last.position, rows, format_cents(to_cents(balance))])
+        self._file_size = os.path.getsize(self.path)  # Our own line is already in self.last
+
+    def record_append(self, count, balance):
+        """Call after rows are appended; snapshots once every `interval` rows"""
+        self.pending += count
+        if self.pending >= self.interval:
+            self.snapshot(balance)
+
+    def clear(self):
+        """Forget every snapshot (used by reset)"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.last = None
+        self._file_size = None
+        self.pending = 0
+
+    def recompute(self):
+        """
+        Replay the rows after the newest snapshot and return a BalanceCheck
+
+        Falls back to a full replay if there is no usable snapshot (e.g. the
+        storage was truncated outside the tracker).
+
+        A row whose Balance isn't the previous balance plus its Amount is
+        taken as a NEW STARTING POINT, not an error: before snapshots
+        existed, "Set Balance" changed balance.txt without writing a row,
+        so the next row simply continues from the hand-set value.
+        """
+        start = self.last
+        if start is not None and start.position > self.storage.end_position():
+            start = None  # The snapshot points past the end of the data
+
+        position = start.position if start else 0
+        # Replayed in whole cents - integer sums are exact, so a jump
+        # always means the rows really disagree (not float rounding noise)
+        balance = to_cents(start.balance) if start else None
+        replayed = 0
+        jumps = []
+        for position, transaction in self.storage.scan_from(position):
+            amount, row_balance = transaction.amount, transaction.balance
+            replayed += 1
+            if balance is not None and balance + amount != row_balance:
+                jumps.append((position, transaction))
+            # With no save point, the first row's Balance is where we start
+            balance = row_balance
+        if balance is None:  # No snapshot and no rows at all
+            balance = 0
+        return BalanceCheck(from_cents(balance), replayed, jumps, start)
+
+    def verify(self, saved_balance):
+        """
+        Recompute and compare against `saved_balance` (usually balance.txt)
+
+        Returns (ok, check). When everything agrees, a fresh snapshot is
+        written so the next verify only has to replay rows added after now.
+        """
+        check = self.recompute()
+        ok = to_cents(check.balance) == to_cents(saved_balance)
+        if ok and check.rows_replayed:
+            start_rows = check.from_snapshot.rows if check.from_snapshot else 0
+            self.snapshot(check.balance, rows=start_rows + check.rows_replayed)
+        return ok, check
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Expense Tracker's hot paths
+
+For each ledger size it generates a synthetic ledger (ledger_generator.py)
+and times:
+    startup     - ExpenseTracker() (lock, journal check, load_balance)
+    first_add   - the first add, which also builds the category totals
+    add         - one non-interactive add_transaction after that (average of many)
+    bulk_add    - add_transactions_bulk throughput (rows per second)
+    view        - view_transactions() over the whole ledger
+    view_last   - view_transactions(last=50)
+    filter      - filter_transactions_by_category("Food & Dining")
+    reset       - reset_tracker()
+Results are saved as JSON so two versions can be compared:
+
+    python benchmarks.py                          # 10k, 1M and 10M rows
+    python benchmarks.py --rows 10000 --output before.json
+    python benchmarks.py --rows 10000 --compare before.json
+"""
+
+import argparse  # Command-line options
+import contextlib  # redirect_stdout - keep printed rows off the screen
+import json  # Results file
+import os  # Paths / devnull
+import platform  # Machine info for the results file
+import subprocess  # Asking git which version is being measured
+import sys  # Exit code for regressions
+import tempfile  # Scratch folder per ledger size
+import time  # Timers
+from datetime import datetime  # Timestamp for the results file
+
+from ledger_generator import generate_ledger
+from main import ExpenseTracker
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+SINGLE_ADDS = 200  # How many add_transaction calls to average
+BULK_ROWS = 10_000
+
+
+def _timed(function, repeat=1):
+    """Best wall-clock time of `repeat` runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_size(rows, data_dir, repeat=3):
+    """Time every operation against a fresh `rows`-row ledger in `data_dir`"""
+    results = {}
+    start = time.perf_counter()
+    generate_ledger(data_dir, rows)
+    results["generate"] = time.perf_counter() - start
+
+    # Printed output goes to the null device: formatting is still measured,
+    # but the terminal's scrolling speed isn't
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results["startup"] = _timed(lambda: ExpenseTracker(data_dir=data_dir), repeat)
+        tracker = ExpenseTracker(data_dir=data_dir)
+
+        heavy_repeat = 1 if rows >= 1_000_000 else repeat  # Full scans are slow
+        results["view"] = _timed(tracker.view_transactions, heavy_repeat)
+        results["view_last"] = _timed(lambda: tracker.view_transactions(last=50), heavy_repeat)
+        results["filter"] = _timed(
+            lambda: tracker.filter_transactions_by_category("Food & Dining"), heavy_repeat
+        )
+
+        # The first add also builds the side files a generated ledger lacks
+        # (category totals, ...) - timed on its own so it doesn't skew "add"
+        results["first_add"] = _timed(
+            lambda: tracker.add_transaction("Bench warm-up", -1.0, "Other", "")
+        )
+
+        def single_adds():
+            for i in range(SINGLE_ADDS):
+                tracker.add_transaction(f"Bench {i}", -1.0, "Other", "")
+
+        results["add"] = _timed(single_adds) / SINGLE_ADDS
+
+        bulk = [(f"Bulk {i}", -1.0, "Other", "") for i in range(BULK_ROWS)]
+        _, rows_per_second = tracker.add_transactions_bulk(bulk)
+        results["bulk_add_rows_per_second"] = rows_per_second
+
+        results["reset"] = _timed(tracker.reset_tracker)
+    return results
+
+
+def _git_version():
+    """Short commit hash of the code being measured (None outside git)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new, threshold=1.2):
+    """
+    List (size, operation, old, new) for every timing that got slower than
+    `threshold` times the old value (throughputs: lower counts as worse)
+    """
+    regressions = []
+    for size, new_results in new["results"].items():
+        old_results = old["results"].get(size, {})
+        for operation, new_value in new_results.items():
+            old_value = old_results.get(operation)
+            if not old_value or operation == "generate":
+                continue
+            if operation.endswith("_per_second"):
+                worse = new_value * threshold < old_value
+            else:
+                worse = new_value > old_value * threshold
+            if worse:
+                regressions.append((size, operation, old_value, new_value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Expense Tracker benchmarks")
+    parser.add_argument(
+        "--rows",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated ledger sizes (default: 10000,1000000,10000000)",
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="flag slowdowns vs a previous run")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown factor to flag")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.rows.split(",")]
+    report = {
+        "version": _git_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+    for rows in sizes:
+        print(f"⏱️  {rows:,} rows...", flush=True)
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = benchmark_size(rows, data_dir)
+        report["results"][str(rows)] = results
+        for operation, value in results.items():
+            if operation.endswith("_per_second"):
+                print(f"    {operation:<26} {value:>12,.0f}")
+            else:
+                print(f"    {operation:<26} {value * 1000:>12.3f} ms")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        regressions = compare(old, report, args.threshold)
+        for size, operation, old_value, new_value in regressions:
+            print(f"❌ {size} rows / {operation}: {old_value:.6g} -> {new_value:.6g}")
+        if regressions:
+            return 1
+        print(f"✅ No regressions vs {args.compare} (threshold {args.threshold}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
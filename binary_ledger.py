@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Compact binary ledger format for the Expense Tracker
+An optional alternative to transactions.csv for very large histories
+
+Every transaction becomes one fixed-size 44-byte record (like a C struct):
+    amount cents   int64   (no float parsing - exact whole cents)
+    balance cents  int64
+    date           int64   seconds since 1970-01-01
+    category code  uint8   index into the category list in the header
+    text offset    uint64  where the description starts in the string heap
+    description    uint32  length in bytes (the notes follow it directly)
+    notes          uint32  length in bytes
+Text lives in a separate ".heap" file, so the records stay fixed-width and
+record N is always at HEADER_SIZE + N * 44 - no parsing needed to find it.
+The offset is 64-bit, so the heap can grow past 4 GiB.
+
+Reads go through mmap: the operating system maps the file into memory and
+we unpack fields straight out of it, without copying it into Python objects
+first.
+
+Command line:
+    python binary_ledger.py to-binary transactions.csv transactions.bin
+    python binary_ledger.py to-csv transactions.bin export.csv
+    python binary_ledger.py bench transactions.csv
+"""
+
+import argparse  # Sub-commands for the converters / benchmark
+import calendar  # timegm(): date -> epoch seconds without timezone surprises
+import csv  # For the CSV side of the converters
+import mmap  # Memory-mapped file reads
+import os  # For file sizes
+import struct  # Packing/unpacking fixed-size binary records
+import tempfile  # Scratch files for the benchmark
+import time  # Timing the benchmark
+from datetime import datetime, timedelta  # epoch seconds -> date text
+
+from money import format_cents  # Whole cents -> "-12.50" text
+from storage import CSV_HEADER, Transaction, read_transactions
+
+# OPTIONAL DEPENDENCY - NumPy can view the whole file as a table, zero-copy
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"EXPLDG2\n"  # First bytes of every binary ledger (file "signature")
+HEADER_SIZE = 4096  # Records start here (one memory page)
+# "<" = little-endian, no padding; "3x" = 3 padding bytes after the uint8
+RECORD = struct.Struct("<qqqB3xQII")
+# Magic, record count, length of the category list that follows
+HEADER = struct.Struct("<8sQH")
+EPOCH = datetime(1970, 1, 1)
+
+# NumPy description of one record, for zero-copy column access
+if np is not None:
+    RECORD_DTYPE = np.dtype(
+        [
+            ("amount_cents", "<i8"),
+            ("balance_cents", "<i8"),
+            ("timestamp", "<i8"),
+            ("category", "u1"),
+            ("pad", "V3"),
+            ("text_offset", "<u8"),
+            ("description_length", "<u4"),
+            ("notes_length", "<u4"),
+        ]
+    )
+
+
+def _to_timestamp(text):
+    """ "YYYY-MM-DD HH:MM:SS" -> epoch seconds (the text is treated as UTC)"""
+    hour = int(text[11:13]) if len(text) >= 19 else 0
+    minute = int(text[14:16]) if len(text) >= 19 else 0
+    second = int(text[17:19]) if len(text) >= 19 else 0
+    return calendar.timegm(
+        (int(text[0:4]), int(text[5:7]), int(text[8:10]), hour, minute, second)
+    )
+
+
+def _to_date_text(timestamp):
+    """epoch seconds -> "YYYY-MM-DD HH:MM:SS" """
+    return (EPOCH + timedelta(seconds=timestamp)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class BinaryLedgerWriter:
+    """Write Transaction records into a new binary ledger (+ .heap file)"""
+
+    def __init__(self, path, categories=()):
+        self.path = path
+        self.categories = list(categories)
+        self._codes = {name: code for code, name in enumerate(self.categories)}
+        self.count = 0
+        self._records = open(path, "wb")
+        self._records.write(b"\0" * HEADER_SIZE)  # Real header written on close()
+        self._heap = open(path + ".heap", "wb")
+        self._heap_size = 0
+
+    def _store_text(self, description, notes):
+        """Append both texts to the heap; return (offset, description length, notes length)"""
+        description, notes = description.encode("utf-8"), notes.encode("utf-8")
+        offset = self._heap_size
+        self._heap.write(description)
+        self._heap.write(notes)
+        self._heap_size += len(description) + len(notes)
+        return offset, len(description), len(notes)
+
+    def append(self, transaction):
+        """Add one Transaction"""
+        code = self._codes.get(transaction.category)
+        if code is None:
+            if len(self.categories) == 256:
+                raise ValueError("A binary ledger can hold at most 256 categories")
+            code = self._codes[transaction.category] = len(self.categories)
+            self.categories.append(transaction.category)
+        self._records.write(
+            RECORD.pack(
+                transaction.amount,  # Already whole cents
+                transaction.balance,
+                _to_timestamp(transaction.date),
+                code,
+                *self._store_text(transaction.description, transaction.notes),
+            )
+        )
+        self.count += 1
+
+    def close(self):
+        """Write the header (count + category list) and close both files"""
+        names = "\n".join(self.categories).encode("utf-8")
+        if HEADER.size + len(names) > HEADER_SIZE:
+            raise ValueError("Category names don't fit in the binary ledger header")
+        self._records.seek(0)
+        self._records.write(HEADER.pack(MAGIC, self.count, len(names)) + names)
+        self._records.close()
+        self._heap.close()
+
+    # CONTEXT MANAGER - lets callers write `with BinaryLedgerWriter(...) as w:`
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BinaryLedger:
+    """Read-only, memory-mapped view of a binary ledger"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, names_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary ledger")
+        names = self._map[HEADER.size : HEADER.size + names_length].decode("utf-8")
+        self.categories = names.split("\n") if names else []
+        # memoryview = a window onto the mapped bytes (no copy is made)
+        end = HEADER_SIZE + self.count * RECORD.size
+        self.records = memoryview(self._map)[HEADER_SIZE:end]
+
+        self._heap_file = open(path + ".heap", "rb")
+        heap_size = os.fstat(self._heap_file.fileno()).st_size
+        # mmap can't map an empty file, so an all-empty-text heap stays as b""
+        self._heap = (
+            mmap.mmap(self._heap_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if heap_size
+            else b""
+        )
+
+    def __len__(self):
+        return self.count
+
+    def _text(self, offset, length):
+        return self._heap[offset : offset + length].decode("utf-8")
+
+    def __getitem__(self, index):
+        """Record `index` as a Transaction - O(1), found by arithmetic"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        (amount, balance, timestamp, code, offset, d_len, n_len) = (
+            RECORD.unpack_from(self.records, index * RECORD.size)
+        )
+        return Transaction(
+            _to_date_text(timestamp),
+            self._text(offset, d_len),
+            amount,
+            balance,
+            self.categories[code],
+            self._text(offset + d_len, n_len),
+        )
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def iter_raw(self):
+        """
+        Yield raw (amount_cents, balance_cents, timestamp, category_code, ...)
+        tuples - the fastest pure-Python scan, no text is decoded
+        """
+        return RECORD.iter_unpack(self.records)
+
+    def array(self):
+        """The records as a NumPy structured array (zero-copy), if available"""
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.records, dtype=RECORD_DTYPE)
+
+    def totals_by_category(self):
+        """{category: total cents} - reads only the fixed-width records"""
+        size = len(self.categories)
+        if np is not None and self.count:
+            table = self.array()
+            sums = np.bincount(
+                table["category"], weights=table["amount_cents"], minlength=size
+            )
+            # float64 weights are exact for totals under 2**53 cents
+            return {name: int(sums[code]) for code, name in enumerate(self.categories)}
+        sums = [0] * size
+        for amount, _, _, code, *_ in self.iter_raw():
+            sums[code] += amount
+        return dict(zip(self.categories, sums))
+
+    def close(self):
+        """Release the memory maps and files"""
+        if getattr(self, "records", None) is not None:
+            self.records.release()  # A live memoryview would block mmap.close()
+            self.records = None
+        self._map.close()
+        self._file.close()
+        if isinstance(getattr(self, "_heap", None), mmap.mmap):
+            self._heap.close()
+        if getattr(self, "_heap_file", None) is not None:
+            self._heap_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# CONVERTERS
+# ---------------------------------------------------------------------------
+
+
+def csv_to_binary(csv_path, binary_path, categories=()):
+    """Convert transactions.csv (old or new format) into a binary ledger"""
+    with BinaryLedgerWriter(binary_path, categories) as writer:
+        for transaction in read_transactions(csv_path):
+            writer.append(transaction)
+    return writer.count
+
+
+def binary_to_csv(binary_path, csv_path):
+    """Convert a binary ledger back into the tracker's 6-column CSV format"""
+    with BinaryLedger(binary_path) as ledger, open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for date, description, amount, balance, category, notes in ledger:
+            # Same two-decimal money text the tracker writes ("-12.50")
+            writer.writerow(
+                [
+                    date,
+                    description,
+                    format_cents(amount),
+                    format_cents(balance),
+                    category,
+                    notes,
+                ]
+            )
+        return len(ledger)
+
+
+# ---------------------------------------------------------------------------
+# BENCHMARK - file size and "total per category" scan time, CSV vs binary
+# ---------------------------------------------------------------------------
+
+
+def _best_of(repeat, function):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(csv_path, repeat=3):
+    """Compare size and scan speed of `csv_path` and its binary conversion"""
+    with tempfile.TemporaryDirectory() as scratch:
+        binary_path = os.path.join(scratch, "ledger.bin")
+        rows = csv_to_binary(csv_path, binary_path)
+
+        def scan_csv():
+            totals = {}
+            for transaction in read_transactions(csv_path):
+                totals[transaction.category] = (
+                    totals.get(transaction.category, 0) + transaction.amount
+                )
+            return totals
+
+        results = {
+            "rows": rows,
+            "csv_bytes": os.path.getsize(csv_path),
+            "binary_bytes": os.path.getsize(binary_path)
+            + os.path.getsize(binary_path + ".heap"),
+            "csv_scan_seconds": _best_of(repeat, scan_csv),
+        }
+        with BinaryLedger(binary_path) as ledger:
+
+            def scan_binary():
+                sums = [0] * len(ledger.categories)
+                for amount, _, _, code, *_ in ledger.iter_raw():
+                    sums[code] += amount
+                return sums
+
+            results["binary_scan_seconds"] = _best_of(repeat, scan_binary)
+            if np is not None:
+                results["binary_numpy_scan_seconds"] = _best_of(
+                    repeat, ledger.totals_by_category
+                )
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Binary ledger tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    to_binary = commands.add_parser("to-binary", help="convert a CSV ledger to binary")
+    to_binary.add_argument("csv_path")
+    to_binary.add_argument("binary_path")
+    to_csv = commands.add_parser("to-csv", help="convert a binary ledger back to CSV")
+    to_csv.add_argument("binary_path")
+    to_csv.add_argument("csv_path")
+    bench = commands.add_parser("bench", help="compare size and scan speed")
+    bench.add_argument("csv_path")
+    args = parser.parse_args(argv)
+
+    if args.command == "to-binary":
+        count = csv_to_binary(args.csv_path, args.binary_path)
+        print(f"✅ Wrote {count} records to {args.binary_path} (+ .heap)")
+    elif args.command == "to-csv":
+        count = binary_to_csv(args.binary_path, args.csv_path)
+        print(f"✅ Wrote {count} rows to {args.csv_path}")
+    else:
+        results = benchmark(args.csv_path)
+        print(f"Rows:            {results['rows']:,}")
+        print(f"CSV size:        {results['csv_bytes'] / 1e6:8.1f} MB")
+        print(
+            f"Binary size:     {results['binary_bytes'] / 1e6:8.1f} MB "
+            f"({results['binary_bytes'] / results['csv_bytes']:.0%} of CSV)"
+        )
+        print(f"CSV scan:        {results['csv_scan_seconds'] * 1000:8.1f} ms")
+        print(f"Binary scan:     {results['binary_scan_seconds'] * 1000:8.1f} ms")
+        if "binary_numpy_scan_seconds" in results:
+            print(
+                f"Binary + NumPy:  {results['binary_numpy_scan_seconds'] * 1000:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Budgets for the Expense Tracker
+PHASE 4: Spending limits per category (or for everything) per month or year,
+with alerts the moment a new expense crosses 80% or 100% of a limit
+
+The limits live in budgets.json. How much has been spent is NOT worked out
+by reading the transactions: the budgets keep running counters, one per
+(category, "YYYY-MM") and (category, "YYYY"), plus "*" for all categories.
+They are seeded once from the category totals (aggregates.py, which already
+has expenses per category and month) and then every new row bumps four
+counters - O(1) per insert, like a Redux reducer updating a few keys instead
+of re-deriving state from the whole action history.
+
+    budgets.set_limit("Food & Dining", "month", 40000)   # $400.00 a month
+    budgets.set_limit("*", "year", 2400000)               # $24,000 a year
+"""
+
+import json  # Limits are saved as a small JSON file
+import os  # For checking/removing/replacing files
+from collections import namedtuple  # Lightweight record types
+
+from money import format_cents  # Limits and spending are whole cents
+from side_files import atomic_write  # Temp file + rename
+
+ALL = "*"  # Category name meaning "all spending"
+PERIODS = ("month", "year")
+# Alert when spending reaches these percentages of a limit
+THRESHOLDS = (80, 100)
+
+# One alert, fired when an expense pushes spending past a threshold
+# (`row` = index of that expense in the rows passed to record())
+BudgetAlert = namedtuple(
+    "BudgetAlert", ["category", "period", "period_key", "threshold", "spent", "limit", "row"]
+)
+# One line of the budget-vs-actual report (money in cents)
+BudgetLine = namedtuple("BudgetLine", ["category", "period", "period_key", "spent", "limit"])
+
+
+def describe_alert(alert):
+    """Human-readable text for a BudgetAlert"""
+    name = "All spending" if alert.category == ALL else alert.category
+    state = "over budget" if alert.threshold >= 100 else f"at {alert.threshold}% of budget"
+    return (
+        f"⚠️  {name} is {state} for {alert.period_key}: "
+        f"${format_cents(alert.spent)} of ${format_cents(alert.limit)}"
+    )
+
+
+class Budgets:
+    """Limits per (category, period) + running spending counters"""
+
+    def __init__(self, path):
+        self.path = path
+        # DICTIONARY - {(category, period): limit in cents}
+        self.limits = {}
+        # {(category, period_key): cents spent} - None until first needed
+        self.spent = None
+        self.covered = None  # Storage bookmark the counters are up to date with
+        self._file_key = None  # (mtime, size) of the budgets.json we loaded
+        self._refresh()
+
+    def _refresh(self):
+        """(Re)load the limits if budgets.json changed (e.g. another tracker set one)"""
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if key == self._file_key:
+            return
+        self._file_key = key
+        self.limits = {}
+        if key is None:
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        # JSON has no tuple keys, so each limit is saved as a flat list
+        for category, period, cents in data["limits"]:
+            self.limits[(category, period)] = cents
+
+    def _save(self):
+        data = {"limits": [[*key, cents] for key, cents in sorted(self.limits.items())]}
+        atomic_write(self.path, json.dumps(data))
+        stat = os.stat(self.path)
+        self._file_key = (stat.st_mtime_ns, stat.st_size)
+
+    def set_limit(self, category, period, cents):
+        """Set (or with cents=0, remove) the limit for a category ("*" = all) and period"""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown budget period: {period!r}")
+        if cents < 0:
+            raise ValueError("A budget limit can't be negative")
+        self._refresh()
+        if cents:
+            self.limits[(category, period)] = cents
+        else:
+            self.limits.pop((category, period), None)
+        self._save()
+
+    # ------------------------------------------------------------------
+    # RUNNING COUNTERS
+    # ------------------------------------------------------------------
+
+    def invalidate(self):
+        """Forget the counters - the totals they came from changed underneath"""
+        self.spent = self.covered = None
+
+    def _counters(self, aggregates):
+        """
+        The spending counters, seeded from the category totals when needed
+
+        They are re-seeded whenever the totals cover a different part of
+        the storage than the counters do (rows added by another tracker,
+        a reset, ...), so they never drift apart.
+        """
+        if self.spent is None or self.covered != aggregates.covered:
+            spent = {}
+            # One pass over (category, month) totals - no transactions read
+            for (category, month), values in aggregates.totals.items():
+                expenses = values[2]
+                if not expenses:
+                    continue
+                for key in ((category, month), (category, month[:4]), (ALL, month), (ALL, month[:4])):
+                    spent[key] = spent.get(key, 0) + expenses
+            self.spent = spent
+            self.covered = aggregates.covered
+        return self.spent
+
+    def record(self, rows, aggregates, end):
+        """
+        Count new rows' expenses and return the BudgetAlerts they trigger
+
+        Call this before the rows are added to `aggregates` (the counters
+        may be seeded from them); `end` is the storage position after the
+        rows. Each expense updates four counters and checks at most four
+        limits, however long the history is.
+        """
+        self._refresh()
+        if not self.limits:
+            self.invalidate()  # Nothing to check; re-seed when a limit is set
+            return []
+        spent = self._counters(aggregates)
+        limits = self.limits
+        alerts = []
+        for index, row in enumerate(rows):
+            cents = row[2]  # amount, in whole cents
+            if cents >= 0:
+                continue  # Income doesn't use up a budget
+            date, category = str(row[0]), row[4]
+            for name in (category, ALL):
+                for period, key in (("month", date[:7]), ("year", date[:4])):
+                    before = spent.get((name, key), 0)
+                    after = before - cents
+                    spent[(name, key)] = after
+                    limit = limits.get((name, period))
+                    if limit is None:
+                        continue
+                    # INTEGER MATH - "crossed 80%" without any floats
+                    for threshold in THRESHOLDS:
+                        if before * 100 < threshold * limit <= after * 100:
+                            alerts.append(
+                                BudgetAlert(name, period, key, threshold, after, limit, index)
+                            )
+        self.covered = end  # What the totals will cover once the rows are added
+        return alerts
+
+    # ------------------------------------------------------------------
+    # REPORTS
+    # ------------------------------------------------------------------
+
+    def report(self, aggregates, prefix=None):
+        """
+        Budget vs actual for every period that has spending, from the counters
+
+        `prefix` narrows it down ("2025" = that year and its months,
+        "2025-08" = one month). Returns BudgetLines, oldest period first.
+        """
+        self._refresh()
+        spent = self._counters(aggregates)
+        lines = []
+        for (category, period), limit in sorted(self.limits.items()):
+            size = 7 if period == "month" else 4
+            keys = sorted(
+                key
+                for name, key in spent
+                if name == category and len(key) == size
+                and (prefix is None or key.startswith(prefix) or prefix.startswith(key))
+            )
+            for key in keys:
+                lines.append(BudgetLine(category, period, key, spent[(category, key)], limit))
+        return lines
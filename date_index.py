@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Date index for transactions.csv
+Maps each day to where its rows are in the file, so a date-range query can
+seek() straight to the right spot instead of reading from the top
+
+For every day we keep the byte offset where its FIRST row starts and where
+its LAST row ends. The days are kept sorted, so we can binary-search them
+(bisect) - like jumping to a chapter with a book's table of contents.
+New rows usually have today's date, so the file is in date order and a
+range is exactly "first row of the start day -> end of the last day". A
+back-dated row (an import of last year's statement) just stretches its
+day's span: ranges that include that day read a bit more, the rest are as
+fast as ever.
+
+The index file is an APPEND-ONLY log of JSON lines: the first line holds
+every day, each save adds one line with only the days that changed (last
+line wins). Once COMPACT_EVERY lines pile up it is rewritten as one line.
+"""
+
+from bisect import bisect_left, bisect_right  # Binary search over a sorted list
+
+from side_files import JsonLinesLog  # Append-only JSON-lines file handling
+
+
+class DateIndex(JsonLinesLog):
+    """Sidecar "day -> first/last byte offset" index, updated on every append"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.days = []  # Sorted list of "YYYY-MM-DD" strings
+        self.first = []  # first[i] = byte offset where the first row of days[i] starts
+        self.last = []  # last[i] = byte offset just past the last row of days[i]
+        self.covered = 0  # How many bytes of the CSV this index has seen
+        self.changed = set()  # Days updated since the last save
+        self._load()
+
+    def _load(self):
+        """Read the index file if there is one"""
+        spans = {}
+        for data in self._read_log():
+            self.covered = data["covered"]
+            for day, first, last in data["days"]:
+                spans[day] = (first, last)
+        for day in sorted(spans):
+            self.days.append(day)
+            self.first.append(spans[day][0])
+            self.last.append(spans[day][1])
+
+    def save(self, covered):
+        """Write the index to disk, recording that `covered` bytes are indexed"""
+        self.covered = covered
+        if self._can_append():
+            # Usually just today's entry - one short line, however old the file
+            days = sorted(self.changed)
+            positions = [bisect_left(self.days, day) for day in days]
+            self._append_line({
+                "covered": covered,
+                "days": [[day, self.first[i], self.last[i]] for day, i in zip(days, positions)],
+            })
+        else:
+            self._rewrite_log({"covered": covered, "days": list(zip(self.days, self.first, self.last))})
+        self.changed.clear()
+
+    def add(self, date, start, end):
+        """Note that rows dated `date` sit between byte `start` and byte `end`"""
+        day = date[:10]  # "YYYY-MM-DD HH:MM:SS" -> "YYYY-MM-DD"
+        self.changed.add(day)
+        days = self.days
+        if days and day == days[-1]:  # The usual case: more rows for the newest day
+            self.last[-1] = end  # Rows are appended, so `end` only ever grows
+            return
+        position = bisect_left(days, day)
+        if position < len(days) and days[position] == day:
+            # A day we've seen before (rows out of date order)
+            self.first[position] = min(self.first[position], start)
+            self.last[position] = max(self.last[position], end)
+            return
+        days.insert(position, day)
+        self.first.insert(position, start)
+        self.last.insert(position, end)
+
+    def span(self, start_date=None, end_date=None):
+        """
+        (start, stop) byte offsets holding every row between two dates
+        (inclusive; None = open-ended). start == stop when there are none
+        """
+        low = 0 if start_date is None else bisect_left(self.days, start_date[:10])
+        high = len(self.days) if end_date is None else bisect_right(self.days, end_date[:10])
+        if low >= high:
+            return self.covered, self.covered
+        # min()/max() instead of first[low]/last[high - 1]: a back-dated day
+        # in the range may start earlier or end later in the file
+        return min(self.first[low:high]), max(self.last[low:high])
+
+    def find_end(self, end_date):
+        """Byte offset just past the last row on/before `end_date`"""
+        position = bisect_right(self.days, end_date[:10])
+        return max(self.last[:position], default=0)
+
+    def clear(self):
+        """Forget everything (used when the CSV is deleted)"""
+        self._remove_log()
+        self.days, self.first, self.last = [], [], []
+        self.covered = 0
+        self.changed.clear()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for the Expense Tracker
+Where does the time go? Per-operation latency histograms, rows, bytes, fsyncs
+
+Turned on with `python main.py --stats` (or tracker.enable_stats()). It works
+like wrapping components in React's <Profiler>: each chosen method of the
+tracker, its storage and its journal is replaced - on that one object - by a
+wrapper that times the call and counts what it did. When stats are off
+nothing is wrapped at all, so the normal code path costs exactly what it did
+before (no "if stats_enabled:" checks sprinkled through every method).
+
+Per operation it records:
+  - calls and a latency histogram (power-of-two microsecond buckets, from
+    which p50/p95/p99 are estimated)
+  - rows: yielded by a scan, or passed to a write
+  - bytes read/written by the whole process during the call (Linux
+    /proc/self/io; left out on systems without it)
+Plus every os.fsync() call, from any module.
+
+dump() returns everything as a plain dict (written as JSON by --stats-json).
+"""
+
+import inspect  # Telling generator results apart from plain return values
+import os  # os.fsync is wrapped to count calls; /proc/self/io for bytes
+import threading  # The server and group commit record from several threads
+import time  # perf_counter_ns() for the latencies
+
+BUCKETS = 40  # Bucket i holds latencies below 2**i microseconds (up to ~6 days)
+
+# What gets wrapped. "yield" = count the rows a scan yields, a number = count
+# the rows passed in as that positional argument, None = latency/bytes only.
+TRACKER_OPS = {
+    "load_balance_cents": None,
+    "save_balance": None,
+    "add_transaction": None,
+    "_commit": None,  # The whole locked + journaled write (after group commit)
+    "view_transactions": None,
+    "filter_transactions_by_category": None,
+    "search_transactions": None,
+    "category_summary": None,
+    "render_page": None,
+    "report": None,
+    "verify_balance": None,
+    "run_recurring": None,
+}
+STORAGE_OPS = {
+    "append": 0,  # append(rows)
+    "iter_rows": "yield",
+    "scan_from": "yield",
+    "scan_backward": "yield",
+    "rows_at": "yield",
+    "end_position": None,
+    "truncate": None,
+}
+JOURNAL_OPS = {"write": 1}  # write(position, rows)
+
+
+class _OpStats:
+    """Counters for one operation name"""
+
+    __slots__ = ("calls", "total_ns", "min_ns", "max_ns", "buckets", "rows", "bytes_read", "bytes_written")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def percentile(self, fraction):
+        """Upper edge (in microseconds) of the bucket holding that fraction of calls"""
+        target = self.calls * fraction
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return 2**index
+        return 0
+
+
+class Instrumentation:
+    """Collects per-operation stats for the objects it is attached to"""
+
+    def __init__(self):
+        self.ops = {}  # {"storage.append": _OpStats, ...}
+        self.fsyncs = 0
+        self._lock = threading.Lock()
+        self._wrapped = []  # [(object, method name), ...] - undone by detach()
+        self._original_fsync = None
+        self.started = time.time()
+        try:
+            # Kept open and re-read with pread(): ~1 microsecond per sample
+            self._io_fd = os.open("/proc/self/io", os.O_RDONLY)
+        except OSError:  # Not Linux - no byte counts
+            self._io_fd = None
+
+    # ------------------------------------------------------------------
+    # WRAPPING
+    # ------------------------------------------------------------------
+
+    def attach(self, obj, operations, prefix=""):
+        """Wrap obj's methods named in `operations` ({name: row counting})"""
+        for name, rows in operations.items():
+            method = getattr(obj, name, None)
+            if method is None:
+                continue  # e.g. a backend without that method
+            # An instance attribute shadows the class's method - only this
+            # object is affected, and deleting the attribute undoes it
+            setattr(obj, name, self._wrap(prefix + name, method, rows))
+            self._wrapped.append((obj, name))
+
+    def count_fsyncs(self):
+        """Count every os.fsync() in the process (modules look it up on `os` each call)"""
+        if self._original_fsync is not None:
+            return
+        original = self._original_fsync = os.fsync
+
+        def fsync(fd):
+            self.fsyncs += 1
+            return original(fd)
+
+        os.fsync = fsync
+
+    def detach(self):
+        """Put every wrapped method and os.fsync back"""
+        for obj, name in self._wrapped:
+            obj.__dict__.pop(name, None)
+        self._wrapped = []
+        if self._original_fsync is not None:
+            os.fsync = self._original_fsync
+            self._original_fsync = None
+
+    def _io(self):
+        """(bytes read, bytes written, length of this sample) so far for the process"""
+        if self._io_fd is None:
+            return None
+        data = os.pread(self._io_fd, 512, 0)
+        lines = data.split(b"\n")
+        # First two lines: "rchar: N" and "wchar: N"
+        return int(lines[0][7:]), int(lines[1][7:]), len(data)
+
+    def _wrap(self, name, method, rows_mode):
+        stats = self.ops.setdefault(name, _OpStats())
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            io_before = self._io()
+            start = clock()
+            result = method(*args, **kwargs)
+            if inspect.isgenerator(result):
+                # A scan: the work happens while the caller iterates, so the
+                # clock keeps running until the generator is done or closed
+                return self._timed_generator(stats, result, start, io_before)
+            rows = len(args[rows_mode]) if type(rows_mode) is int and len(args) > rows_mode else 0
+            self._record(stats, clock() - start, rows, io_before)
+            return result
+
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def _timed_generator(self, stats, generator, start, io_before):
+        rows = 0
+        try:
+            for item in generator:
+                rows += 1
+                yield item
+        finally:
+            self._record(stats, time.perf_counter_ns() - start, rows, io_before)
+
+    def _record(self, stats, elapsed_ns, rows, io_before):
+        io_after = self._io() if io_before is not None else None
+        with self._lock:
+            stats.calls += 1
+            stats.total_ns += elapsed_ns
+            if stats.min_ns is None or elapsed_ns < stats.min_ns:
+                stats.min_ns = elapsed_ns
+            stats.max_ns = max(stats.max_ns, elapsed_ns)
+            # int.bit_length() = which power of two the latency falls under
+            bucket = min((elapsed_ns // 1000).bit_length(), BUCKETS - 1)
+            stats.buckets[bucket] += 1
+            stats.rows += rows
+            if io_after is not None:
+                # Don't count the bytes of our own /proc/self/io sample
+                stats.bytes_read += io_after[0] - io_before[0] - io_before[2]
+                stats.bytes_written += io_after[1] - io_before[1]
+
+    # ------------------------------------------------------------------
+    # OUTPUT
+    # ------------------------------------------------------------------
+
+    def dump(self):
+        """Everything as a JSON-ready dict (times in microseconds)"""
+        operations = {}
+        for name, stats in sorted(self.ops.items()):
+            if not stats.calls:
+                continue
+            operations[name] = {
+                "calls": stats.calls,
+                "total_us": round(stats.total_ns / 1000, 1),
+                "mean_us": round(stats.total_ns / stats.calls / 1000, 1),
+                "min_us": round(stats.min_ns / 1000, 1),
+                "max_us": round(stats.max_ns / 1000, 1),
+                "p50_us": stats.percentile(0.50),
+                "p95_us": stats.percentile(0.95),
+                "p99_us": stats.percentile(0.99),
+                # {upper edge in microseconds: calls} for the non-empty buckets
+                "histogram_us": {str(2**i): count for i, count in enumerate(stats.buckets) if count},
+                "rows": stats.rows,
+                "bytes_read": stats.bytes_read if self._io_fd is not None else None,
+                "bytes_written": stats.bytes_written if self._io_fd is not None else None,
+            }
+        return {
+            "started": self.started,
+            "seconds": round(time.time() - self.started, 3),
+            "fsyncs": self.fsyncs,
+            "operations": operations,
+        }
+
+    def format_table(self):
+        """The dump as a text table, slowest operations (total time) first"""
+        data = self.dump()
+        lines = [
+            "=" * 100,
+            f"STATS - {data['seconds']:.1f}s, {data['fsyncs']} fsync(s)",
+            "=" * 100,
+            f"{'Operation':<36}{'Calls':>7}{'Total ms':>10}{'Mean us':>10}{'p50':>8}{'p95':>8}"
+            f"{'p99':>8}{'Rows':>9}{'Read KB':>10}{'Wrote KB':>10}",
+            "-" * 100,
+        ]
+        ranked = sorted(data["operations"].items(), key=lambda item: item[1]["total_us"], reverse=True)
+        for name, op in ranked:
+            read = "-" if op["bytes_read"] is None else f"{op['bytes_read'] / 1024:.1f}"
+            wrote = "-" if op["bytes_written"] is None else f"{op['bytes_written'] / 1024:.1f}"
+            lines.append(
+                f"{name:<36}{op['calls']:>7}{op['total_us'] / 1000:>10.1f}{op['mean_us']:>10.1f}"
+                f"{op['p50_us']:>8}{op['p95_us']:>8}{op['p99_us']:>8}{op['rows']:>9}{read:>10}{wrote:>10}"
+            )
+        lines.append("(p50/p95/p99 are bucket upper bounds in microseconds)")
+        return "\n".join(lines)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Safe writes for the Expense Tracker when more than one copy is running
+
+Three pieces work together:
+- FileLock: only one writer at a time across processes (advisory lock on
+  tracker.lock). Like a mutex shared by every running tracker.
+- Journal: an append-only "write-ahead log". New rows are written here and
+  fsync'ed *before* they touch transactions.csv / balance.txt, so after a
+  crash the last write can be finished (or redone) instead of half-lost.
+- GroupCommit: when several threads write at the same moment, one of them
+  ("the leader") writes everyone's rows with a single fsync, instead of each
+  thread paying for its own.
+"""
+
+import json  # Journal records are one JSON object per line
+import os  # For fsync/truncate/removing files
+import threading  # For the in-process part of the lock and group commit
+from collections import namedtuple  # Lightweight record type
+
+# PLATFORM-SPECIFIC LOCKING - fcntl on Linux/macOS, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# A journal entry: where the storage ended before the write, and the rows
+JournalRecord = namedtuple("JournalRecord", ["position", "rows"])
+
+# Applied markers are short, so the tail check only needs to read this much
+_TAIL_BYTES = 64
+
+
+class FileLock:
+    """
+    Exclusive lock shared by every tracker process using the same data folder
+
+    Usable with `with lock:` and safe to nest inside one thread (re-entrant).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()  # Threads in *this* process
+        self._file = None
+        self._depth = 0  # How many nested `with` blocks we're inside
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            self._file = open(self.path, "a+b")
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)  # Blocks until free
+            else:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK gives up after ~10s - keep waiting
+                        continue
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+class Journal:
+    """
+    Append-only write-ahead log of rows about to be saved
+
+    Each write adds a record line, fsyncs it, and - once the rows are in the
+    storage - an {"applied": position} marker. A record with no marker after
+    it means the tracker stopped mid-write and the rows must be redone.
+    Only call these methods while holding the FileLock.
+    """
+
+    def __init__(self, path, checkpoint_bytes=1_000_000):
+        self.path = path
+        self.checkpoint_bytes = checkpoint_bytes  # Trim the journal past this size
+        self.fsyncs = 0  # How many times we forced data to disk (for stats/tests)
+
+    def write(self, position, rows):
+        """Durably record `rows` before they are applied to the storage"""
+        line = json.dumps({"position": position, "rows": rows}) + "\n"
+        with open(self.path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())  # The one fsync for this whole group of rows
+        self.fsyncs += 1
+
+    def mark_applied(self, position):
+        """Note that the record written at `position` is now in the storage"""
+        # No fsync needed: if this marker is lost, recovery just redoes the
+        # record, which gives the same result
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"applied": position}) + "\n")
+
+    def seal(self):
+        """Close off a torn last line so the tail reads as clean again"""
+        with open(self.path, "a") as f:
+            f.write("\n" + json.dumps({"applied": None}) + "\n")
+
+    def is_clean(self):
+        """
+        True if there is nothing to recover - O(1), only reads the last bytes
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return True
+        if size == 0:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(max(0, size - _TAIL_BYTES))
+            tail = f.read().splitlines()
+        return bool(tail) and tail[-1].startswith(b'{"applied"')
+
+    def unapplied(self):
+        """The last record if it never got its applied marker, else None"""
+        pending = None
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn line: the crash happened before its fsync finished,
+                    # so those rows were never applied - nothing to redo
+                    continue
+                if "applied" in entry:
+                    pending = None
+                else:
+                    pending = JournalRecord(entry["position"], entry["rows"])
+        return pending
+
+    def maybe_checkpoint(self, storage):
+        """Once the journal is big, make the storage durable and empty it"""
+        if os.path.getsize(self.path) < self.checkpoint_bytes:
+            return False
+        storage.sync()  # Everything the journal protects is now on disk
+        self.fsyncs += 1
+        self.clear()
+        return True
+
+    def clear(self):
+        """Empty the journal"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _Ticket:
+    """One caller's place in the group-commit queue"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class GroupCommit:
+    """
+    Let concurrent writers share one commit (and one fsync)
+
+    The first thread to arrive becomes the leader and commits every queued
+    write in one call to `commit_groups`; threads that arrive meanwhile just
+    wait for their result. Like batching several setState calls into one
+    render.
+    """
+
+    def __init__(self, commit_groups):
+        # commit_groups(list_of_entry_lists) -> list of results, same order
+        self._commit_groups = commit_groups
+        self._lock = threading.Lock()
+        self._queue = []
+        self._leader_active = False
+        self.commits = 0  # How many group commits ran
+        self.writes = 0  # How many submit() calls they covered
+
+    def submit(self, entries):
+        """Queue `entries` for the next commit and wait for its result"""
+        ticket = _Ticket(entries)
+        with self._lock:
+            self._queue.append(ticket)
+            is_leader = not self._leader_active
+            self._leader_active = True
+        if is_leader:
+            self._lead()
+        ticket.done.wait()
+        if ticket.error is not None:
+            raise ticket.error
+        return ticket.result
+
+    def _lead(self):
+        """Keep committing whatever is queued until the queue is empty"""
+        while True:
+            with self._lock:
+                batch, self._queue = self._queue, []
+                if not batch:
+                    self._leader_active = False
+                    return
+            try:
+                results = self._commit_groups([ticket.entries for ticket in batch])
+                for ticket, result in zip(batch, results):
+                    ticket.result = result
+            except Exception as error:  # Every writer in the group sees the error
+                for ticket in batch:
+                    ticket.error = error
+            self.commits += 1
+            self.writes += len(batch)
+            for ticket in batch:
+                ticket.done.set()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Synthetic ledger generator for tests and benchmarks
+Writes a realistic-looking transactions.csv + balance.txt of any size
+
+The same seed always produces the same file (like a seeded Math.random), so
+benchmark runs on different versions of the tracker see identical data.
+
+    python ledger_generator.py 1000000 --data-dir /tmp/big-ledger
+"""
+
+import argparse  # Command-line options
+import csv  # Writing the CSV
+import os  # Paths
+import random  # Seeded random numbers
+from datetime import datetime, timedelta  # Increasing transaction dates
+
+from storage import CSV_HEADER
+
+# CATEGORY MIX - (category, share of rows, smallest amount, largest amount)
+# Negative = expense, positive = income
+CATEGORY_MIX = [
+    ("Food & Dining", 0.30, -80.0, -3.0),
+    ("Transportation", 0.15, -60.0, -2.0),
+    ("Entertainment", 0.10, -120.0, -5.0),
+    ("Bills & Utilities", 0.08, -400.0, -30.0),
+    ("Shopping", 0.15, -250.0, -5.0),
+    ("Healthcare", 0.04, -300.0, -10.0),
+    ("Income", 0.08, 200.0, 2500.0),
+    ("Other", 0.10, -100.0, 50.0),
+]
+
+DESCRIPTIONS = {
+    "Food & Dining": ["Groceries", "Lunch", "Coffee", "Takeout", "Dinner out"],
+    "Transportation": ["Gas", "Bus pass", "Parking", "Train ticket", "Rideshare"],
+    "Entertainment": ["Movies", "Concert", "Video game", "Streaming", "Books"],
+    "Bills & Utilities": ["Rent", "Electricity", "Phone bill", "Internet", "Water"],
+    "Shopping": ["Clothes", "Household", "Electronics", "Gift", "Furniture"],
+    "Healthcare": ["Pharmacy", "Doctor visit", "Dentist", "Vitamins", "Gym"],
+    "Income": ["Paycheck", "Freelance", "Refund", "Gift received", "Interest"],
+    "Other": ["Misc", "Bank fee", "Donation", "Cash withdrawal", "Transfer"],
+}
+
+NOTES = ["", "", "", "", "weekly", "split with roommate", "reimbursable", "on sale"]
+
+
+def generate_rows(rows, seed=42, legacy_share=0.05, start="2020-01-01 08:00:00"):
+    """
+    Yield CSV rows (lists of strings), oldest first, with running balances
+
+    About `legacy_share` of the rows use the old 5-column layout
+    (Date, Description, Amount, Balance, Notes) to exercise the
+    backwards-compatibility code, just like a ledger that predates Phase 2.
+    """
+    rng = random.Random(seed)
+    names = [name for name, *_ in CATEGORY_MIX]
+    weights = [share for _, share, *_ in CATEGORY_MIX]
+    ranges = {name: (low, high) for name, _, low, high in CATEGORY_MIX}
+    when = datetime.strptime(start, "%Y-%m-%d %H:%M:%S")
+    balance_cents = 500_000  # Start with $5,000 so the balance stays sensible
+    # Pick categories in chunks - rng.choices is much faster per call with k > 1
+    chunk = []
+    for _ in range(rows):
+        if not chunk:
+            chunk = rng.choices(names, weights, k=4096)
+        category = chunk.pop()
+        low, high = ranges[category]
+        amount_cents = round(rng.uniform(low, high) * 100)
+        balance_cents += amount_cents
+        # Dates only move forward, so the file is sorted like a real ledger
+        when += timedelta(seconds=rng.randrange(60, 6 * 3600))
+        date = when.strftime("%Y-%m-%d %H:%M:%S")
+        description = rng.choice(DESCRIPTIONS[category])
+        notes = rng.choice(NOTES)
+        amount, balance = str(amount_cents / 100), str(balance_cents / 100)
+        if rng.random() < legacy_share:
+            yield [date, description, amount, balance, notes]  # Old format
+        else:
+            yield [date, description, amount, balance, category, notes]
+
+
+def generate_ledger(data_dir, rows, seed=42, legacy_share=0.05):
+    """
+    Write transactions.csv and a matching balance.txt into `data_dir`
+
+    Returns the final balance.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    last = None
+    with open(os.path.join(data_dir, "transactions.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for row in generate_rows(rows, seed, legacy_share):
+            writer.writerow(row)
+            last = row
+    balance = float(last[3]) if last else 0.0
+    with open(os.path.join(data_dir, "balance.txt"), "w") as f:
+        f.write(str(balance))
+    return balance
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic ledger")
+    parser.add_argument("rows", type=int, help="number of transactions")
+    parser.add_argument("--data-dir", default=".", help="where to write the files")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--legacy-share",
+        type=float,
+        default=0.05,
+        help="fraction of rows in the old 5-column format (default 0.05)",
+    )
+    args = parser.parse_args()
+    final = generate_ledger(args.data_dir, args.rows, args.seed, args.legacy_share)
+    print(f"✅ Wrote {args.rows:,} transactions to {args.data_dir} (balance ${final:,.2f})")
@@ -8,9 +8,34 @@ A simple command-line expense tracker for learning Python
 
 # IMPORTS - Similar to "import React from 'react'" in JSX
 # These bring in built-in Python modules (like importing libraries)
-import csv  # For reading/writing CSV files (like a spreadsheet)
+import argparse  # For command-line flags (like process.argv parsing in Node)
+import asyncio  # For service mode (--serve)
+import atexit  # Print --stats however the program ends
+import csv  # For reading bank-export CSV files in import mode
+import json  # --stats-json dump
 import os  # For file system operations (checking if files exist)
+import sys  # sys.stdout.write - one write per page in the pager
+import time  # For measuring import speed (like performance.now() in JS)
 from datetime import datetime  # For getting current date/time
+from itertools import islice  # Take just one page from a stream of rows
+
+from aggregates import CategoryAggregates  # Running totals per category/month
+from balance_ledger import BalanceLedger  # Balance snapshots + verification
+from budgets import ALL, Budgets, describe_alert  # Spending limits + alerts
+from instrumentation import (  # Opt-in timing/row/byte/fsync counters
+    JOURNAL_OPS,
+    STORAGE_OPS,
+    TRACKER_OPS,
+    Instrumentation,
+)
+from journal import FileLock, GroupCommit, Journal  # Safe concurrent writes
+from money import format_cents, from_cents, parse_amount, to_cents  # Exact integer-cents money
+from recurring import RecurringScheduler  # Rent, salary... added on schedule
+from parallel_scan import parallel_filter, parallel_totals  # Multi-core CSV scans
+import reports  # PHASE 4: monthly/weekly/daily + category reports
+from search_index import SearchIndex  # Word -> rows index for text search
+from side_files import atomic_write  # Temp file + rename for balance.txt
+from storage import normalize_date, one_line, open_storage  # PHASE 3: pluggable CSV / SQLite storage
 
 
 # CLASS DEFINITION - Similar to creating a React component
@@ -20,12 +45,50 @@ class ExpenseTracker:
     # CONSTRUCTOR - Like useState hooks in React for initial setup
     # This runs automatically when you create a new ExpenseTracker
     # In React: const [balance, setBalance] = useState(0)
-    def __init__(self):
+    def __init__(self, storage="csv", data_dir=".", workers=1):
         # These are instance variables (like state in React)
         # self.variable_name is like this.variableName in JavaScript classes
-        self.balance_file = "balance.txt"  # Filename to store balance
-        self.transactions_file = "transactions.csv"  # Filename to store transactions
-        self.balance = self.load_balance()  # Load existing balance or start at 0
+        self.balance_file = os.path.join(data_dir, "balance.txt")  # Filename to store balance
+        self.transactions_file = os.path.join(
+            data_dir, "transactions.csv"
+        )  # Filename to store transactions (CSV backend)
+        # PHASE 3: STORAGE BACKEND - "csv" (original) or "sqlite" (indexed)
+        self.storage = open_storage(storage, data_dir)
+        self.storage_kind = storage
+        self.data_dir = data_dir
+        # PARALLEL SCANS - CPU cores used for full CSV scans (1 = no extra processes)
+        self.workers = workers
+        # SNAPSHOTS - save points used to check balance.txt against the rows
+        self.ledger = BalanceLedger(
+            self.storage, self._side_file("balance_snapshots", ".csv")
+        )
+        # CATEGORY TOTALS - updated on every write, read by the summary
+        self.aggregates = CategoryAggregates(self._side_file("category_totals", ".json"))
+        # BUDGETS - limits in budgets.json (not tied to storage positions, so
+        # shared by every backend); spending counters seeded from the totals
+        self.budgets = Budgets(os.path.join(data_dir, "budgets.json"))
+        # ALERT CALLBACK - like an onAlert prop: called once per BudgetAlert
+        # the moment a write crosses a threshold (prints by default)
+        self.on_budget_alert = lambda alert: print(describe_alert(alert))
+        # RECURRING RULES - which rows this storage has had added for them
+        # is part of the state, so each backend has its own copy
+        self.recurring = RecurringScheduler(self._side_file("recurring", ".json"))
+        # SEARCH INDEX - word -> rows, loaded the first time someone searches
+        self.search_index = SearchIndex(self._side_file("search_index", ".json"))
+
+        # SAFE WRITES - one lock for every tracker process using this folder,
+        # a write-ahead journal, and group commit for threads writing at once
+        self.lock = FileLock(os.path.join(data_dir, "tracker.lock"))
+        self.journal = Journal(self._side_file("transactions", ".journal"))
+        self.group_commit = GroupCommit(self._commit_groups)
+        # STATS - None until enable_stats(); nothing is measured (or slowed
+        # down) unless someone asks
+        self.stats = None
+        with self.lock:
+            self._recover()  # Finish a write a crashed tracker left behind
+            # Load existing balance or start at 0 - kept as whole cents (an
+            # int), so millions of additions never drift like floats do
+            self.balance_cents = self.load_balance_cents()
 
         # PHASE 2: CATEGORIES - Like having a predefined array in React
         # LIST DATA STRUCTURE - Similar to const categories = [...] in JavaScript
@@ -40,17 +103,46 @@ class ExpenseTracker:
             "Other",  # Miscellaneous expenses
         ]
 
+    def _side_file(self, stem, extension):
+        """
+        Path for a helper file that tracks positions in the storage
+
+        Each backend gets its own copy (CSV bookmarks are byte offsets,
+        SQLite ones are row ids), e.g. category_totals.json vs
+        category_totals_sqlite.json.
+        """
+        suffix = "" if self.storage_kind == "csv" else f"_{self.storage_kind}"
+        return os.path.join(self.data_dir, f"{stem}{suffix}{extension}")
+
+    # PROPERTY - reads like a plain attribute (tracker.balance), but is
+    # computed from balance_cents - like a getter/setter pair in a JS class
+    @property
+    def balance(self):
+        """Current balance in dollars (a float, for display and APIs)"""
+        return from_cents(self.balance_cents)
+
+    @balance.setter
+    def balance(self, dollars):
+        self.balance_cents = to_cents(dollars)
+
     # PHASE 2: RESET FUNCTION - Like clearing all state in React
     def reset_tracker(self):
         """Reset balance to 0 and delete all transactions"""
-        # Reset balance to 0 (like setBalance(0) in React)
-        self.balance = 0.0
-        self.save_balance()  # Save the reset balance to file
+        with self.lock:  # No other tracker may write while we wipe everything
+            # Reset balance to 0 (like setBalance(0) in React)
+            self.balance_cents = 0
+            self.save_balance()  # Save the reset balance to file
+
+            # DELETE TRANSACTIONS - Like clearing an array in React
+            # The storage backend knows how (delete the CSV file / empty the table)
+            self.storage.clear()
+            self.journal.clear()
 
-        # DELETE TRANSACTIONS FILE - Like clearing an array in React
-        # os.path.exists() checks if file exists before trying to delete
-        if os.path.exists(self.transactions_file):
-            os.remove(self.transactions_file)  # Delete the CSV file completely
+            # Old snapshots point at rows that no longer exist - start fresh at $0
+            self.ledger.clear()
+            self.ledger.snapshot(self.balance, rows=0)
+            self.aggregates.clear()
+            self.search_index.clear()
 
         print("✅ Tracker reset! Balance: $0.00, All transactions deleted.")
 
@@ -58,7 +150,11 @@ class ExpenseTracker:
     # def = "define function" (like const functionName = () => {} in JSX)
     # self = similar to "this" in JavaScript classes
     def load_balance(self):
-        """Load balance from file or set to 0 if file doesn't exist"""
+        """Load balance (in dollars) from file, or 0 if the file doesn't exist"""
+        return from_cents(self.load_balance_cents())
+
+    def load_balance_cents(self):
+        """Load balance from file as whole cents, or 0 if the file doesn't exist"""
 
         # IF STATEMENT - Same logic as JavaScript if/else
         # os.path.exists() checks if file exists (like checking if a variable exists)
@@ -66,13 +162,13 @@ class ExpenseTracker:
             # FILE READING - Like fetch() in JavaScript but for local files
             # with open() automatically closes the file when done (good practice)
             with open(self.balance_file, "r") as f:  # 'r' = read mode
-                # Read the file content and convert string to number
-                # .strip() removes whitespace (like .trim() in JavaScript)
-                # float() converts string to decimal number (like parseFloat() in JS)
-                return float(f.read().strip())
+                # Read the file content and convert "1234.56" to 123456 cents
+                # (exactly - older files with float text like "1000.0" or
+                # "0.30000000000000004" are rounded to the nearest cent)
+                return to_cents(f.read())
 
         # If file doesn't exist, return 0 (default balance)
-        return 0.0  # The .0 makes it explicitly a decimal number
+        return 0
 
     # PHASE 2: CATEGORY SELECTION METHOD - Like a dropdown component in React
     def show_categories(self):
@@ -111,69 +207,240 @@ class ExpenseTracker:
                 print("❌ Please enter a valid number")
                 # Loop continues, asking again
 
-    def save_balance(self):
-        """Save current balance to file"""
-        # This method writes the current balance to the balance file
-        # 'w' = write mode (overwrites existing file)
-        with open(self.balance_file, "w") as f:
-            # Write the balance as a string to the file
-            # str() converts the number to a string (like toString() in JS)
-            f.write(str(self.balance))
+    def save_balance(self, cents=None):
+        """Save current balance (or `cents`, if given) to file"""
+        # Text with exactly two decimals ("1234.50"), written atomically so a
+        # reader never sees a half-written balance
+        atomic_write(self.balance_file, format_cents(self.balance_cents if cents is None else cents))
 
     def set_balance(self, amount):
         """Set initial balance"""
-        self.balance = float(amount)
-        self.save_balance()
+        with self.lock:
+            self.balance_cents = to_cents(amount)
+            self.save_balance()
+            # Setting the balance by hand isn't a transaction row, so record a
+            # snapshot - otherwise verify would see a jump it can't explain
+            self.ledger.snapshot(self.balance)
         print(f"Balance set to ${self.balance:.2f}")
 
-    def add_transaction(self, description, amount):
-        """Add a new transaction with category selection"""
-        amount = float(amount)
+    def add_transaction(self, description, amount, category=None, notes=None):
+        """
+        Add a new transaction with category selection
+
+        Pass `category` and `notes` to skip the prompts (scripts, tests).
+        """
+        amount = parse_amount(amount)  # ValueError for "abc", "inf", "nan"
         date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # PHASE 2: CATEGORY SELECTION - Like calling a dropdown component in React
-        # Call our show_categories method to get user's choice
-        print("\n🏷️  Please select a category for this transaction:")
-        selected_category = self.show_categories()  # Returns the chosen category string
-
-        # Ask for notes (optional)
-        notes = input(
-            "Optional: Add a note for this transaction (press Enter to skip): "
-        ).strip()
-
-        # Update balance
-        self.balance += amount
-        self.save_balance()
-
-        # PHASE 2: UPDATED CSV STRUCTURE - Now includes Category column
-        # Save transaction to CSV with category
-        file_exists = os.path.exists(self.transactions_file)
-        with open(self.transactions_file, "a", newline="") as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                # UPDATED HEADER - Now includes "Category" column
-                # Like adding a new field to a database table
-                writer.writerow(
-                    ["Date", "Description", "Amount", "Balance", "Category", "Notes"]
-                )
+        if category is None:
+            # PHASE 2: CATEGORY SELECTION - Like calling a dropdown component in React
+            # Call our show_categories method to get user's choice
+            print("\n🏷️  Please select a category for this transaction:")
+            category = self.show_categories()  # Returns the chosen category string
+        elif category not in self.categories:
+            raise ValueError(f"Unknown category: {category!r}")
 
-            # UPDATED ROW DATA - Now includes the selected category
-            # In React terms: saving {...transaction, category: selectedCategory}
-            writer.writerow(
-                [date, description, amount, self.balance, selected_category, notes]
-            )
+        if notes is None:
+            # Ask for notes (optional)
+            notes = input(
+                "Optional: Add a note for this transaction (press Enter to skip): "
+            ).strip()
+
+        # PHASE 2: UPDATED ROW DATA - Now includes the selected category
+        # In React terms: saving {...transaction, category: selectedCategory}
+        # _commit works out the balance while holding the lock, so two
+        # trackers adding at the same time can't overwrite each other
+        rows = self._commit([(date, description, amount, category, notes)])
+        new_balance = from_cents(rows[-1][3])
 
         transaction_type = "Income" if amount > 0 else "Expense"
         # ENHANCED OUTPUT - Show category in confirmation message
         print(f"{transaction_type} added: {description} - ${abs(amount):.2f}")
-        print(f"Category: {selected_category}")  # Show which category was selected
+        print(f"Category: {category}")  # Show which category was selected
+        print(f"New balance: ${new_balance:.2f}")
+
+    def _commit(self, entries, alerts=None):
+        """
+        Save (date, description, amount, category, notes) entries
+
+        Returns the saved rows (money in whole cents, with their running
+        balances). Threads that
+        call this at the same time share one commit - see GroupCommit.
+        Budget alerts raised by THESE entries go to on_budget_alert, or are
+        appended to `alerts` if a list is given (their .row counts from 0
+        at entries[0]).
+        """
+        rows, raised = self.group_commit.submit(entries)
+        if alerts is None:
+            for alert in raised:
+                self.on_budget_alert(alert)
+        else:
+            alerts.extend(raised)
+        return rows
+
+    def _commit_groups(self, groups):
+        """
+        Write several callers' entries as one locked, journaled commit
+
+        Returns one (rows, budget alerts) pair per group, so each caller
+        only ever sees the alerts its own entries raised.
+        """
+        with self.lock:
+            self._recover()
+            # Another tracker process may have added rows since we last
+            # looked, so the balance on disk is the one to build on. Kept in
+            # a local until everything is saved: if an entry turns out to be
+            # bad, self.balance_cents still matches what is on disk
+            self.balance_cents = balance = self.load_balance_cents()
+            results, all_rows = [], []
+            for entries in groups:
+                rows = []
+                for date, description, amount, category, notes in entries:
+                    # Every write passes here - the one place that keeps a
+                    # pasted multi-line note from splitting its CSV row
+                    description, notes = one_line(description), one_line(notes)
+                    # INTEGER MATH - cents add up exactly, and the rows carry
+                    # them as they are (storage writes "-12.50" style text)
+                    cents = to_cents(amount)
+                    balance += cents
+                    rows.append([date, description, cents, balance, category, notes])
+                results.append(rows)
+                all_rows.extend(rows)
+
+            position = self.storage.end_position()
+            self.journal.write(position, all_rows)  # Durable from here on (1 fsync)
+            alerts = self._write_rows(all_rows)
+            self.save_balance(balance)
+            self.balance_cents = balance  # Rows and balance.txt are both saved
+            self.journal.mark_applied(position)
+            self.journal.maybe_checkpoint(self.storage)
+        # Hand each alert to the group its row came from, renumbered from
+        # that group's first row
+        grouped = [[] for _ in results]
+        if alerts:  # Usually none - skip building the row -> group map
+            owners = [(group, row) for group, rows in enumerate(results) for row in range(len(rows))]
+        for alert in alerts:
+            group, row = owners[alert.row]
+            grouped[group].append(alert._replace(row=row))
+        return list(zip(results, grouped))
+
+    def _recover(self):
+        """Redo the last journaled write if a tracker crashed in the middle of it"""
+        if self.journal.is_clean():
+            return  # The usual case - only the journal's last few bytes are read
+        record = self.journal.unapplied()
+        if record is None:
+            self.journal.seal()  # Only a torn, never-applied line - ignore it
+            return
+        # Throw away whatever part of the write made it into the storage,
+        # then apply the whole thing again
+        self.storage.truncate(record.position)
+        for alert in self._write_rows(record.rows):
+            self.on_budget_alert(alert)
+        self.save_balance(record.rows[-1][3])
+        self.balance_cents = record.rows[-1][3]
+        self.journal.mark_applied(record.position)
+        print(f"🔧 Recovered {len(record.rows)} transaction(s) from the journal")
+
+    def _write_rows(self, rows):
+        """
+        Save new rows and keep every side file (snapshots, ...) in step
+
+        Returns the budget alerts the rows raised (.row = index into `rows`).
+        """
+        # Every write goes through here, so new "on write" features only
+        # need to hook in once (like a single reducer handling all updates)
+        self.aggregates.catch_up(self.storage)  # Cheap no-op when already in sync
+        self.storage.append(rows)
+        self.ledger.record_append(len(rows), from_cents(rows[-1][3]))
+        end = self.storage.end_position()
+        # Budget counters first - they may need seeding from the totals as
+        # they were before these rows
+        alerts = self.budgets.record(rows, self.aggregates, end)
+        for row in rows:
+            self.aggregates.add(row[0], row[2], row[4])  # date, amount, category
+        self.aggregates.save(end)
+        if self.search_index.loaded:  # Not loaded = nobody searched yet; it catches up later
+            self.search_index.catch_up(self.storage)
+        return alerts
+
+    # BULK IMPORT - no prompts, for loading thousands of rows at once
+    def add_transactions_bulk(self, transactions, batch_size=10000):
+        """
+        Add many transactions without any input() prompts
+
+        `transactions` is any iterable (list, generator, CSV reader...) of
+        (description, amount, category, notes) tuples, optionally with a
+        5th "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD" date (defaults to now).
+        Rows are written in batches: per batch there is one lock, one
+        journal fsync, one storage append and one balance.txt update.
+        Returns (rows_added, rows_per_second).
+        """
+        start = time.perf_counter()  # High-resolution timer
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        count = 0
+        batch = []
+        for line_number, item in enumerate(transactions, 1):
+            description, amount, category, notes = item[:4]
+            date = now
+            if len(item) > 4 and item[4]:
+                try:
+                    date = normalize_date(item[4])
+                except ValueError:
+                    raise ValueError(
+                        f"Row {line_number}: bad date {item[4]!r} (use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS)"
+                    ) from None
+            if category not in self.categories:
+                # Batches already committed stay saved; this one is dropped
+                raise ValueError(f"Row {line_number}: unknown category {category!r}")
+            try:
+                amount = parse_amount(amount)
+            except ValueError:
+                raise ValueError(f"Row {line_number}: bad amount {amount!r}") from None
+            batch.append((date, description, amount, category, notes or ""))
+            if len(batch) >= batch_size:
+                self._commit(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._commit(batch)
+            count += len(batch)
+
+        elapsed = time.perf_counter() - start
+        rows_per_second = count / elapsed if elapsed > 0 else float("inf")
+        return count, rows_per_second
+
+    def import_csv(self, path, batch_size=10000):
+        """
+        Import a bank-export CSV with Description, Amount, Category and
+        (optional) Notes / Date columns, then report throughput
+        """
+        # utf-8-sig: UTF-8, minus the byte-order mark Excel puts in front
+        with open(path, "r", newline="", encoding="utf-8-sig") as f:
+            # DictReader maps each row to {"Description": ..., "Amount": ...}
+            # GENERATOR EXPRESSION - rows are converted lazily, one at a time
+            rows = (
+                (
+                    row["Description"],
+                    row["Amount"],
+                    row["Category"],
+                    row.get("Notes") or "",
+                    row.get("Date") or "",
+                )
+                for row in csv.DictReader(f)
+            )
+            count, rate = self.add_transactions_bulk(rows, batch_size=batch_size)
+        print(f"✅ Imported {count} transactions ({rate:,.0f} rows/sec)")
         print(f"New balance: ${self.balance:.2f}")
+        return count, rate
 
     # VIEWING TRANSACTIONS METHOD - Like displaying a list in React
-    def view_transactions(self):
-        """View all transactions with categories"""
-        # Check if the CSV file exists (similar to checking if data exists)
-        if not os.path.exists(self.transactions_file):
+    def view_transactions(
+        self, limit=None, offset=0, last=None, start_date=None, end_date=None
+    ):
+        """View transactions with categories (all of them by default)"""
+        # Check if any data exists (similar to checking if data exists)
+        if not self.storage.exists():
             print("No transactions found.")
             return  # Exit the function early (like early return in React)
 
@@ -184,87 +451,481 @@ class ExpenseTracker:
         print("TRANSACTION HISTORY")
         print("=" * 70)
 
-        # CSV READING - Like fetching and parsing JSON data
-        with open(self.transactions_file, "r") as f:
-            reader = csv.reader(f)  # Creates a CSV reader object
-            header = next(reader)  # Read the first row (header row)
+        # FOR LOOP - Like .map() in React but for console output
+        # The storage backend streams one record at a time (old CSV formats
+        # included), so even a huge file never has to fit in memory at once
+        found = False
+        # start_date/end_date let the backend jump straight to the right rows
+        # (SQLite's date index / the CSV's day -> byte offset index)
+        for transaction in self.storage.iter_rows(
+            limit=limit,
+            offset=offset,
+            last=last,
+            start_date=start_date,
+            end_date=end_date,
+        ):
+            found = True
+            self.print_transaction(transaction)
+
+        if not found:  # Header only, no rows (like checking array.length === 0)
+            print("No transactions found.")
+
+    def print_transaction(self, transaction):
+        """Print one Transaction record (shared by view and filter)"""
+        print(self.format_transaction(transaction))
+
+    def format_transaction(self, transaction):
+        """One Transaction record as display text (one or two lines)"""
+        # TUPLE UNPACKING - Like const { date, amount, ... } = transaction in JS
+        date, description, amount, balance, category, notes = transaction
+        amount, balance = from_cents(amount), from_cents(balance)  # Cents -> dollars for display
+
+        # TERNARY OPERATOR - Same as JavaScript ? : operator
+        transaction_type = "+" if amount > 0 else "-"
 
-            # BACKWARDS COMPATIBILITY - Handle old CSV format without categories
-            # Check if this is old format (5 columns) or new format (6 columns)
-            has_categories = len(header) == 6  # New format has 6 columns
+        # ENHANCED F-STRING FORMATTING - Now includes category
+        # f"{variable}" is like `${variable}` in JavaScript
+        # :<15 means left-align in 15 characters (like CSS text-align)
+        line = f"{date} | {description:<15} | {category:<12} | {transaction_type}${abs(amount):>7.2f} | Balance: ${balance:>8.2f}"
 
-            # Convert CSV reader to a list (like spreading data in React)
-            transactions = list(reader)
-            if not transactions:  # If list is empty (like checking array.length === 0)
-                print("No transactions found.")
+        # CONDITIONAL LINE - Only show notes if they exist
+        if notes:  # In Python, empty string is "falsy" (like in JS)
+            line += f"\n    Notes: {notes}"  # Indented for better formatting
+        return line
+
+    def render_page(self, position=None, page_size=20):
+        """
+        Build one page of the newest-first history as a single string
+
+        Only `page_size` rows before `position` (a storage bookmark, default:
+        the end) are read and formatted. Returns (text, rows_shown,
+        next_position) - pass next_position back in for the next older page
+        (None once the oldest row has been shown).
+        """
+        rows = list(islice(self.storage.scan_backward(position), page_size + 1))
+        # Reading one row extra tells us whether there is an older page
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        lines = [self.format_transaction(transaction) for _, transaction in rows]
+        next_position = rows[-1][0] if has_more else None
+        return "\n".join(lines), len(rows), next_position
+
+    def page_transactions(self, page_size=20, date=None):
+        """
+        Interactive newest-first viewer: one screen of rows at a time
+
+        Enter = older page, n = newer page, d = jump to a date, s = rows per
+        page, q = quit. `date` ("YYYY-MM-DD") starts on the newest rows up
+        to that day.
+        """
+        if not self.storage.exists():
+            print("No transactions found.")
+            return
+        # STACK of page start positions - like browser history for "back"
+        position = None if date is None else self.storage.position_at_date(date)
+        history = []
+        while True:
+            text, shown, next_position = self.render_page(position, page_size)
+            header = "\n" + "=" * 70 + "\nTRANSACTION HISTORY (newest first)\n" + "=" * 70
+            if not shown:
+                text = "No transactions found."
+            # BUFFERED OUTPUT - the whole page goes to the terminal in one write
+            sys.stdout.write(f"{header}\n{text}\n" + "-" * 70 + "\n")
+            choice = input("[Enter] older  (n)ewer  (d)ate  (s)ize  (q)uit: ").strip().lower()
+            if choice == "q":
                 return
+            if choice == "n":
+                if history:
+                    position = history.pop()
+            elif choice == "d":
+                day = input("Jump to date (YYYY-MM-DD): ").strip()
+                if day:
+                    history.append(position)
+                    position = self.storage.position_at_date(day)
+            elif choice == "s":
+                size = input(f"Rows per page [{page_size}]: ").strip()
+                if size.isdigit() and int(size) > 0:
+                    page_size = int(size)  # Same position, just a longer/shorter page
+                elif size:
+                    print("Please enter a whole number above 0.")
+            elif next_position is not None:
+                history.append(position)
+                position = next_position
+            else:
+                print("That's the oldest page.")
 
-            # FOR LOOP - Like .map() in React but for console output
-            # for item in array: is like array.map((item) => { ... })
-            for row in transactions:
-                # CONDITIONAL DESTRUCTURING - Handle both old and new CSV formats
-                # Like handling optional props in React components
-                if has_categories and len(row) == 6:
-                    # NEW FORMAT: Date, Description, Amount, Balance, Category, Notes
-                    date, description, amount, balance, category, notes = row
-                else:
-                    # OLD FORMAT: Date, Description, Amount, Balance, Notes (no category)
-                    date, description, amount, balance, notes = row[
-                        :5
-                    ]  # Take first 5 elements
-                    category = "Uncategorized"  # Default category for old transactions
-
-                amount = float(amount)  # Convert string to number
-
-                # TERNARY OPERATOR - Same as JavaScript ? : operator
-                transaction_type = "+" if amount > 0 else "-"
-
-                # ENHANCED F-STRING FORMATTING - Now includes category
-                # f"{variable}" is like `${variable}` in JavaScript
-                # :<15 means left-align in 15 characters (like CSS text-align)
-                print(
-                    f"{date} | {description:<15} | {category:<12} | {transaction_type}${abs(amount):>7.2f} | Balance: ${float(balance):>8.2f}"
-                )
+    def verify_balance(self, fix=False):
+        """
+        Check balance.txt against the Balance column of the saved rows
+
+        Only the rows added since the last snapshot are replayed, so this
+        stays fast on huge files. With fix=True, balance.txt is rewritten
+        with the recomputed value (e.g. after a crash mid-write) - but only
+        when a snapshot backs it: with none, balance.txt may hold a balance
+        set by hand that no row records, and the rows can't prove it wrong.
+        """
+        # Locked like a write: another tracker appending between the replay
+        # and the comparison (or the fix) would make us report - or save -
+        # a balance that is already out of date
+        with self.lock:
+            self.balance_cents = self.load_balance_cents()  # What balance.txt says right now
+            self.ledger.refresh()  # ...and the newest snapshot, whoever wrote it
+            saved = self.balance
+            ok, check = self.ledger.verify(saved)
+            fixed = not ok and fix and check.from_snapshot is not None
+            if fixed:
+                self.balance = check.balance
+                self.save_balance()
+                self.ledger.snapshot(self.balance)
+        start = "last snapshot" if check.from_snapshot else "the first row"
+        print(f"Replayed {check.rows_replayed} row(s) from {start}.")
+        for position, transaction in check.jumps[:10]:  # Show the first few
+            print(
+                f"ℹ️  Row at position {position} ({transaction.date} {transaction.description}) "
+                f"starts from a new balance (${format_cents(transaction.balance)}) - set by hand?"
+            )
+        if ok:
+            print(f"✅ Balance verified: ${saved:.2f}")
+        elif fixed:
+            print(f"🔧 Balance recomputed and saved: ${self.balance:.2f}")
+        else:
+            print(f"❌ balance.txt says ${saved:.2f}, rows say ${check.balance:.2f}")
+            if fix:
+                # A full replay can't tell a crash from a hand-set balance
+                print("No snapshot covers these rows, so balance.txt was left unchanged.")
+                print("If it is wrong, correct it with Set Balance.")
+        return ok, check
+
+    # CATEGORY SUMMARY - answered from the running totals, not the rows
+    def category_summary(self, month=None):
+        """Show count / income / expenses / min / max for each category"""
+        # If rows were added outside the tracker, only those get read here.
+        # Locked because catching up saves category_totals.json
+        with self.lock:
+            self.aggregates.catch_up(self.storage)
+        summary = self.aggregates.summary(month)
+        if not summary:
+            print("No transactions found.")
+            return summary
+
+        title = f"CATEGORY SUMMARY - {month}" if month else "CATEGORY SUMMARY"
+        print("\n" + "=" * 70)
+        print(title)
+        print("=" * 70)
+        print(
+            f"{'Category':<18} {'Count':>6} {'Income':>11} {'Expenses':>11} {'Smallest':>10} {'Largest':>10}"
+        )
+        print("-" * 70)
+        # sorted() by key - like .sort() on Object.entries() in JavaScript
+        for category, (count, income, expenses, low, high) in sorted(summary.items()):
+            print(
+                f"{category:<18} {count:>6} {income:>11.2f} {expenses:>11.2f} {low:>10.2f} {high:>10.2f}"
+            )
+        return summary
+
+    # PHASE 4: REPORTS - totals per period and per category
+    def report(self, period="month", start_date=None, end_date=None):
+        """
+        Print income/expenses per month, week or day plus a category breakdown
+
+        The rows are loaded once into column arrays and summed with NumPy
+        when it's installed (see reports.py). Returns (period_totals,
+        category_totals) so other code can use the numbers too.
+        """
+        rows = self.storage.iter_rows(start_date=start_date, end_date=end_date)
+        columns = reports.load_columns(rows, self.categories)
+        by_period = reports.period_report(columns, period)
+        by_category = reports.category_report(columns)
+        if not by_period:
+            print("No transactions found.")
+            return by_period, by_category
+
+        print("\n" + "=" * 70)
+        print(f"{period.upper()}LY REPORT" if period != "day" else "DAILY REPORT")
+        print("=" * 70)
+        print(f"{'Period':<22} {'Count':>7} {'Income':>12} {'Expenses':>12} {'Net':>12}")
+        print("-" * 70)
+        for line in by_period:
+            print(
+                f"{line.period:<22} {line.count:>7} {line.income:>12.2f} {line.expenses:>12.2f} {line.net:>12.2f}"
+            )
+
+        # SPENDING ANALYSIS - biggest expense categories first
+        print("\n" + "-" * 70)
+        print("SPENDING BY CATEGORY")
+        print("-" * 70)
+        total_expenses = sum(line.expenses for line in by_category) or 1.0
+        for line in sorted(by_category, key=lambda line: line.expenses, reverse=True):
+            if not line.expenses:
+                continue  # Income-only categories have no spending to show
+            share = line.expenses / total_expenses * 100
+            print(
+                f"{line.category:<22} {line.count:>7} {line.expenses:>12.2f} {share:>6.1f}% of spending"
+            )
+        return by_period, by_category
+
+    # INSTRUMENTATION - where does the time go?
+    def enable_stats(self):
+        """
+        Start timing the tracker's operations (see instrumentation.py)
+
+        Wraps the load/save/add/scan methods of this tracker, its storage
+        and its journal, and counts fsyncs. Returns the Instrumentation.
+        """
+        if self.stats is None:
+            self.stats = Instrumentation()
+            self.stats.attach(self, TRACKER_OPS)
+            self.stats.attach(self.storage, STORAGE_OPS, "storage.")
+            self.stats.attach(self.journal, JOURNAL_OPS, "journal.")
+            self.stats.count_fsyncs()
+        return self.stats
+
+    def disable_stats(self):
+        """Remove the wrappers again - back to zero overhead"""
+        if self.stats is not None:
+            self.stats.detach()
+            self.stats = None
+
+    # PHASE 4: BUDGETS - limits checked on every write, reports from counters
+    def set_budget(self, category, period, amount):
+        """Set a spending limit in dollars ("*" = all categories); 0 removes it"""
+        if category != ALL and category not in self.categories:
+            raise ValueError(f"Unknown category: {category!r}")
+        cents = to_cents(parse_amount(amount))
+        self.budgets.set_limit(category, period, cents)
+        name = "All spending" if category == ALL else category
+        if cents:
+            print(f"✅ Budget set: {name} - ${format_cents(cents)} per {period}")
+        else:
+            print(f"✅ Budget removed: {name} per {period}")
+
+    def budget_report(self, prefix=None):
+        """
+        Print budget vs actual for each budget and period ("2025" / "2025-08"
+        narrows it down). Served from the running counters - no rows are read
+        """
+        # Rows added outside the tracker are folded into the totals first
+        with self.lock:
+            self.aggregates.catch_up(self.storage)
+            lines = self.budgets.report(self.aggregates, prefix)
+        if not self.budgets.limits:
+            print("No budgets set.")
+            return lines
+
+        print("\n" + "=" * 70)
+        print(f"BUDGETS - {prefix}" if prefix else "BUDGETS")
+        print("=" * 70)
+        print(f"{'Budget':<26} {'Period':<9} {'Spent':>11} {'Limit':>11} {'Used':>7}")
+        print("-" * 70)
+        for line in lines:
+            name = "All spending" if line.category == ALL else line.category
+            used = line.spent * 100 / line.limit
+            flag = " ⚠️" if used >= 100 else ""
+            print(
+                f"{name + ' / ' + line.period:<26} {line.period_key:<9} "
+                f"{format_cents(line.spent):>11} {format_cents(line.limit):>11} {used:>6.0f}%{flag}"
+            )
+        if not lines:
+            print("No spending in this period yet.")
+        return lines
+
+    # PHASE 5: RECURRING TRANSACTIONS
+    def add_recurring(self, description, amount, category, schedule, start=None, notes=""):
+        """
+        Add a recurring rule ("daily", "weekly", "monthly" or a cron line
+        like "0 9 1 * *"); occurrences from `start` on are added by
+        run_recurring(). Returns the rule id.
+        """
+        if category not in self.categories:
+            raise ValueError(f"Unknown category: {category!r}")
+        rule_id = self.recurring.add_rule(description, parse_amount(amount), category, schedule, start, notes)
+        rule = self.recurring.rules[rule_id]
+        print(f"✅ Recurring rule #{rule_id} added: {description} ({schedule}), first on {rule['next_due']}")
+        return rule_id
+
+    def remove_recurring(self, rule_id):
+        """Stop a recurring rule (rows it already added are kept)"""
+        if self.recurring.remove_rule(rule_id):
+            print(f"✅ Recurring rule #{rule_id} removed")
+            return True
+        print(f"❌ No recurring rule #{rule_id}")
+        return False
+
+    def show_recurring(self):
+        """List the recurring rules, soonest first"""
+        self.recurring.refresh()
+        rules = sorted(self.recurring.rules.values(), key=lambda rule: rule["next_due"])
+        if not rules:
+            print("No recurring transactions.")
+            return rules
+        print("\n" + "=" * 70)
+        print("RECURRING TRANSACTIONS")
+        print("=" * 70)
+        print(f"{'#':>3}  {'Next due':<19}  {'Schedule':<13} {'Amount':>10}  Description")
+        print("-" * 70)
+        for rule in rules:
+            print(
+                f"{rule['id']:>3}  {rule['next_due']:<19}  {rule['schedule']:<13} "
+                f"{format_cents(rule['amount']):>10}  {rule['description']} ({rule['category']})"
+            )
+        return rules
+
+    def run_recurring(self, now=None):
+        """
+        Add every recurring occurrence due by `now` (default: this moment)
+
+        However many are overdue - one rent payment or ten years of them -
+        they are saved in ONE commit: one lock, one fsync, one append.
+        Returns how many rows were added.
+        """
+        with self.lock:  # No other tracker may add the same occurrences
+            self._recover()
+            self.recurring.refresh()
+            self.recurring.recover(self.storage)  # A catch-up that crashed midway
+            previous = {rule_id: rule["next_due"] for rule_id, rule in self.recurring.rules.items()}
+            entries = self.recurring.due(now)
+            if entries:
+                self.recurring.begin(self.storage.end_position(), previous, entries[0])
+                # Straight to _commit_groups: we already hold the lock, and
+                # waiting on another thread's group commit here could deadlock
+                [(_, alerts)] = self._commit_groups([entries])
+                self.recurring.finish()
+            else:
+                alerts = []
+        for alert in alerts:
+            self.on_budget_alert(alert)
+        if entries:
+            print(f"🔁 Added {len(entries)} recurring transaction(s). Balance: ${self.balance:.2f}")
+        return len(entries)
 
-                # CONDITIONAL PRINTING - Only show notes if they exist
-                if notes:  # In Python, empty string is "falsy" (like in JS)
-                    print(f"    Notes: {notes}")  # Indented for better formatting
+    def rebuild_aggregates(self):
+        """Recompute the category totals from scratch (if they look wrong)"""
+        if self.workers > 1 and self.storage_kind == "csv":
+            # Parse the CSV on several cores; hold the lock so no rows are
+            # added between the scan and saving its bookmark
+            with self.lock:
+                end = self.storage.end_position()
+                self.aggregates.totals = parallel_totals(self.storage.path, self.workers)
+                self.aggregates.rewrite = True  # Every total is new - not an appended change
+                self.aggregates.save(end)
+        else:
+            with self.lock:
+                self.aggregates.rebuild(self.storage)
+        print(f"✅ Category totals rebuilt ({len(self.aggregates.totals)} category-months)")
+
+    def migrate_money(self):
+        """
+        Rewrite balance.txt and every row's Amount/Balance with exactly two
+        decimals (e.g. "1000.0" or "0.30000000000000004" -> "1000.00"/"0.30"),
+        and put CSV rows saved with a line break in a note back on one line
+
+        Older files still load fine without this - it just makes the files
+        match the integer-cents model. Run it while no other tracker is open.
+        """
+        with self.lock:
+            changed = self.storage.normalize_money()
+            self.save_balance()
+            if changed:
+                # The CSV was rewritten, so every saved byte offset is stale:
+                # drop the journal, snapshots, totals and search index (they
+                # rebuild themselves from the rows when next needed)
+                self.journal.clear()
+                self.ledger.clear()
+                self.aggregates.clear()
+                self.budgets.invalidate()
+                self.search_index.clear()
+        print(f"✅ Money migrated to whole cents ({changed} row(s) rewritten)")
+        print(f"Balance: ${self.balance:.2f}")
+        return changed
+
+    def show_segments(self):
+        """List the sealed monthly segments with their footer summaries"""
+        print("\n" + "=" * 70)
+        print("SEGMENTS")
+        print("=" * 70)
+        print(f"{'Months':<22}{'Rows':>9}{'Size':>12}  {'Final balance':>14}")
+        for entry in self.storage.summaries():
+            first, last = entry["months"]
+            months = first if first == last else f"{first} to {last}"
+            size = os.path.getsize(os.path.join(self.storage.path, entry["file"]))
+            balance = entry["footer"]["final_balance"]
+            print(f"{months:<22}{entry['rows']:>9,}{size:>11,}B  ${balance:>13}")
+        if self.storage.active:
+            print(f"{self.storage.active_month + ' (current)':<22}")
+
+    def compact_segments(self, min_rows=1000):
+        """Merge small sealed segments (segments storage only)"""
+        with self.lock:  # No rotation may happen while files are swapped
+            before, after = self.storage.compact(min_rows)
+        print(f"✅ Compacted {before} sealed segment(s) into {after}")
+        return before, after
 
     def get_balance(self):
         """Display current balance"""
         print(f"Current balance: ${self.balance:.2f}")
         return self.balance
 
-    def filter_transactions_by_category(self):
+    def filter_transactions_by_category(
+        self, selected_category=None, limit=None, offset=0, last=None
+    ):
         """Display only transactions matching a selected category"""
-        selected_category = self.show_categories()
-        if not os.path.exists(self.transactions_file):
+        if selected_category is None:  # Ask the user unless a category was passed in
+            selected_category = self.show_categories()
+        if not self.storage.exists():
             print("No transactions found.")
             return
 
         print(f"\nTransactions in category: {selected_category}")
         print("=" * 70)
         found = False
-        with open(self.transactions_file, "r") as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            has_categories = len(header) == 6
-            for row in reader:
-                if has_categories and len(row) == 6:
-                    date, description, amount, balance, category, notes = row
-                else:
-                    date, description, amount, balance, notes = row[:5]
-                    category = "Uncategorized"
-                if category == selected_category:
-                    found = True
-                    amount = float(amount)
-                    transaction_type = "+" if amount > 0 else "-"
-                    print(f"{date} | {description:<15} | {category:<12} | {transaction_type}${abs(amount):>7.2f} | Balance: ${float(balance):>8.2f}")
-                    if notes:
-                        print(f"    Notes: {notes}")
+        # PHASE 3: the category check is pushed down into the backend
+        # (SQLite uses its (category, date) index instead of scanning every row)
+        if self.workers > 1 and self.storage_kind == "csv" and limit is None:
+            # Whole-file scan anyway - split it across CPU cores
+            rows = parallel_filter(self.storage.path, selected_category, self.workers)
+            if last is not None:
+                rows = rows[-last:] if last else []
+            rows = rows[offset:]
+        else:
+            rows = self.storage.iter_rows(
+                category=selected_category, limit=limit, offset=offset, last=last
+            )
+        for transaction in rows:
+            found = True
+            self.print_transaction(transaction)
         if not found:
             print("No transactions found for this category.")
 
+    def search_transactions(self, query=None, limit=None, offset=0, last=None):
+        """
+        Show transactions whose description or notes contain every word
+
+        "coffee lunch" needs both words; "gro*" matches any word starting
+        with "gro". Uses the inverted index, so only matching rows are read.
+        Returns how many rows matched.
+        """
+        if query is None:
+            query = input("Search for (words, use * for prefixes): ").strip()
+        with self.lock:  # Catching up may save search_index.json
+            self.search_index.catch_up(self.storage)  # First search loads the index
+        bookmarks = self.search_index.search(query)
+        total = len(bookmarks)
+        # SLICING - same paging options as view/filter
+        if last is not None:
+            bookmarks = bookmarks[-last:] if last else []
+        stop = None if limit is None else offset + limit
+        bookmarks = bookmarks[offset:stop]
+
+        print(f"\nTransactions matching: {query}")
+        print("=" * 70)
+        for transaction in self.storage.rows_at(bookmarks):
+            self.print_transaction(transaction)
+        if total == 0:
+            print("No transactions found.")
+        elif len(bookmarks) < total:
+            print(f"({len(bookmarks)} of {total} matches shown)")
+        return total
+
 
 # STANDALONE FUNCTION - Like a utility function outside of React components
 # This is NOT inside the ExpenseTracker class (no 'self' parameter)
@@ -281,16 +942,253 @@ def show_menu():
     print("5. Check Balance")
     print("6. Reset Tracker")  # NEW: Reset option
     print("7. Filter by Category")  # NEW: Filter option
-    print("8. Exit")
+    print("8. View by Date Range")
+    print("9. Category Summary")
+    print("10. Reports")
+    print("11. Search")
+    print("12. Budgets")
+    print("13. Recurring")
+    print("14. Exit")
     print("-" * 40)  # Bottom separator
 
 
 # MAIN FUNCTION - Like your App() component in React
 # This is the entry point that runs everything
-def main():
+def parse_args(argv=None):
+    """Read command-line flags (like process.argv in Node)"""
+    parser = argparse.ArgumentParser(description="Personal Expense Tracker")
+    parser.add_argument(
+        "--storage",
+        choices=["csv", "sqlite", "segments"],
+        default="csv",
+        help="where transactions are stored (default: csv; segments = one file per month)",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_file",
+        metavar="FILE",
+        help="bulk-import a CSV (Description,Amount,Category[,Notes][,Date]) and exit",
+    )
+    parser.add_argument(
+        "--verify-balance",
+        action="store_true",
+        help="check balance.txt against the saved rows and exit",
+    )
+    parser.add_argument(
+        "--recompute-balance",
+        action="store_true",
+        help="like --verify-balance, but also fix balance.txt if it disagrees",
+    )
+    parser.add_argument(
+        "--rebuild-aggregates",
+        action="store_true",
+        help="recompute the category totals from every row and exit",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help='show transactions whose description/notes contain every word (e.g. "gro* weekly") and exit',
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="CPU cores for full CSV scans (filter, --rebuild-aggregates); default 1",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=20,
+        metavar="N",
+        help="rows per page in menu 4 (View Transactions); default 20",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="run as a service answering JSON requests on a local socket",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Unix socket path for --serve (default: tracker.sock)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="serve on 127.0.0.1:PORT instead of a Unix socket",
+    )
+    parser.add_argument(
+        "--migrate-money",
+        action="store_true",
+        help="rewrite balance.txt and all amounts with exactly two decimals and exit",
+    )
+    parser.add_argument(
+        "--migrate-csv",
+        action="store_true",
+        help="copy transactions.csv into the --storage backend (SQLite by default) and exit",
+    )
+    parser.add_argument(
+        "--budget",
+        nargs=3,
+        metavar=("CATEGORY", "PERIOD", "AMOUNT"),
+        help='set a spending limit ("*" = all categories, PERIOD month or year, 0 removes) and exit',
+    )
+    parser.add_argument(
+        "--budgets",
+        nargs="?",
+        const="",
+        metavar="PERIOD",
+        help="show budget vs actual (optionally for one YYYY or YYYY-MM) and exit",
+    )
+    parser.add_argument(
+        "--recur",
+        nargs=4,
+        metavar=("DESCRIPTION", "AMOUNT", "CATEGORY", "SCHEDULE"),
+        help='add a recurring transaction (SCHEDULE daily, weekly, monthly or cron like "0 9 1 * *") and exit',
+    )
+    parser.add_argument(
+        "--start",
+        metavar="DATE",
+        help="first occurrence for --recur (YYYY-MM-DD[ HH:MM:SS]; default now)",
+    )
+    parser.add_argument(
+        "--recurring",
+        action="store_true",
+        help="list the recurring transactions and exit",
+    )
+    parser.add_argument(
+        "--unrecur",
+        type=int,
+        metavar="ID",
+        help="remove recurring rule ID and exit",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="time every operation and print latency/rows/bytes/fsync stats on exit",
+    )
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        help="like --stats, but write the numbers as JSON to PATH (- for stdout) on exit",
+    )
+    parser.add_argument(
+        "--segments",
+        action="store_true",
+        help="list the monthly segments (--storage segments) with their footers and exit",
+    )
+    parser.add_argument(
+        "--compact",
+        nargs="?",
+        const=1000,
+        type=int,
+        metavar="MIN_ROWS",
+        help="merge neighbouring sealed segments smaller than MIN_ROWS (default 1000) and exit",
+    )
+    args = parser.parse_args(argv)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    return args
+
+
+def report_stats(tracker, show=True, json_path=None):
+    """Print the stats table and/or write the machine-readable dump"""
+    if show:
+        print(tracker.stats.format_table())
+    if json_path == "-":
+        print(json.dumps(tracker.stats.dump(), indent=2))
+    elif json_path:
+        with open(json_path, "w") as f:
+            f.write(json.dumps(tracker.stats.dump(), indent=2))
+        print(f"📊 Stats written to {json_path}")
+
+
+def main(argv=None):
     """Main program loop"""
+    args = parse_args(argv)
+
+    # PHASE 3: ONE-OFF MIGRATION - CSV rows -> SQLite table
+    if args.migrate_csv:
+        source = open_storage("csv")
+        target = open_storage(args.storage if args.storage != "csv" else "sqlite")
+        if target.exists():  # Don't copy the same rows in twice
+            print(f"❌ {target.path} already has transactions - migration skipped.")
+            return
+        target.import_from(source)
+        print(f"✅ Migrated {source.path} into {target.path}")
+        return
+
     # CREATE INSTANCE - Like const [tracker] = useState(new ExpenseTracker())
-    tracker = ExpenseTracker()  # Create new expense tracker object
+    tracker = ExpenseTracker(storage=args.storage, workers=args.workers)  # Create new expense tracker object
+    if args.stats or args.stats_json:
+        tracker.enable_stats()
+        # ATEXIT - runs however main() ends (command done, Exit, Ctrl+C)
+        atexit.register(report_stats, tracker, args.stats, args.stats_json)
+    # RECURRING CATCH-UP - add whatever came due while the tracker was closed
+    tracker.run_recurring()
+
+    # SERVICE MODE - keep this tracker loaded and answer socket requests
+    if args.serve:
+        from server import serve  # Only needed in service mode
+
+        try:
+            asyncio.run(serve(tracker, socket_path=args.socket, port=args.port))
+        except KeyboardInterrupt:
+            print("\nService stopped.")
+        return
+
+    # ONE-SHOT COMMANDS - run and exit without showing the menu
+    if args.import_file:
+        try:
+            tracker.import_csv(args.import_file)
+        except (KeyError, ValueError) as error:  # Missing column / bad row
+            print(f"❌ Import stopped: {error}")
+        return
+    if args.rebuild_aggregates:
+        tracker.rebuild_aggregates()
+        return
+    if args.migrate_money:
+        tracker.migrate_money()
+        return
+    if args.segments or args.compact is not None:
+        if args.storage != "segments":
+            print("❌ --segments/--compact need --storage segments")
+        elif args.compact is not None:
+            tracker.compact_segments(args.compact)
+        else:
+            tracker.show_segments()
+        return
+    if args.recur:
+        description, amount, category, schedule = args.recur
+        try:
+            tracker.add_recurring(description, amount, category, schedule, args.start)
+            tracker.run_recurring()  # A start date in the past is caught up now
+        except ValueError as error:
+            print(f"❌ {error}")
+        return
+    if args.recurring:
+        tracker.show_recurring()
+        return
+    if args.unrecur is not None:
+        tracker.remove_recurring(args.unrecur)
+        return
+    if args.budget:
+        category, period, amount = args.budget
+        try:
+            tracker.set_budget(category, period, amount)
+        except ValueError as error:
+            print(f"❌ {error}")
+        return
+    if args.budgets is not None:
+        tracker.budget_report(args.budgets or None)
+        return
+    if args.search:
+        tracker.search_transactions(args.search)
+        return
+    if args.verify_balance or args.recompute_balance:
+        tracker.verify_balance(fix=args.recompute_balance)
+        return
 
     # WELCOME MESSAGE - Like initial render in React
     print("Welcome to your Personal Expense Tracker!")
@@ -303,7 +1201,7 @@ def main():
 
         # USER INPUT - Like handling form input in React
         # input() waits for user to type something and press Enter
-        choice = input("Choose an option (1-8): ").strip()  # Remove extra spaces
+        choice = input("Choose an option (1-14): ").strip()  # Remove extra spaces
 
         # SWITCH-LIKE LOGIC - Like switch statement or if/else chain in JS
         # Python uses if/elif/else instead of switch/case
@@ -311,7 +1209,7 @@ def main():
         if choice == "1":  # Set Balance option
             # TRY/CATCH BLOCK - Same concept as JavaScript try/catch
             try:
-                amount = float(input("Enter initial balance: $"))  # Get user input
+                amount = parse_amount(input("Enter initial balance: $"))  # Get user input
                 tracker.set_balance(amount)  # Call method on our tracker object
             except ValueError:  # If user enters invalid number (like "abc")
                 print("Please enter a valid number.")  # Error handling
@@ -320,7 +1218,7 @@ def main():
             description = input("Enter income description: ")  # Get description first
             try:
                 # abs() makes sure amount is positive (remove negative sign if user enters it)
-                amount = abs(float(input("Enter income amount: $")))
+                amount = abs(parse_amount(input("Enter income amount: $")))
                 tracker.add_transaction(description, amount)  # Positive amount = income
             except ValueError:
                 print("Please enter a valid amount.")
@@ -329,7 +1227,7 @@ def main():
             description = input("Enter expense description: ")
             try:
                 # Get positive number, then make it negative for expense
-                amount = abs(float(input("Enter expense amount: $")))
+                amount = abs(parse_amount(input("Enter expense amount: $")))
                 tracker.add_transaction(
                     description, -amount
                 )  # Negative amount = expense
@@ -337,7 +1235,8 @@ def main():
                 print("Please enter a valid amount.")
 
         elif choice == "4":  # View Transactions
-            tracker.view_transactions()  # Call method to display all transactions
+            # PAGED VIEW - newest rows first, one screen at a time
+            tracker.page_transactions(page_size=args.page_size)
 
         elif choice == "5":  # Check Balance
             tracker.get_balance()  # Display current balance
@@ -358,11 +1257,64 @@ def main():
             print("\n" + "=" * 50)
             tracker.filter_transactions_by_category()  # Call method to filter transactions by category
 
-        elif choice == "8":  # Exit option
+        elif choice == "8":  # View by Date Range option
+            # Blank input = no limit on that side (like an optional prop)
+            start_date = input("Start date (YYYY-MM-DD, Enter for earliest): ").strip()
+            end_date = input("End date (YYYY-MM-DD, Enter for latest): ").strip()
+            tracker.view_transactions(
+                start_date=start_date or None, end_date=end_date or None
+            )
+
+        elif choice == "9":  # Category Summary option
+            month = input("Month (YYYY-MM, Enter for all time): ").strip()
+            tracker.category_summary(month or None)
+
+        elif choice == "10":  # Reports option
+            # DICTIONARY LOOKUP - Like an object map { m: "month", ... } in JS
+            periods = {"m": "month", "w": "week", "d": "day"}
+            period = input("Report by (m)onth, (w)eek or (d)ay? [m]: ").strip().lower()
+            tracker.report(periods.get(period[:1], "month"))
+
+        elif choice == "11":  # Search option
+            tracker.search_transactions()
+
+        elif choice == "12":  # Budgets option
+            tracker.budget_report()
+            answer = input("Set a budget? (y/N): ").strip().lower()
+            if answer in ("y", "yes"):
+                category = tracker.show_categories()
+                period = input("Per (m)onth or (y)ear? [m]: ").strip().lower()
+                try:
+                    amount = abs(parse_amount(input("Limit (0 removes it): $")))
+                    tracker.set_budget(category, "year" if period[:1] == "y" else "month", amount)
+                except ValueError:
+                    print("Please enter a valid amount.")
+
+        elif choice == "13":  # Recurring option
+            tracker.show_recurring()
+            action = input("(a)dd a rule, (r)emove one, or Enter to go back: ").strip().lower()
+            if action[:1] == "a":
+                description = input("Description: ")
+                schedule = input("Schedule (daily/weekly/monthly or cron, e.g. 0 9 1 * *): ").strip()
+                start = input("First date (YYYY-MM-DD, Enter for now): ").strip()
+                try:
+                    amount = parse_amount(input("Amount (negative for an expense): $"))
+                    category = tracker.show_categories()
+                    tracker.add_recurring(description, amount, category, schedule, start or None)
+                    tracker.run_recurring()  # A start date in the past is caught up now
+                except ValueError as error:
+                    print(f"❌ {error}")
+            elif action[:1] == "r":
+                try:
+                    tracker.remove_recurring(int(input("Rule number: ")))
+                except ValueError:
+                    print("Please enter a rule number.")
+
+        elif choice == "14":  # Exit option
             print("Thanks for using Expense Tracker!")
             break  # EXIT THE LOOP - Like closing a React app
 
-        else:  # Invalid choice (user entered something other than 1-7)
+        else:  # Invalid choice (user entered something other than 1-14)
             print("Invalid choice. Please try again.")
             # Loop continues, menu shows again
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Money helpers for the Expense Tracker
+Amounts are kept as whole CENTS (Python ints) instead of float dollars
+
+Floats can't store most decimal fractions exactly: 0.1 + 0.2 gives
+0.30000000000000004 (the same thing happens in JavaScript). Add up a million
+of those and the balance drifts off by whole cents. Integers don't drift, so
+the tracker does its arithmetic in cents and only turns them into dollars for
+display, APIs and the files (always written with exactly two decimals).
+
+    to_cents("12.50") -> 1250        format_cents(1250)  -> "12.50"
+    to_cents(-0.1)    -> -10         from_cents(-10)     -> -0.1
+"""
+
+import math  # isfinite() - "inf" and "nan" parse as floats but aren't money
+from decimal import ROUND_HALF_EVEN, Decimal  # Exact decimal parsing of text
+
+
+def to_cents(dollars):
+    """
+    Dollars (str, int, float or Decimal) -> whole cents (int)
+
+    Text and Decimals are converted exactly and rounded half-to-even (like
+    banks do). Floats are rounded to the nearest cent, which also cleans up
+    drifted values such as 0.30000000000000004 from older files.
+    """
+    if type(dollars) is float:  # The common case first - it's the hot path
+        return round(dollars * 100)
+    if isinstance(dollars, str):
+        dollars = Decimal(dollars.strip())
+    if isinstance(dollars, Decimal):
+        return int(dollars.scaleb(2).to_integral_value(ROUND_HALF_EVEN))
+    return round(dollars * 100)
+
+
+def parse_amount(value):
+    """
+    An amount typed by a user or read from an import/request -> float dollars
+
+    Raises ValueError for anything that isn't a finite number: float()
+    happily accepts "inf", "nan" and "1e400" (which overflows to inf), and
+    none of them can become whole cents.
+    """
+    dollars = float(value)
+    if not math.isfinite(dollars):
+        raise ValueError(f"{value!r} is not a valid amount")
+    return dollars
+
+
+def parse_cents(text):
+    """
+    Money text from our own files -> whole cents, without going through float
+
+    Rows are written with exactly two decimals ("-12.50"), so dropping the
+    dot gives the cents ("-1250") - one int() call. Anything else (older
+    files with "1000.0" or "0.30000000000000004") takes the exact, slower
+    to_cents() path.
+    """
+    if text[-3:-2] == ".":
+        return int(text.replace(".", ""))  # Exact at any size, unlike a float
+    return to_cents(text)
+
+
+def from_cents(cents):
+    """Whole cents -> float dollars (for display and number-based APIs)"""
+    return cents / 100
+
+
+def format_cents(cents):
+    """Whole cents -> "-12.50" style text, exact (no float involved)"""
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{remainder:02d}"
+
+
+def normalize(text):
+    """Re-write one amount from a file with exactly two decimals ("1000.0" -> "1000.00")"""
+    return format_cents(to_cents(text))
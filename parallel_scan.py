@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Parallel scans of transactions.csv on several CPU cores
+
+Parsing CSV text (csv.reader + the money columns) is pure CPU work, and one Python
+process only ever uses one core for it. So the file is cut into byte ranges
+- each one starting right after a newline, so no row is split in two - and a
+ProcessPoolExecutor parses the ranges at the same time (like Web Workers each
+taking a slice of a big array). Results come back in range order, which is
+file order, so rows stay in the same (date) order a normal scan gives.
+
+    parallel_filter(path, "Food & Dining", workers=4)  -> [Transaction, ...]
+    parallel_totals(path, workers=4)  -> {(category, "YYYY-MM"): [count, income, expenses, min, max]}
+                                         (money in cents, like CategoryAggregates)
+
+Run `python parallel_scan.py FILE [max_workers]` to time 1..N workers.
+"""
+
+import csv  # Parsing each range
+import io  # Treating the range's text as a file for csv.reader
+import os  # File size, CPU count
+import sys  # Command-line arguments for the benchmark
+import time  # Timing the benchmark
+from concurrent.futures import ProcessPoolExecutor  # One process per core
+
+from storage import _decode_row  # Same old/new format handling as a normal scan
+
+# Ranges smaller than this aren't worth starting a process for
+MIN_RANGE = 1024 * 1024
+
+# Each worker reads its range this many bytes at a time
+READ_BLOCK = 4 * 1024 * 1024
+
+
+def split_ranges(path, parts):
+    """
+    Cut the rows of a CSV file into about `parts` (start, end) byte ranges
+
+    Each boundary is moved forward to just after the next newline, so every
+    range holds whole rows (rows never contain a line break - see
+    storage.one_line). Returns (has_categories, ranges).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header_line = f.readline()
+        if not header_line:  # Empty file - no rows at all
+            return True, []
+        has_categories = len(next(csv.reader([header_line.decode("utf-8")]))) == 6
+        first = f.tell()
+        parts = max(1, min(parts, (size - first) // MIN_RANGE))
+        step = (size - first) // parts
+        boundaries = [first]
+        for i in range(1, parts):
+            f.seek(first + i * step)
+            f.readline()  # Skip to the end of the row we landed in
+            boundaries.append(max(f.tell(), boundaries[-1]))
+    boundaries.append(size)
+    ranges = [(a, b) for a, b in zip(boundaries, boundaries[1:]) if a < b]
+    return has_categories, ranges
+
+
+def _read_range(path, start, end, has_categories):
+    """Yield the Transactions stored in bytes [start, end) of the file"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            # Read a block, finish its last row, and parse it - memory use
+            # stays at one block however big the range is
+            block = f.read(min(READ_BLOCK, end - position))
+            if position + len(block) < end and not block.endswith(b"\n"):
+                block += f.readline()
+            position += len(block)
+            for row in csv.reader(io.StringIO(block.decode("utf-8"), newline="")):
+                yield _decode_row(row, has_categories)
+
+
+# WORKER FUNCTIONS - run inside the pool's processes, so they must be plain
+# module-level functions (a process can't be handed a lambda or a method)
+def _filter_range(path, start, end, has_categories, category):
+    return [
+        transaction
+        for transaction in _read_range(path, start, end, has_categories)
+        if transaction.category == category
+    ]
+
+
+def _totals_range(path, start, end, has_categories):
+    totals = {}
+    for transaction in _read_range(path, start, end, has_categories):
+        amount = transaction.amount  # Whole cents
+        key = (transaction.category, transaction.date[:7])
+        entry = totals.get(key)
+        if entry is None:
+            totals[key] = [
+                1,
+                amount if amount > 0 else 0,
+                -amount if amount < 0 else 0,
+                amount,
+                amount,
+            ]
+            continue
+        entry[0] += 1
+        if amount > 0:
+            entry[1] += amount
+        else:
+            entry[2] -= amount
+        entry[3] = min(entry[3], amount)
+        entry[4] = max(entry[4], amount)
+    return totals
+
+
+def _run(path, workers, function, *extra):
+    """Run `function` over every range and return the results in file order"""
+    if not os.path.exists(path):
+        return []
+    has_categories, ranges = split_ranges(path, workers)
+    if workers <= 1 or len(ranges) <= 1:
+        # Not worth the process start-up - do it right here
+        return [function(path, start, end, has_categories, *extra) for start, end in ranges]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(function, path, start, end, has_categories, *extra)
+            for start, end in ranges
+        ]
+        # Collected in submission order = file order, whatever finishes first
+        return [future.result() for future in futures]
+
+
+def parallel_filter(path, category, workers=None):
+    """Every Transaction in `category`, in file order, parsed on `workers` cores"""
+    workers = workers or os.cpu_count() or 1
+    rows = []
+    for chunk in _run(path, workers, _filter_range, category):
+        rows.extend(chunk)
+    return rows
+
+
+def parallel_totals(path, workers=None):
+    """Per (category, month) totals, in the same shape as CategoryAggregates"""
+    workers = workers or os.cpu_count() or 1
+    merged = {}
+    for totals in _run(path, workers, _totals_range):
+        # MERGE - add up counts/sums, keep the overall min and max
+        for key, (count, income, expenses, low, high) in totals.items():
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [count, income, expenses, low, high]
+            else:
+                entry[0] += count
+                entry[1] += income
+                entry[2] += expenses
+                entry[3] = min(entry[3], low)
+                entry[4] = max(entry[4], high)
+    return merged
+
+
+def benchmark(path, max_workers=None, category="Food & Dining"):
+    """Seconds per filter / totals scan for 1..max_workers workers"""
+    max_workers = max_workers or os.cpu_count() or 1
+    results = {}
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        parallel_filter(path, category, workers)
+        middle = time.perf_counter()
+        parallel_totals(path, workers)
+        results[workers] = (middle - start, time.perf_counter() - middle)
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python parallel_scan.py FILE [max_workers]")
+    csv_path = sys.argv[1]
+    most = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print(f"{os.path.getsize(csv_path):,} bytes, {os.cpu_count()} CPU core(s)")
+    timings = benchmark(csv_path, most)
+    base_filter, base_totals = timings[1]
+    print(f"{'workers':>8}{'filter':>12}{'speedup':>9}{'totals':>12}{'speedup':>9}")
+    for count, (filter_time, totals_time) in timings.items():
+        print(
+            f"{count:>8}{filter_time:>11.2f}s{base_filter / filter_time:>8.2f}x"
+            f"{totals_time:>11.2f}s{base_totals / totals_time:>8.2f}x"
+        )
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Recurring transactions for the Expense Tracker
+PHASE 5: Rent, salary, subscriptions... entered once, added automatically
+
+A rule says what to add and when: "daily", "weekly", "monthly" or a
+cron-like "MINUTE HOUR DAY MONTH WEEKDAY" line ("0 9 1,15 * *" = 09:00 on
+the 1st and 15th). The rules live in recurring.json.
+
+The scheduler keeps a HEAP of (next due time, rule id) - Python's heapq, a
+priority queue where the smallest item is always at index 0 (like a sorted
+array you can push to without re-sorting). Catching up is "pop while the
+top is overdue, push its next occurrence back": every overdue occurrence
+comes out in date order, and the caller saves them all in ONE write, so
+even years of missed rent is one append and one fsync.
+"""
+
+import calendar  # Days per month, for "monthly" rules
+import functools  # Cache parsed cron lines
+import heapq  # Priority queue ordered by next due time
+import json  # Rules are saved as a small JSON file
+import os  # For checking files
+from datetime import datetime, timedelta  # Stepping from one occurrence to the next
+
+from money import from_cents, to_cents  # Rule amounts are kept as whole cents
+from side_files import atomic_write  # Temp file + rename
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"  # Same as the transaction rows
+SCHEDULES = ("daily", "weekly", "monthly")
+
+# Allowed values of each cron field: (low, high)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+@functools.lru_cache(maxsize=256)  # Like useMemo - a rule's line is parsed once
+def parse_cron(text):
+    """
+    "MINUTE HOUR DAY MONTH WEEKDAY" -> five sorted tuples of allowed values
+
+    Each field is "*", a number, a range "1-5", a list "1,15" or a step
+    "*/15" / "0-30/10". Weekday 0 (or 7) is Sunday, like in crontab.
+    """
+    fields = text.split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron schedule needs 5 fields, got {text!r}")
+    parsed = []
+    for field, (low, high) in zip(fields, CRON_FIELDS):
+        values = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            if span == "*":
+                first, last = low, high
+            elif "-" in span:
+                first, last = (int(value) for value in span.split("-", 1))
+            else:
+                first = last = int(span)
+            if not low <= first <= last <= high:
+                raise ValueError(f"Cron field {field!r} is outside {low}-{high}")
+            values.update(range(first, last + 1, int(step) if step else 1))
+        parsed.append(tuple(sorted(values)))
+    parsed[4] = tuple(sorted({day % 7 for day in parsed[4]}))  # 7 is Sunday too
+    return tuple(parsed)
+
+
+def _next_cron(fields, after):
+    """First time matching the parsed cron `fields` that is later than `after`"""
+    minutes, hours, days, months, weekdays = fields
+    # Standard cron rule: if both day and weekday are restricted, either may match
+    any_day, any_weekday = len(days) == 31, len(weekdays) == 7
+    start = (after + timedelta(minutes=1)).replace(second=0, microsecond=0)
+    day = start.date()
+    for _ in range(366 * 8):  # "31 2 *" style rules never match - stop eventually
+        if day.month in months:
+            day_ok = day.day in days
+            weekday_ok = (day.weekday() + 1) % 7 in weekdays  # Monday=0 -> cron 1
+            if any_day and any_weekday:
+                matches = True
+            elif any_day or any_weekday:
+                matches = day_ok and weekday_ok
+            else:
+                matches = day_ok or weekday_ok
+            if matches:
+                # On the first day, only times after `after` count
+                first_hour, first_minute = (start.hour, start.minute) if day == start.date() else (0, 0)
+                for hour in hours:
+                    if hour < first_hour:
+                        continue
+                    for minute in minutes:
+                        if hour == first_hour and minute < first_minute:
+                            continue
+                        return datetime(day.year, day.month, day.day, hour, minute)
+        day += timedelta(days=1)
+    raise ValueError("Cron schedule never matches a real date")
+
+
+def next_occurrence(rule, current):
+    """The occurrence after `current` (a datetime) for a rule dict"""
+    schedule = rule["schedule"]
+    if schedule == "daily":
+        return current + timedelta(days=1)
+    if schedule == "weekly":
+        return current + timedelta(weeks=1)
+    if schedule == "monthly":
+        # Same day of the month as the first occurrence; the 31st becomes
+        # the last day in shorter months and comes back afterwards
+        year, month = divmod(current.year * 12 + current.month, 12)  # Next month, 0-based
+        month += 1
+        day = min(rule["day"], calendar.monthrange(year, month)[1])
+        return current.replace(year=year, month=month, day=day)
+    return _next_cron(parse_cron(schedule), current)
+
+
+class RecurringScheduler:
+    """Recurring rules + a heap of when each is next due"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rules = {}  # {rule id: rule dict}
+        self.heap = []  # [(next due "YYYY-MM-DD HH:MM:SS", rule id), ...]
+        self.undo = None  # See begin()/finish()
+        self._file_key = None  # (mtime, size) of the recurring.json we loaded
+        self.refresh()
+
+    def refresh(self):
+        """(Re)load the rules if recurring.json changed (e.g. another tracker saved it)"""
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if key == self._file_key:
+            return
+        self._file_key = key
+        data = {"rules": [], "undo": None}
+        if key is not None:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        self.rules = {rule["id"]: rule for rule in data["rules"]}
+        self.undo = data.get("undo")
+        # HEAPIFY - turns the list into a heap in O(n), no full sort needed
+        self.heap = [(rule["next_due"], rule["id"]) for rule in self.rules.values()]
+        heapq.heapify(self.heap)
+
+    def save(self):
+        """Write the rules atomically (temp file + rename)"""
+        data = {"rules": sorted(self.rules.values(), key=lambda rule: rule["id"]), "undo": self.undo}
+        atomic_write(self.path, json.dumps(data))
+        stat = os.stat(self.path)
+        self._file_key = (stat.st_mtime_ns, stat.st_size)
+
+    def add_rule(self, description, amount, category, schedule, start=None, notes=""):
+        """
+        Add a rule; its first occurrence is `start` ("YYYY-MM-DD[ HH:MM:SS]",
+        default now). A start in the past is caught up on the next run.
+        Returns the new rule's id.
+        """
+        first = datetime.now().replace(microsecond=0) if start is None else _parse_date(start)
+        if schedule not in SCHEDULES:
+            # Cron rules (ValueError if the line is bad) start at their first
+            # matching time at or after `start`
+            first = _next_cron(parse_cron(schedule), first - timedelta(minutes=1))
+        self.refresh()
+        rule_id = max(self.rules, default=0) + 1
+        self.rules[rule_id] = {
+            "id": rule_id,
+            "description": description,
+            "amount": to_cents(amount),  # Whole cents, like the rest of the money
+            "category": category,
+            "notes": notes,
+            "schedule": schedule,
+            "day": first.day,  # Anchor for "monthly" (the 31st stays the 31st)
+            "next_due": first.strftime(DATE_FORMAT),
+        }
+        heapq.heappush(self.heap, (self.rules[rule_id]["next_due"], rule_id))
+        self.save()
+        return rule_id
+
+    def remove_rule(self, rule_id):
+        """Delete a rule (its already-added transactions stay). Returns False if unknown"""
+        self.refresh()
+        if self.rules.pop(rule_id, None) is None:
+            return False
+        # Rebuilding the heap is O(n) - simpler than finding the entry in it
+        self.heap = [(due, key) for due, key in self.heap if key != rule_id]
+        heapq.heapify(self.heap)
+        self.save()
+        return True
+
+    def due(self, now=None):
+        """
+        Pop every occurrence due at or before `now` and advance the rules
+
+        Returns (date, description, amount, category, notes) entries in
+        date order, ready for one commit. Only the in-memory state changes;
+        call begin()/finish() around saving the entries.
+        """
+        now = (now or datetime.now()).strftime(DATE_FORMAT)
+        entries = []
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            due, rule_id = heap[0]
+            rule = self.rules[rule_id]
+            entries.append(
+                (due, rule["description"], from_cents(rule["amount"]), rule["category"], rule["notes"])
+            )
+            # fromisoformat/isoformat: several times faster than strptime/strftime
+            rule["next_due"] = next_occurrence(rule, datetime.fromisoformat(due)).isoformat(" ")
+            # HEAPREPLACE - pop the top and push its next occurrence in one step
+            heapq.heapreplace(heap, (rule["next_due"], rule_id))
+        return entries
+
+    # ------------------------------------------------------------------
+    # CRASH SAFETY - the rules file and the transactions are two files.
+    # begin() saves the advanced rules plus how to undo them, the caller
+    # writes the rows, finish() drops the undo. If the tracker stops in
+    # between, recover() looks at whether the rows made it.
+    # ------------------------------------------------------------------
+
+    def begin(self, position, previous, first_entry):
+        """
+        Save the advanced rules before the entries (starting with
+        `first_entry`) are written at `position`. `previous` is
+        {rule id: next_due} from before due() advanced them.
+        """
+        self.undo = {"position": position, "first": list(first_entry[:2]), "next_due": previous}
+        self.save()
+
+    def finish(self):
+        self.undo = None
+        self.save()
+
+    def recover(self, storage):
+        """Undo an advance whose rows never reached `storage`"""
+        if self.undo is None:
+            return
+        # Our first row is at the saved position only if the write happened
+        # (another tracker may have written other rows there since)
+        found = next(storage.scan_from(self.undo["position"]), None)
+        written = found is not None and [found[1].date, found[1].description] == self.undo["first"]
+        if not written:
+            for rule_id, next_due in self.undo["next_due"].items():
+                rule = self.rules.get(int(rule_id))  # JSON keys are strings
+                if rule is not None:
+                    rule["next_due"] = next_due
+            self.heap = [(rule["next_due"], rule["id"]) for rule in self.rules.values()]
+            heapq.heapify(self.heap)
+        self.finish()
+
+
+def _parse_date(text):
+    """"YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS" -> datetime (whole seconds)"""
+    return datetime.fromisoformat(str(text).strip()).replace(microsecond=0)
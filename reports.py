@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Reports for the Expense Tracker
+PHASE 4: Monthly / weekly / daily totals and category spending analysis
+
+The transactions are loaded once into "columns" - one compact array per field
+(like storing {dates: [...], amounts: [...]} instead of a list of row objects).
+With NumPy installed, the totals are then computed with whole-array
+operations instead of a Python loop per row. Without NumPy, the same columns
+are summed with plain Python, so reports still work (just slower).
+
+Run `python reports.py [rows]` to benchmark the two against each other.
+"""
+
+import sys  # For reading the benchmark row count from the command line
+import time  # For timing the benchmark
+from array import array  # Compact typed arrays from the standard library
+from collections import namedtuple  # Lightweight record types
+from datetime import date, timedelta  # For turning day numbers back into dates
+
+from money import from_cents  # Amounts are summed in whole cents
+
+# OPTIONAL DEPENDENCY - like a dynamic import() that's allowed to fail
+try:
+    import numpy as np
+except ImportError:  # NumPy not installed - fall back to pure Python
+    np = None
+
+# 1970-01-01 as a day number, for converting dates to epoch seconds
+EPOCH_DAY = date(1970, 1, 1).toordinal()
+
+# COLUMN STORE - each field is its own typed array, one slot per transaction
+Columns = namedtuple(
+    "Columns",
+    [
+        "timestamps",  # array('q'): epoch seconds (int64)
+        "months",  # array('q'): year * 12 + (month - 1), for monthly grouping
+        "amounts",  # array('q'): int64 amounts in cents (exact sums)
+        "codes",  # array('B'): uint8 index into `categories`
+        "categories",  # list of category names (code -> name)
+    ],
+)
+
+# One line of a report
+PeriodTotal = namedtuple("PeriodTotal", ["period", "count", "income", "expenses", "net"])
+CategoryTotal = namedtuple("CategoryTotal", ["category", "count", "income", "expenses", "net"])
+
+PERIODS = ("month", "week", "day")
+
+
+def load_columns(rows, categories=()):
+    """
+    Turn a stream of Transaction records into Columns
+
+    `categories` pre-assigns codes (e.g. tracker.categories); any other name
+    found in the data (like "Uncategorized") gets the next free code.
+    """
+    categories = list(categories)
+    codes_by_name = {name: code for code, name in enumerate(categories)}
+    timestamps, months = array("q"), array("q")
+    amounts, codes = array("q"), array("B")
+    for row in rows:
+        text = row.date  # "YYYY-MM-DD HH:MM:SS" - slicing is much faster than strptime
+        year, month, day = int(text[0:4]), int(text[5:7]), int(text[8:10])
+        seconds = 0
+        if len(text) >= 19:
+            seconds = int(text[11:13]) * 3600 + int(text[14:16]) * 60 + int(text[17:19])
+        days = date(year, month, day).toordinal() - EPOCH_DAY
+        timestamps.append(days * 86400 + seconds)
+        months.append(year * 12 + month - 1)
+        amounts.append(row.amount)  # Already whole cents
+        code = codes_by_name.get(row.category)
+        if code is None:
+            code = codes_by_name[row.category] = len(categories)
+            categories.append(row.category)
+        codes.append(code)
+    return Columns(timestamps, months, amounts, codes, categories)
+
+
+def _period_label(period, key):
+    """Turn a group key back into something readable"""
+    if period == "month":
+        return f"{key // 12:04d}-{key % 12 + 1:02d}"
+    if period == "week":
+        # key = Monday-based week number since the epoch (the epoch was a Thursday)
+        monday = date(1970, 1, 1) + timedelta(days=key * 7 - 3)
+        return f"Week of {monday.isoformat()}"
+    return (date(1970, 1, 1) + timedelta(days=key)).isoformat()
+
+
+def _check_period(period):
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period!r} (use one of {', '.join(PERIODS)})")
+
+
+# ---------------------------------------------------------------------------
+# VECTORIZED VERSION - NumPy does the looping in C
+# ---------------------------------------------------------------------------
+
+
+def _numpy_period_keys(columns, period):
+    """One group key per row, computed for the whole column at once"""
+    if period == "month":
+        return np.frombuffer(columns.months, dtype=np.int64)
+    days = np.frombuffer(columns.timestamps, dtype=np.int64) // 86400
+    if period == "week":
+        return (days + 3) // 7  # Shift so weeks start on Monday
+    return days
+
+
+def _numpy_grouped(keys, amounts, size=None):
+    """count / income / expenses (in cents) per group with np.bincount"""
+    # bincount's weights are float64, which holds whole cents exactly up to
+    # 2**53 (about $90 trillion) - the sums stay exact
+    income = np.where(amounts > 0, amounts, 0)
+    expenses = np.where(amounts < 0, -amounts, 0)
+    counts = np.bincount(keys, minlength=size or 0)
+    return (
+        counts,
+        np.bincount(keys, weights=income, minlength=size or 0),
+        np.bincount(keys, weights=expenses, minlength=size or 0),
+    )
+
+
+def period_report_numpy(columns, period="month"):
+    """Totals per month/week/day using whole-array NumPy operations"""
+    _check_period(period)
+    if not columns.amounts:
+        return []
+    # frombuffer = zero-copy view of the array module's memory
+    amounts = np.frombuffer(columns.amounts, dtype=np.int64)
+    keys = _numpy_period_keys(columns, period)
+    # Period keys are small consecutive integers (day/week/month numbers), so
+    # shifting them to start at 0 lets np.bincount group them without sorting
+    first = int(keys.min())
+    counts, income, expenses = _numpy_grouped(keys - first, amounts)
+    return [
+        PeriodTotal(
+            _period_label(period, first + int(slot)),
+            int(counts[slot]),
+            from_cents(int(income[slot])),
+            from_cents(int(expenses[slot])),
+            from_cents(int(income[slot]) - int(expenses[slot])),
+        )
+        for slot in np.flatnonzero(counts)  # Skip periods with no rows
+    ]
+
+
+def category_report_numpy(columns):
+    """Totals per category using whole-array NumPy operations"""
+    if not columns.amounts:
+        return []
+    amounts = np.frombuffer(columns.amounts, dtype=np.int64)
+    codes = np.frombuffer(columns.codes, dtype=np.uint8)
+    counts, income, expenses = _numpy_grouped(codes, amounts, len(columns.categories))
+    return [
+        CategoryTotal(
+            name, int(c), from_cents(int(i)), from_cents(int(e)), from_cents(int(i) - int(e))
+        )
+        for name, c, i, e in zip(columns.categories, counts, income, expenses)
+        if c
+    ]
+
+
+# ---------------------------------------------------------------------------
+# PURE PYTHON VERSION - same answers, one loop iteration per row
+# ---------------------------------------------------------------------------
+
+
+def _python_period_keys(columns, period):
+    if period == "month":
+        return columns.months
+    if period == "week":
+        return [(ts // 86400 + 3) // 7 for ts in columns.timestamps]
+    return [ts // 86400 for ts in columns.timestamps]
+
+
+def period_report_python(columns, period="month"):
+    """Totals per month/week/day with a plain Python loop"""
+    _check_period(period)
+    groups = {}  # key -> [count, income, expenses]
+    for key, amount in zip(_python_period_keys(columns, period), columns.amounts):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = [0, 0, 0]
+        group[0] += 1
+        if amount > 0:
+            group[1] += amount
+        elif amount < 0:
+            group[2] -= amount
+    return [
+        PeriodTotal(_period_label(period, key), c, from_cents(i), from_cents(e), from_cents(i - e))
+        for key, (c, i, e) in sorted(groups.items())
+    ]
+
+
+def category_report_python(columns):
+    """Totals per category with a plain Python loop"""
+    size = len(columns.categories)
+    counts, income, expenses = [0] * size, [0] * size, [0] * size
+    for code, amount in zip(columns.codes, columns.amounts):
+        counts[code] += 1
+        if amount > 0:
+            income[code] += amount
+        elif amount < 0:
+            expenses[code] -= amount
+    return [
+        CategoryTotal(name, c, from_cents(i), from_cents(e), from_cents(i - e))
+        for name, c, i, e in zip(columns.categories, counts, income, expenses)
+        if c
+    ]
+
+
+# PUBLIC API - use NumPy when it's available, otherwise pure Python
+def period_report(columns, period="month"):
+    """Totals per month/week/day (vectorized when NumPy is installed)"""
+    if np is not None:
+        return period_report_numpy(columns, period)
+    return period_report_python(columns, period)
+
+
+def category_report(columns):
+    """Totals per category (vectorized when NumPy is installed)"""
+    if np is not None:
+        return category_report_numpy(columns)
+    return category_report_python(columns)
+
+
+def synthetic_columns(rows, categories=8, seed=42):
+    """Random Columns for benchmarking (about 3 years of data)"""
+    import random  # Only needed here
+
+    rng = random.Random(seed)  # Seeded, so every run sees the same data
+    start = 1735689600  # 2025-01-01 00:00:00 UTC
+    timestamps = array("q", sorted(start + rng.randrange(3 * 365 * 86400) for _ in range(rows)))
+    months = array(
+        "q",
+        (
+            d.year * 12 + d.month - 1
+            for d in (date(1970, 1, 1) + timedelta(days=ts // 86400) for ts in timestamps)
+        ),
+    )
+    amounts = array("q", (rng.randrange(-20000, 10001) for _ in range(rows)))  # Cents
+    codes = array("B", (rng.randrange(categories) for _ in range(rows)))
+    names = [f"Category {n}" for n in range(categories)]
+    return Columns(timestamps, months, amounts, codes, names)
+
+
+def benchmark(rows=1_000_000, repeat=3):
+    """Time the NumPy and pure-Python reports on the same synthetic data"""
+    columns = synthetic_columns(rows)
+    candidates = [("python", period_report_python, category_report_python)]
+    if np is not None:
+        candidates.append(("numpy", period_report_numpy, category_report_numpy))
+    results = {}
+    for name, by_period, by_category in candidates:
+        timings = {}
+        for period in PERIODS:
+            best = min(_timed(by_period, columns, period) for _ in range(repeat))
+            timings[period] = best
+        timings["category"] = min(_timed(by_category, columns) for _ in range(repeat))
+        results[name] = timings
+    return results
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Benchmarking reports over {row_count:,} synthetic rows (best of 3)")
+    if np is None:
+        print("NumPy is not installed - only the pure-Python version is timed")
+    results = benchmark(row_count)
+    print(f"{'report':<10}" + "".join(f"{name:>12}" for name in results))
+    for report in (*PERIODS, "category"):
+        cells = "".join(f"{results[name][report] * 1000:>10.1f}ms" for name in results)
+        print(f"{report:<10}{cells}")
+    if "numpy" in results:
+        for report in (*PERIODS, "category"):
+            speedup = results["python"][report] / results["numpy"][report]
+            print(f"  {report}: {speedup:.1f}x faster with NumPy")
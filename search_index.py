@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Full-text search over transaction descriptions and notes
+An inverted index: every word points at the rows that contain it
+
+Like the index at the back of a book - to find "coffee" you look up the word
+and get the page numbers, instead of reading every page. Here the "page
+numbers" are storage bookmarks (CSV byte offsets / SQLite row ids), so the
+matching rows can be read directly.
+
+    index.search("coffee")         -> rows containing the word "coffee"
+    index.search("gro* weekly")    -> words starting with "gro" AND "weekly"
+
+The index lives in search_index.json. It is only read the first time a search
+runs (a million-row index takes a moment to load, and most runs never search).
+From then on every write adds its rows in memory, and the file is rewritten
+once SAVE_EVERY new rows have piled up - rows added after the last save are
+simply re-indexed from the storage on the next load.
+"""
+
+import json  # The index is saved as JSON
+import os  # For checking/removing/replacing files
+import re  # Splitting text into words
+from array import array  # Compact lists of integers (8 bytes each)
+from bisect import bisect_left  # Binary search for prefix queries
+from itertools import accumulate  # Running sums - undoes the delta encoding
+
+from side_files import atomic_write  # Temp file + rename
+
+# A "word" is a run of letters/digits ("Rent (Aug)" -> "rent", "aug")
+WORD = re.compile(r"[^\W_]+")
+
+# Rewrite the file after this many rows were indexed since the last save
+SAVE_EVERY = 1000
+
+
+def tokenize(text):
+    """Lower-case words in `text` (duplicates included)"""
+    return WORD.findall(text.lower())
+
+
+class SearchIndex:
+    """word -> sorted posting list of storage bookmarks"""
+
+    def __init__(self, path):
+        self.path = path
+        # DICTIONARY - {word: array of bookmarks}, in storage order
+        self.postings = {}
+        self.covered = 0  # Storage bookmark the index is up to date with
+        self.loaded = False  # Nothing is read from disk until the first search
+        self.unsaved = 0  # Rows indexed since the file was last written
+        self._words = None  # Sorted list of words for prefix search (built on demand)
+
+    def _load(self):
+        """Read the saved index (if any) - happens once, on first use"""
+        self.loaded = True
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        self.covered = data["covered"]
+        # DELTA DECODING - the file stores gaps between bookmarks (small
+        # numbers, a much smaller file); running sums give the bookmarks back
+        self.postings = {
+            word: array("q", accumulate(gaps)) for word, gaps in data["words"].items()
+        }
+
+    def save(self):
+        """Write the index to disk"""
+        words = {}
+        for word, bookmarks in self.postings.items():
+            # DELTA ENCODING - [1040, 2210, 2290] -> [1040, 1170, 80]
+            words[word] = [bookmarks[0]] + [
+                b - a for a, b in zip(bookmarks, bookmarks[1:])
+            ]
+        atomic_write(self.path, json.dumps({"covered": self.covered, "words": words}))
+        self.unsaved = 0
+
+    def add(self, bookmark, transaction):
+        """Index one row; `bookmark` is the storage position just before it"""
+        for word in set(tokenize(f"{transaction.description} {transaction.notes}")):
+            bookmarks = self.postings.get(word)
+            if bookmarks is None:
+                self.postings[word] = array("q", [bookmark])
+                self._words = None  # New word - the sorted list is out of date
+            else:
+                bookmarks.append(bookmark)
+        self.unsaved += 1
+
+    def catch_up(self, storage):
+        """
+        Index every row added after the saved bookmark
+
+        Loads the file first if needed. If the storage shrank (reset/replaced
+        outside the tracker) the index is rebuilt from scratch.
+        """
+        if not self.loaded:
+            self._load()
+        end = storage.end_position()
+        if end == self.covered:
+            return
+        if end < self.covered:
+            self.postings, self._words = {}, None
+            self.covered = 0
+        # Each row is filed under the bookmark just BEFORE it, so
+        # storage.rows_at() can jump straight back to the row later
+        previous = self.covered
+        for bookmark, transaction in storage.scan_from(self.covered):
+            if bookmark > end:
+                break  # Added after we measured `end` - the next catch_up gets it
+            self.add(previous, transaction)
+            previous = bookmark
+        self.covered = end
+        if self.unsaved >= SAVE_EVERY:
+            self.save()
+
+    def _matches(self, term):
+        """Bookmarks for one query term ("word", or "prefix*")"""
+        if not term.endswith("*"):
+            return self.postings.get(term, ())
+        prefix = term[:-1]
+        if self._words is None:
+            self._words = sorted(self.postings)
+        # The words starting with `prefix` sit next to each other in sorted
+        # order - binary-search to the first one and walk until they stop
+        found = set()
+        position = bisect_left(self._words, prefix)
+        while position < len(self._words) and self._words[position].startswith(prefix):
+            found.update(self.postings[self._words[position]])
+            position += 1
+        return found
+
+    def search(self, query):
+        """
+        Sorted bookmarks of the rows matching EVERY term in `query`
+
+        A term ending in "*" matches any word starting with it. Work depends
+        on how many rows contain the terms, not on the size of the ledger.
+        """
+        terms = [
+            word + "*" if raw.endswith("*") else word
+            for raw in query.lower().split()
+            for word in tokenize(raw)
+        ]
+        if not terms:
+            return []
+        # Start from the rarest term - every intersection after that is small
+        lists = sorted((self._matches(term) for term in terms), key=len)
+        result = set(lists[0])
+        for bookmarks in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(bookmarks)
+        return sorted(result)
+
+    def clear(self):
+        """Forget everything (used by reset)"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.postings, self._words = {}, None
+        self.covered = 0
+        self.unsaved = 0
+        self.loaded = False  # Rebuilt from the storage on the next search
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+Segmented storage for the Expense Tracker
+PHASE 3 backend #3: one small CSV file per month instead of one huge file
+
+    segments/
+        segments.json      <- the manifest: every finished segment + its footer
+        2025-06.csv.gz     <- finished (sealed) months, compressed
+        2025-07.csv.gz
+        2025-08.csv        <- the current month, a plain CSV we append to
+
+When the first row of a new month arrives, the current segment is SEALED:
+its footer summary (row count, per-category count/income/expenses, final
+balance, first/last date) goes into the manifest and the file is gzipped.
+Like rotating log files: old ones are closed, compressed and never touched
+again, so startup and "latest rows" only ever look at the manifest and the
+current month, however many years of data there are. Date-range queries use
+the first/last dates in the manifest to open only the segments they need.
+
+Bookmarks are row numbers (0 = before the first row), so the journal,
+snapshots, totals and search index work exactly as with the other backends.
+`compact()` merges runs of small sealed segments into one file.
+"""
+
+import csv  # Each segment is an ordinary CSV file
+import gzip  # Compressing sealed segments
+import io  # Parsing freshly appended bytes
+import json  # The manifest
+import os  # Files and folders
+from collections import deque  # For collecting the newest rows
+from itertools import islice  # Batches for import_from
+
+from money import format_cents  # Rows carry whole cents; files hold "-12.50"
+from side_files import atomic_write  # Temp file + rename for the manifest
+from storage import CSV_HEADER, END_OF_DAY, _decode_row, _page
+
+MANIFEST = "segments.json"
+
+
+class SegmentStorage:
+    """Monthly segment files + a manifest of footers (see the module docstring)"""
+
+    def __init__(self, path, compress=True):
+        self.path = path  # The segments/ folder
+        self.compress = compress  # gzip segments when they are sealed
+        self.manifest_path = os.path.join(path, MANIFEST)
+        self.sealed = []  # Manifest entries, oldest first
+        self.active = None  # File name of the segment being appended to
+        self.active_month = None  # Newest "YYYY-MM" in the active segment
+        self._manifest_key = None  # (mtime, size) of the manifest we loaded
+        # What we know about the active segment (refreshed from its size)
+        self._active_size = 0
+        self._active_rows = 0
+        self._active_first = self._active_last = None
+
+    # ------------------------------------------------------------------
+    # MANIFEST + ACTIVE SEGMENT BOOKKEEPING
+    # ------------------------------------------------------------------
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _refresh(self):
+        """
+        Pick up changes made by other tracker processes
+
+        Costs two stat() calls when nothing changed: the manifest is only
+        re-read if it was rewritten, and only new bytes of the active
+        segment are parsed (to count rows and track first/last dates).
+        """
+        try:
+            stat = os.stat(self.manifest_path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            key = None
+        if key != self._manifest_key:
+            self._manifest_key = key
+            data = {"sealed": [], "active": None, "active_month": None}
+            if key is not None:
+                with open(self.manifest_path, "r") as f:
+                    data = json.load(f)
+            self.sealed = data["sealed"]
+            self.active, self.active_month = data["active"], data["active_month"]
+            self._forget_active()
+        if self.active is None:
+            return
+        path = self._file(self.active)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < self._active_size:
+            self._forget_active()  # Rewritten (truncate) - count again
+        if size > self._active_size:
+            self._count_active(path, size)
+
+    def _forget_active(self):
+        self._active_size = self._active_rows = 0
+        self._active_first = self._active_last = None
+
+    def _count_active(self, path, size):
+        """Parse the active segment's bytes we haven't seen yet"""
+        with open(path, "rb") as f:
+            f.seek(self._active_size)
+            data = f.read(size - self._active_size)
+        data = data[: data.rfind(b"\n") + 1]  # Only whole lines (a writer may be mid-row)
+        start = 0
+        if self._active_size == 0:
+            start = data.find(b"\n") + 1  # Skip the header line
+        for row in csv.reader(io.StringIO(data[start:].decode("utf-8"), newline="")):
+            self._note_active_date(row[0])
+            self._active_rows += 1
+        self._active_size += len(data)
+
+    def _note_active_date(self, date):
+        if self._active_first is None or date < self._active_first:
+            self._active_first = date
+        if self._active_last is None or date > self._active_last:
+            self._active_last = date
+
+    def _save_manifest(self):
+        """Write the manifest atomically (temp file + rename)"""
+        os.makedirs(self.path, exist_ok=True)
+        data = {"sealed": self.sealed, "active": self.active, "active_month": self.active_month}
+        atomic_write(self.manifest_path, json.dumps(data))  # No indent: keeps the fast C encoder
+        stat = os.stat(self.manifest_path)
+        self._manifest_key = (stat.st_mtime_ns, stat.st_size)
+
+    def _segments(self):
+        """
+        Every segment, oldest first, as (entry, first_row_number)
+
+        The active segment is described by a manifest-like entry built from
+        what _refresh() counted.
+        """
+        self._refresh()
+        start = 0
+        for entry in self.sealed:
+            yield entry, start
+            start += entry["rows"]
+        if self.active is not None:
+            active = {
+                "file": self.active,
+                "rows": self._active_rows,
+                "first_date": self._active_first,
+                "last_date": self._active_last,
+            }
+            yield active, start
+
+    def _read(self, entry):
+        """Yield the Transactions of one segment (gzipped or plain)"""
+        path = self._file(entry["file"])
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Header
+            for row in reader:
+                yield _decode_row(row, True)
+
+    # ------------------------------------------------------------------
+    # WRITING
+    # ------------------------------------------------------------------
+
+    def exists(self):
+        """True if at least one transaction has been saved"""
+        return self.end_position() > 0
+
+    def append(self, rows):
+        """
+        Append rows to the active segment, rotating when a new month starts
+
+        Back-dated rows (an older month than the active segment) stay in
+        the active segment - segments are slices of the log in write order,
+        and their first/last dates keep date queries correct.
+        """
+        self._refresh()
+        f = None
+        rotated = False
+        sealed = []  # Plain files compressed this call - removed once the manifest says so
+        try:
+            for date, description, amount, balance, *rest in rows:
+                date = str(date)
+                month = date[:7]
+                if self.active is None or month > self.active_month:
+                    if f is not None:
+                        f.close()
+                        f = None
+                    self._rotate(month, sealed)
+                    rotated = True
+                if f is None:
+                    f = open(self._file(self.active), "a", newline="", encoding="utf-8")
+                    writer = csv.writer(f)
+                writer.writerow([date, description, format_cents(amount), format_cents(balance), *rest])
+        finally:
+            if f is not None:
+                f.close()
+            if rotated:
+                # One manifest write per append, however many months it
+                # crossed (importing decades of history would otherwise
+                # rewrite the growing manifest once per month)
+                self._save_manifest()
+                for name in sealed:
+                    os.remove(self._file(name))
+        self._refresh()  # Counts the rows we just wrote (only the new bytes)
+
+    def _rotate(self, month, sealed):
+        """
+        Seal the active segment (if any) and start a new one for `month`
+
+        The manifest is saved by append(); until then it still points at
+        the old active file, so a crash here loses nothing that was listed.
+        """
+        if self.active is not None:
+            self._seal(sealed)
+        os.makedirs(self.path, exist_ok=True)
+        self.active, self.active_month = f"{month}.csv", month
+        with open(self._file(self.active), "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(CSV_HEADER)
+        self._forget_active()
+
+    def _seal(self, sealed):
+        """Compute the active segment's footer, compress it, list it as sealed"""
+        self._refresh()
+        entry = {
+            "file": self.active,
+            "months": [self.active[:7], self.active_month],
+            "rows": self._active_rows,
+            "first_date": self._active_first,
+            "last_date": self._active_last,
+            "footer": _footer(self._read({"file": self.active})),
+        }
+        if self.compress:
+            entry["file"] = self._write_segment(self.active[:-4], self._read({"file": self.active}))
+            sealed.append(self.active)
+        self.sealed.append(entry)
+        self.active = self.active_month = None
+
+    def _write_segment(self, stem, transactions):
+        """Write Transactions into a new gzipped segment; returns its file name"""
+        name = f"{stem}.csv.gz"
+        temp_path = self._file(name + ".tmp")
+        with gzip.open(temp_path, "wt", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for date, description, amount, balance, category, notes in transactions:
+                writer.writerow([date, description, format_cents(amount), format_cents(balance), category, notes])
+        os.replace(temp_path, self._file(name))
+        return name
+
+    # ------------------------------------------------------------------
+    # READING
+    # ------------------------------------------------------------------
+
+    def iter_rows(
+        self,
+        category=None,
+        limit=None,
+        offset=0,
+        last=None,
+        start_date=None,
+        end_date=None,
+    ):
+        """Yield Transaction records; date bounds skip whole segments"""
+        upper = None if end_date is None else end_date + END_OF_DAY
+
+        def matches(transaction):
+            return (
+                (category is None or transaction.category == category)
+                and (start_date is None or transaction.date >= start_date)
+                and (upper is None or transaction.date <= upper)
+            )
+
+        if last is not None:
+            # Walk backwards from the newest segment and stop once we have
+            # enough - "the last 50 rows" only opens the newest segment(s)
+            newest = deque(maxlen=last)
+            for _, transaction in self.scan_backward(
+                segment_filter=lambda entry: _overlaps(entry, start_date, upper)
+            ):
+                if len(newest) == last:
+                    break
+                if matches(transaction):
+                    newest.appendleft(transaction)
+            return _page(iter(newest), limit, offset)
+
+        def forward():
+            for entry, _ in list(self._segments()):
+                if not _overlaps(entry, start_date, upper):
+                    continue  # This segment can't hold a matching row
+                for transaction in self._read(entry):
+                    if matches(transaction):
+                        yield transaction
+
+        return _page(forward(), limit, offset)
+
+    def end_position(self):
+        """Number of rows saved (bookmarks are row numbers)"""
+        self._refresh()
+        return sum(entry["rows"] for entry in self.sealed) + self._active_rows
+
+    def scan_from(self, position=0):
+        """Yield (row_number_after_row, Transaction) for rows after `position`"""
+        for entry, start in list(self._segments()):
+            if start + entry["rows"] <= position:
+                continue  # Entirely before the bookmark - not even opened
+            rows = self._read(entry)
+            skip = max(0, position - start)
+            for number, transaction in enumerate(islice(rows, skip, None), start + skip + 1):
+                yield number, transaction
+
+    def rows_at(self, positions):
+        """Yield the row right after each bookmark (each segment is read once)"""
+        wanted = sorted(set(positions))
+        found = {}
+        segments = list(self._segments())
+        for entry, start in segments:
+            inside = [p for p in wanted if start <= p < start + entry["rows"]]
+            if not inside:
+                continue
+            targets = set(inside)
+            for number, transaction in enumerate(self._read(entry), start):
+                if number in targets:
+                    found[number] = transaction
+        for position in positions:
+            if position in found:
+                yield found[position]
+
+    def scan_backward(self, position=None, segment_filter=None):
+        """
+        Yield (row_number_before_row, Transaction) newest first, for rows
+        before `position` (default: the end). Segments are read one at a
+        time, newest first, so recent history only opens the newest ones.
+        """
+        segments = list(self._segments())
+        if position is None:
+            position = sum(entry["rows"] for entry, _ in segments)
+        for entry, start in reversed(segments):
+            if start >= position:
+                continue
+            if segment_filter is not None and not segment_filter(entry):
+                continue
+            rows = list(islice(self._read(entry), position - start))
+            for number in range(len(rows) - 1, -1, -1):
+                yield start + number, rows[number]
+
+    def position_at_date(self, date):
+        """Bookmark just past the last row dated on/before `date`"""
+        upper = date + END_OF_DAY
+        for entry, start in reversed(list(self._segments())):
+            if entry["first_date"] is None or entry["first_date"] > upper:
+                continue  # The whole segment is after `date`
+            last_match = None
+            for number, transaction in enumerate(self._read(entry), start + 1):
+                if transaction.date <= upper:
+                    last_match = number
+            if last_match is not None:
+                return last_match
+        return 0
+
+    # ------------------------------------------------------------------
+    # MAINTENANCE
+    # ------------------------------------------------------------------
+
+    def truncate(self, position):
+        """Drop every row after row number `position` (crash recovery)"""
+        if position >= self.end_position():
+            return
+        if position == 0:
+            self.clear()
+            return
+        segments = list(self._segments())
+        for index, (entry, start) in enumerate(segments):
+            if start + entry["rows"] >= position:
+                break
+        kept = list(islice(self._read(entry), position - start))
+        # Everything after the cut point goes; the segment holding it becomes
+        # the active (plain, appendable) segment again
+        for later, _ in segments[index:]:
+            if os.path.exists(self._file(later["file"])):
+                os.remove(self._file(later["file"]))
+        month = max(t.date[:7] for t in kept)
+        self.sealed = self.sealed[:index]
+        self.active, self.active_month = f"{entry['file'][:7]}.csv", month
+        with open(self._file(self.active), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for date, description, amount, balance, category, notes in kept:
+                writer.writerow([date, description, format_cents(amount), format_cents(balance), category, notes])
+        self._forget_active()
+        self._save_manifest()
+
+    def sync(self):
+        """Force the active segment (and the manifest) onto the disk"""
+        self._refresh()
+        for name in (self.active, MANIFEST):
+            if name is not None and os.path.exists(self._file(name)):
+                with open(self._file(name), "rb") as f:
+                    os.fsync(f.fileno())
+
+    def clear(self):
+        """Delete every segment and the manifest"""
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                os.remove(self._file(name))
+        self.sealed, self.active, self.active_month = [], None, None
+        self._manifest_key = None
+        self._forget_active()
+
+    def normalize_money(self):
+        """Segments are always written with two-decimal money - nothing to do"""
+        return 0
+
+    def import_from(self, other, batch_size=10000):
+        """Copy every row from another backend, a batch at a time"""
+        rows = iter(other.iter_rows())
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            self.append(batch)
+
+    def summaries(self):
+        """Manifest entries (with footers) for the sealed segments, oldest first"""
+        self._refresh()
+        return list(self.sealed)
+
+    def compact(self, min_rows=1000):
+        """
+        Merge runs of neighbouring sealed segments smaller than `min_rows`
+
+        Rows keep their order (and their row numbers), so every bookmark
+        held by the journal, snapshots, totals and search index stays valid.
+        Returns (segments_before, segments_after).
+        """
+        self._refresh()
+        before = len(self.sealed)
+        groups, current = [], []
+        for entry in self.sealed:
+            if entry["rows"] >= min_rows:
+                groups += [current, [entry]] if current else [[entry]]
+                current = []
+                continue
+            current.append(entry)
+            if sum(e["rows"] for e in current) >= min_rows:
+                groups.append(current)
+                current = []
+        if current:
+            groups.append(current)
+
+        merged = []
+        for group in groups:
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+
+            def rows(group=group):
+                for entry in group:
+                    yield from self._read(entry)
+
+            first, last = group[0], group[-1]
+            stem = f"{first['months'][0]}_to_{last['months'][1]}"
+            merged.append(
+                {
+                    "file": self._write_segment(stem, rows()),
+                    "months": [first["months"][0], last["months"][1]],
+                    "rows": sum(e["rows"] for e in group),
+                    "first_date": min(e["first_date"] for e in group),
+                    "last_date": max(e["last_date"] for e in group),
+                    "footer": _merge_footers([e["footer"] for e in group]),
+                }
+            )
+        old_files = {e["file"] for e in self.sealed} - {e["file"] for e in merged}
+        self.sealed = merged
+        self._save_manifest()  # Switch over first, then delete the old files
+        for name in old_files:
+            os.remove(self._file(name))
+        return before, len(merged)
+
+
+def _overlaps(entry, start_date, upper):
+    """Could this segment hold rows between start_date and upper?"""
+    if entry["first_date"] is None:
+        return False  # Empty segment
+    if start_date is not None and entry["last_date"] < start_date:
+        return False
+    return upper is None or entry["first_date"] <= upper
+
+
+def _footer(transactions):
+    """Summary of one segment: count, per-category totals (cents), final balance"""
+    count, categories, final = 0, {}, 0
+    for transaction in transactions:
+        count += 1
+        cents = transaction.amount
+        totals = categories.setdefault(transaction.category, [0, 0, 0])
+        totals[0] += 1
+        if cents > 0:
+            totals[1] += cents
+        else:
+            totals[2] -= cents
+        final = transaction.balance
+    return {"count": count, "categories": categories, "final_balance": format_cents(final)}
+
+
+def _merge_footers(footers):
+    """One footer for several consecutive segments"""
+    categories = {}
+    for footer in footers:
+        for name, (count, income, expenses) in footer["categories"].items():
+            totals = categories.setdefault(name, [0, 0, 0])
+            totals[0] += count
+            totals[1] += income
+            totals[2] += expenses
+    return {
+        "count": sum(footer["count"] for footer in footers),
+        "categories": categories,
+        "final_balance": footers[-1]["final_balance"],
+    }
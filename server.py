@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Service mode for the Expense Tracker
+Keeps ONE tracker loaded and answers JSON requests over a local socket
+
+Starting a tracker means reading balance.txt, the indexes, the totals...
+A script that adds one transaction pays that every time. In service mode the
+tracker stays loaded (like a long-running Node/Express server instead of a
+script that starts fresh per request), and clients just send a line of JSON:
+
+    {"op": "add", "description": "Lunch", "amount": -12.5, "category": "Food & Dining"}
+    {"op": "balance"}
+    {"op": "query", "last": 20}
+    {"op": "filter", "category": "Food & Dining", "limit": 50}
+    {"op": "summary", "month": "2025-08"}
+    {"op": "search", "query": "gro* weekly", "limit": 50}
+    {"op": "budgets", "period": "2025-08"}
+    {"op": "stats"}                                  (needs --stats)
+
+Each request gets one JSON line back: {"ok": true, ...} or
+{"ok": false, "error": "..."}. An add that crosses a budget threshold also
+gets "alerts": ["⚠️  Food & Dining is over budget ...", ...]. Adds that arrive at the same time are saved
+together in one commit (one lock, one fsync).
+
+Start it with `python main.py --serve` (Unix socket tracker.sock in the data
+folder, or 127.0.0.1:8765 on systems without Unix sockets / with --port).
+"""
+
+import asyncio  # The event loop (like Node's) that serves many clients at once
+import json  # Requests and responses are JSON lines
+import os  # For the socket file path
+import socket  # For the simple blocking client
+from concurrent.futures import ThreadPoolExecutor  # Runs file I/O off the loop
+from datetime import datetime  # Timestamps for added transactions
+
+from budgets import describe_alert  # Alert text sent back with an add
+from money import from_cents, parse_amount, to_cents  # Rows and budget counters are whole cents
+from storage import normalize_date  # Client-supplied dates are checked
+
+DEFAULT_PORT = 8765
+SOCKET_NAME = "tracker.sock"
+
+# Queries return at most this many rows unless the client asks for fewer
+MAX_ROWS = 1000
+# How often (seconds) the service adds recurring transactions that came due
+RECURRING_TICK = 60
+
+
+class TrackerServer:
+    """asyncio front-end for one long-lived ExpenseTracker"""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        # ONE worker thread does every read and write, in order, so a query
+        # never sees half of an append - while the event loop stays free to
+        # accept new requests
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_adds = []  # [(entry, future), ...] waiting for the next commit
+        self._flush_scheduled = False
+        self.batches = 0  # How many commits the adds were grouped into
+        self.adds = 0
+        # DISPATCH TABLE - like a { [op]: handler } object in JavaScript
+        self.handlers = {
+            "add": self.add,
+            "balance": self.balance,
+            "query": self.query,
+            "filter": self.filter,
+            "summary": self.summary,
+            "search": self.search,
+            "budgets": self.budgets,
+            "stats": self.stats,
+        }
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection: read a JSON line, send a JSON line, repeat"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break  # Client hung up
+                try:
+                    request = json.loads(line)
+                    handler = self.handlers.get(request.get("op"))
+                    if handler is None:
+                        raise ValueError(f"Unknown op: {request.get('op')!r}")
+                    response = {"ok": True, **await handler(request)}
+                except Exception as error:  # Whatever went wrong, the client gets an answer
+                    response = {"ok": False, "error": str(error)}
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _run(self, function, *args):
+        """Run a blocking tracker call on the worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    # ------------------------------------------------------------------
+    # WRITES - batched
+    # ------------------------------------------------------------------
+
+    async def add(self, request):
+        category = request["category"]
+        if category not in self.tracker.categories:
+            raise ValueError(f"Unknown category: {category!r}")
+        date = request.get("date")
+        # Checked and rounded to whole cents here, for this request alone:
+        # "nan" or "1e400" is this client's error, and must not fail the
+        # other clients' adds committed in the same batch
+        cents = to_cents(parse_amount(request["amount"]))
+        entry = (
+            # ValueError ("08/01/2025") goes back to the client as an error
+            normalize_date(date) if date else datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            str(request["description"]),
+            from_cents(cents),
+            category,
+            str(request.get("notes") or ""),
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._pending_adds.append((entry, future))
+        if not self._flush_scheduled:
+            # Wait one loop turn so every add that has already arrived joins
+            # the same batch
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(
+                lambda: asyncio.ensure_future(self._flush())
+            )
+        row, alerts = await future
+        response = {"balance": from_cents(row[3]), "transaction": _row_to_dict(row)}
+        if alerts:
+            response["alerts"] = alerts
+        return response
+
+    async def _flush(self):
+        """Commit every queued add in one go"""
+        batch, self._pending_adds = self._pending_adds, []
+        self._flush_scheduled = False
+        raised = []  # Filled on the worker thread with THIS batch's alerts only
+        try:
+            rows = await self._run(self.tracker._commit, [entry for entry, _ in batch], raised)
+            self.batches += 1
+            self.adds += len(batch)
+            # Each alert goes back to the client whose add crossed the threshold.
+            # Recurring rows added by tick() don't come through here; their
+            # alerts go to the tracker's on_budget_alert (the service's console)
+            alerts = [[] for _ in batch]
+            for alert in raised:
+                alerts[alert.row].append(describe_alert(alert))
+            for (_, future), row, row_alerts in zip(batch, rows, alerts):
+                future.set_result((row, row_alerts))
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            # Never leave a client waiting forever (e.g. cancelled mid-commit)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("The add was interrupted"))
+
+    async def tick(self):
+        """Add due recurring transactions every RECURRING_TICK seconds"""
+        while True:
+            await asyncio.sleep(RECURRING_TICK)
+            try:
+                # On the worker thread, so it queues up behind adds and reads
+                await self._run(self.tracker.run_recurring)
+            except (ValueError, OSError) as error:
+                print(f"❌ Recurring transactions failed: {error}")
+
+    # ------------------------------------------------------------------
+    # READS
+    # ------------------------------------------------------------------
+
+    async def balance(self, request):
+        # Re-read balance.txt (a few bytes) in case another process wrote
+        return {"balance": await self._run(self.tracker.load_balance)}
+
+    async def query(self, request, category=None):
+        limit = min(int(request.get("limit") or MAX_ROWS), MAX_ROWS)
+        last = request.get("last")
+        options = {
+            "category": category,
+            "limit": limit,
+            "offset": int(request.get("offset") or 0),
+            "last": None if last is None else min(int(last), MAX_ROWS),
+            "start_date": request.get("start_date"),
+            "end_date": request.get("end_date"),
+        }
+
+        def read():
+            return [_row_to_dict(t) for t in self.tracker.storage.iter_rows(**options)]
+
+        return {"transactions": await self._run(read)}
+
+    async def filter(self, request):
+        return await self.query(request, category=request["category"])
+
+    async def summary(self, request):
+        def read():
+            with self.tracker.lock:  # Catching up saves category_totals.json
+                self.tracker.aggregates.catch_up(self.tracker.storage)
+            return self.tracker.aggregates.summary(request.get("month"))
+
+        summary = await self._run(read)
+        keys = ("count", "income", "expenses", "min", "max")
+        return {
+            "categories": {
+                name: dict(zip(keys, values)) for name, values in summary.items()
+            }
+        }
+
+    async def budgets(self, request):
+        def read():
+            tracker = self.tracker
+            with tracker.lock:
+                tracker.aggregates.catch_up(tracker.storage)
+                return tracker.budgets.report(tracker.aggregates, request.get("period"))
+
+        lines = await self._run(read)
+        return {
+            "budgets": [
+                {**line._asdict(), "spent": from_cents(line.spent), "limit": from_cents(line.limit)}
+                for line in lines
+            ]
+        }
+
+    async def stats(self, request):
+        if self.tracker.stats is None:
+            raise ValueError("Stats are off - start the service with --stats")
+        return {"stats": await self._run(self.tracker.stats.dump)}
+
+    async def search(self, request):
+        limit = min(int(request.get("limit") or MAX_ROWS), MAX_ROWS)
+        query = str(request["query"])
+
+        def read():
+            tracker = self.tracker
+            with tracker.lock:
+                tracker.search_index.catch_up(tracker.storage)
+            bookmarks = tracker.search_index.search(query)
+            rows = tracker.storage.rows_at(bookmarks[:limit])
+            return len(bookmarks), [_row_to_dict(t) for t in rows]
+
+        total, transactions = await self._run(read)
+        return {"total": total, "transactions": transactions}
+
+
+def _row_to_dict(row):
+    """A saved row or Transaction as JSON-ready dict, money in dollars"""
+    date, description, amount, balance, category, notes = row
+    return {
+        "date": date,
+        "description": description,
+        "amount": from_cents(amount),
+        "balance": from_cents(balance),
+        "category": category,
+        "notes": notes,
+    }
+
+
+async def serve(tracker, socket_path=None, port=None):
+    """Run the server until cancelled (Ctrl+C)"""
+    service = TrackerServer(tracker)
+    if port is None and hasattr(socket, "AF_UNIX"):
+        socket_path = socket_path or os.path.join(tracker.data_dir, SOCKET_NAME)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # Left over from a previous run
+        server = await asyncio.start_unix_server(service.handle_client, socket_path)
+        where = socket_path
+    else:
+        port = port or DEFAULT_PORT
+        # 127.0.0.1 only - never reachable from other machines
+        server = await asyncio.start_server(service.handle_client, "127.0.0.1", port)
+        where = f"127.0.0.1:{port}"
+    print(f"🚀 Expense Tracker service listening on {where} (Ctrl+C to stop)")
+    ticker = asyncio.ensure_future(service.tick())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        ticker.cancel()
+        service.executor.shutdown()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+class TrackerClient:
+    """
+    Small blocking client for scripts: keeps one connection open
+
+        client = TrackerClient(socket_path="tracker.sock")
+        client.call("add", description="Lunch", amount=-12.5, category="Food & Dining")
+        client.call("balance")["balance"]
+    """
+
+    def __init__(self, socket_path=None, port=None):
+        if port is None and hasattr(socket, "AF_UNIX"):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path or SOCKET_NAME)
+        else:
+            self.sock = socket.create_connection(("127.0.0.1", port or DEFAULT_PORT))
+        self.file = self.sock.makefile("rwb")
+
+    def call(self, op, **params):
+        """Send one request and return the decoded response"""
+        self.file.write((json.dumps({"op": op, **params}) + "\n").encode())
+        self.file.flush()
+        response = json.loads(self.file.readline())
+        if not response.pop("ok"):
+            raise ValueError(response["error"])
+        return response
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Helpers for the small files the tracker keeps next to its transactions
+(balance.txt, the date index, category totals, budgets, the search index...)
+
+atomic_write() replaces a file all at once. JsonLinesLog is the shared base for
+side files saved as an APPEND-ONLY log of JSON lines: the first line holds
+everything, each save adds one line with only what changed (last line wins),
+and once COMPACT_EVERY lines pile up the file is rewritten as one line.
+"""
+
+import json  # Each line of a log is JSON
+import os  # For checking/removing/replacing files
+
+# Rewrite a log as one line after this many appended change lines
+COMPACT_EVERY = 1000
+
+
+def atomic_write(path, text):
+    """
+    Replace the file at `path` with `text`
+
+    ATOMIC WRITE - write a temp file, then rename it over the old one. A
+    reader (or a crash) sees either the old or the new file, never a
+    half-written one.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class JsonLinesLog:
+    """Base class for a side file saved as an append-only log of JSON lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self.appended = 0  # Change lines after the first line of the file
+        self.rewrite = True  # Next save writes the whole file
+
+    def _read_log(self):
+        """Every complete line of the file, oldest first ([] if there is no file)"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A line cut short by a crash (or the empty string after the
+                # last newline) - stop here; whatever it held is worked out
+                # again from the rows, and the next save rewrites the file cleanly
+                self.rewrite = bool(line)
+                break
+        self.appended = max(len(entries) - 1, 0)
+        self.rewrite = self.rewrite or self.appended >= COMPACT_EVERY
+        return entries
+
+    def _can_append(self):
+        """True if the next save may add just one line of changes"""
+        return not self.rewrite and os.path.exists(self.path)
+
+    def _append_line(self, data):
+        """Add one line of changes to the end of the file"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(data) + "\n")  # dumps() uses the fast C encoder; dump() does not
+        self.appended += 1
+        self.rewrite = self.appended >= COMPACT_EVERY
+
+    def _rewrite_log(self, data):
+        """Replace the whole file with one line holding everything"""
+        atomic_write(self.path, json.dumps(data) + "\n")
+        self.appended = 0
+        self.rewrite = False
+
+    def _remove_log(self):
+        """Delete the file; the next save writes it from scratch"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.appended = 0
+        self.rewrite = True
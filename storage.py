@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Storage backends for the Expense Tracker
+PHASE 3: Pluggable storage - the original CSV file, an indexed SQLite database,
+or monthly segment files (segments.py)
+
+Both backends expose the same small set of methods (like two components that
+accept the same props), so ExpenseTracker doesn't care which one it talks to:
+    exists()       -> is there any saved data?
+    append(rows)   -> save new transaction rows, money in whole cents (not
+                      fsynced - see sync())
+    iter_rows(...) -> yield Transaction records (filter by category and/or
+                      start_date/end_date, page with limit/offset, or keep
+                      only the `last` N)
+    end_position() -> a bookmark just past the newest row
+    scan_from(pos) -> yield (bookmark, Transaction) for rows after a bookmark
+    rows_at(pos)   -> yield the row right after each of several bookmarks
+    scan_backward(pos)   -> yield (bookmark, Transaction) newest first, for
+                            rows before a bookmark (paging back through history)
+    position_at_date(d)  -> bookmark just past the last row dated on/before d
+    truncate(pos)  -> drop every row after a bookmark (crash recovery)
+    normalize_money() -> rewrite old float-style amounts to whole cents
+    sync()         -> make everything written so far durable on disk
+    clear()        -> delete everything
+
+Every CSV row is exactly ONE line - the byte-offset bookmarks, the backward
+reader and the parallel scan all rely on it - so the tracker turns line
+breaks inside a description or note into spaces (one_line()) before saving.
+Files are always UTF-8 (never the system locale's encoding, e.g. cp1252 on
+Windows), matching the readers that decode raw bytes.
+"""
+
+import csv  # For the original CSV backend
+import os  # For checking/removing files
+import re  # Recognizing dates that are already in the row format
+import sqlite3  # Built-in SQLite database driver (no extra install needed!)
+from collections import deque, namedtuple  # Bounded queue + lightweight records
+from datetime import datetime  # Checking dates handed in from outside
+from itertools import islice  # Lazy slicing of generators (like .slice() on a stream)
+
+from date_index import DateIndex  # Day -> byte offset index for the CSV file
+from money import format_cents, normalize, parse_cents  # Whole-cents money <-> text
+
+# The column layout used by the current (Phase 2+) CSV format
+CSV_HEADER = ["Date", "Description", "Amount", "Balance", "Category", "Notes"]
+
+# Every row's Date column looks like this (sorting the text sorts the dates)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+ROW_DATE = re.compile(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+
+# Appended to an end date so "2025-08-31" also matches "2025-08-31 23:59:59"
+# ("~" sorts after every digit, space and colon in a date string)
+END_OF_DAY = "~"
+
+# How much of the CSV is read per step when walking backwards from the end
+BACKWARD_BLOCK = 64 * 1024
+
+# RECORD TYPE - Like a TypeScript interface, but also a real (immutable) object
+# namedtuple has no per-instance __dict__, so millions of these stay small.
+# amount/balance are WHOLE CENTS (ints), like the rows handed to append():
+# totals, budgets and the balance check add them up directly, and only the
+# display and the server's JSON turn them into dollars.
+Transaction = namedtuple(
+    "Transaction", ["date", "description", "amount", "balance", "category", "notes"]
+)
+
+
+def one_line(text):
+    """`text` with any line breaks replaced by spaces ("a\nb" -> "a b")"""
+    if "\n" in text or "\r" in text:
+        return " ".join(text.splitlines())
+    return text  # The usual case - no new string
+
+
+def normalize_date(text):
+    """
+    "YYYY-MM-DD HH:MM:SS" or a bare "YYYY-MM-DD" (midnight) -> the row format
+
+    Raises ValueError for anything else ("08/01/2025"), so a bad date is
+    caught on the way in instead of breaking reports later.
+    """
+    text = str(text).strip()
+    if ROW_DATE.fullmatch(text):
+        # Already in the row format (the usual case) - fromisoformat() only
+        # has to check the numbers are a real date, and is ~30x faster
+        # than strptime() (which halved bulk-import speed)
+        datetime.fromisoformat(text)
+        return text
+    try:
+        parsed = datetime.strptime(text, DATE_FORMAT)
+    except ValueError:
+        parsed = datetime.strptime(text, "%Y-%m-%d")
+    return parsed.strftime(DATE_FORMAT)  # Zero-padded, so text order = date order
+
+
+def read_transactions(path, category=None, limit=None, offset=0, last=None):
+    """
+    Stream Transaction records from a CSV file, one row at a time
+
+    Handles both the old 5-column format and the current 6-column format.
+    - category: only yield rows in this category
+    - offset/limit: skip the first `offset` matches, then stop after `limit`
+      (the file is closed as soon as we have enough - early termination)
+    - last: only yield the final `last` matches, keeping at most that many
+      rows in memory no matter how big the file is
+    """
+    return _page(_decode_csv(path, category), limit, offset, last)
+
+
+def _page(rows, limit=None, offset=0, last=None):
+    """Apply last/offset/limit to a stream of records without loading it all"""
+    if last is not None:
+        # deque(maxlen=N) drops the oldest item automatically - constant memory
+        rows = iter(deque(rows, maxlen=last))
+    stop = None if limit is None else offset + limit
+    yield from islice(rows, offset, stop)
+
+
+def _decode_row(row, has_categories):
+    """Turn one raw CSV row (old or new format) into a Transaction"""
+    if has_categories and len(row) == 6:
+        date, description, amount, balance, category, notes = row
+    else:
+        # BACKWARDS COMPATIBILITY - old files have 5 columns (no category)
+        date, description, amount, balance, notes = row[:5]
+        category = "Uncategorized"
+    # Money text -> whole cents with int() instead of float(): "-12.50" ->
+    # -1250 (parse_cents() inlined - this runs twice per row read)
+    if amount[-3:-2] == "." and balance[-3:-2] == ".":
+        return Transaction(
+            date, description, int(amount.replace(".", "")), int(balance.replace(".", "")), category, notes
+        )
+    # Older files ("1000.0", "0.30000000000000004") - exact, slower path
+    return Transaction(date, description, parse_cents(amount), parse_cents(balance), category, notes)
+
+
+def _decode_csv(path, category=None):
+    """Generator that turns raw CSV rows into Transaction records"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:  # Empty file - nothing to read
+            return
+        has_categories = len(header) == 6
+        for row in reader:
+            transaction = _decode_row(row, has_categories)
+            # A CSV file has no index, so filtering still means checking every row
+            if category is not None and transaction.category != category:
+                continue
+            yield transaction
+
+
+class CSVStorage:
+    """Original storage: one row per transaction in a CSV file"""
+
+    def __init__(self, path):
+        self.path = path
+        # SIDECAR INDEX - transactions.csv.idx maps each day to a byte offset
+        self.index = DateIndex(path + ".idx")
+
+    def exists(self):
+        """True if the CSV file has been created"""
+        return os.path.exists(self.path)
+
+    def append(self, rows):
+        """
+        Append transaction rows, writing the header if the file is new
+
+        No fsync here: the tracker's journal is fsynced first and replays
+        the rows after a crash. The date index is updated as we go (once
+        per run of rows on the same day, not once per row).
+        """
+        self._sync_index()  # Pick up rows written by anything else first
+        file_exists = self.exists()
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if not file_exists:
+                writer.writerow(CSV_HEADER)
+            run_day, run_start = None, None  # The day being written and where it began
+            for date, description, amount, balance, *rest in rows:
+                date = str(date)
+                if date[:10] != run_day:
+                    here = f.tell()  # tell() = current byte offset
+                    if run_day is not None:
+                        self.index.add(run_day, run_start, here)
+                    run_day, run_start = date[:10], here
+                # Money is written with exactly two decimals: -1250 -> "-12.50"
+                writer.writerow([date, description, format_cents(amount), format_cents(balance), *rest])
+            if run_day is not None:
+                self.index.add(run_day, run_start, f.tell())
+        self.index.save(self.end_position())
+
+    def iter_rows(
+        self,
+        category=None,
+        limit=None,
+        offset=0,
+        last=None,
+        start_date=None,
+        end_date=None,
+    ):
+        """
+        Yield Transaction records (see read_transactions for the options)
+
+        start_date/end_date ("YYYY-MM-DD", both inclusive) use the date index
+        to seek() to the first matching row and stop after the last one.
+        """
+        if start_date is None and end_date is None:
+            return read_transactions(self.path, category, limit, offset, last)
+        rows = self._date_range(start_date, end_date, category)
+        return _page(rows, limit, offset, last)
+
+    def _date_range(self, start_date, end_date, category):
+        """Generator for rows between two dates, reading as little as possible"""
+        self._sync_index()
+        start, stop = self.index.span(start_date, end_date)
+        upper = None if end_date is None else end_date + END_OF_DAY
+        for row_start, _, transaction in self._scan_lines(start):
+            if row_start >= stop:
+                break  # Past the last row of the last matching day
+            # Back-dated rows can sit inside the span - check every date
+            if upper is not None and transaction.date > upper:
+                continue
+            if start_date is not None and transaction.date < start_date:
+                continue
+            if category is not None and transaction.category != category:
+                continue
+            yield transaction
+
+    def _sync_index(self):
+        """Index any rows the date index hasn't seen yet (e.g. an old CSV)"""
+        end = self.end_position()
+        if self.index.covered == end:
+            return  # Already up to date - the common case, just one stat() call
+        if self.index.covered > end:
+            self.index.clear()  # File shrank/was replaced - rebuild from scratch
+        for row_start, row_end, transaction in self._scan_lines(self.index.covered):
+            if row_end > end:
+                break  # Added after we measured `end` - indexed next time
+            self.index.add(transaction.date, row_start, row_end)
+        self.index.save(end)
+
+    def end_position(self):
+        """Byte offset just past the last row (0 if there is no file yet)"""
+        return os.path.getsize(self.path) if self.exists() else 0
+
+    def scan_from(self, position=0):
+        """
+        Yield (position_after_row, Transaction) for every row after `position`
+
+        `position` is a byte offset from end_position()/scan_from(), so a
+        caller that remembers it can seek() straight back here later and
+        only read the rows added since - no need to re-read the whole file.
+        """
+        for _, row_end, transaction in self._scan_lines(position):
+            yield row_end, transaction
+
+    def _scan_lines(self, position):
+        """Yield (row_start, row_end, Transaction) byte ranges from `position`"""
+        if not self.exists():
+            return
+        # Binary mode so every line's length in bytes is exact for seek()
+        with open(self.path, "rb") as f:
+            header_line = f.readline()
+            if not header_line:
+                return
+            has_categories = len(next(csv.reader([header_line.decode("utf-8")]))) == 6
+            position = max(position, f.tell())  # Never re-read the header
+            f.seek(position)
+            for line in f:
+                row = next(csv.reader([line.decode("utf-8")]))
+                yield position, position + len(line), _decode_row(row, has_categories)
+                position += len(line)
+
+    def rows_at(self, positions):
+        """
+        Yield the Transaction that starts right after each bookmark
+
+        Used by search: the index remembers where each row starts, so we
+        seek() straight to it and read one line - no scanning.
+        """
+        if not self.exists():
+            return
+        with open(self.path, "rb") as f:
+            header_line = f.readline()
+            has_categories = len(next(csv.reader([header_line.decode("utf-8")]))) == 6
+            header_end = f.tell()
+            for position in positions:
+                f.seek(max(position, header_end))
+                row = next(csv.reader([f.readline().decode("utf-8")]))
+                yield _decode_row(row, has_categories)
+
+    def scan_backward(self, position=None):
+        """
+        Yield (row_start, Transaction) for the rows before byte `position`
+        (default: the end of the file), NEWEST FIRST
+
+        The file is read backwards in BACKWARD_BLOCK chunks, so showing the
+        latest page of a huge file only touches its last few kilobytes.
+        Pass a yielded row_start back in to continue with older rows.
+        """
+        if not self.exists():
+            return
+        with open(self.path, "rb") as f:
+            header_line = f.readline()
+            has_categories = len(next(csv.reader([header_line.decode("utf-8")]))) == 6
+            header_end = f.tell()
+            block_start = self.end_position() if position is None else position
+            pending = b""  # Bytes from block_start up to the rows already yielded
+            while block_start > header_end:
+                start = max(header_end, block_start - BACKWARD_BLOCK)
+                f.seek(start)
+                pending = f.read(block_start - start) + pending
+                block_start = start
+                # Unless we reached the header, the first line may be cut off
+                # in the middle - keep it for the next (older) block
+                cut = 0 if block_start == header_end else pending.find(b"\n") + 1
+                complete, pending = pending[cut:], pending[:cut]
+                lines = complete.split(b"\n")[:-1]  # Every row ends with a newline
+                row_start = block_start + cut
+                starts = []
+                for line in lines:
+                    starts.append(row_start)
+                    row_start += len(line) + 1
+                for row_start, line in zip(reversed(starts), reversed(lines)):
+                    row = next(csv.reader([line.decode("utf-8")]))
+                    yield row_start, _decode_row(row, has_categories)
+
+    def position_at_date(self, date):
+        """Bookmark just past the last row dated on/before `date` (YYYY-MM-DD)"""
+        self._sync_index()
+        return self.index.find_end(date)
+
+    def truncate(self, position):
+        """Cut the file back to `position` bytes (undo a half-finished append)"""
+        if position == 0:
+            self.clear()  # Nothing survives, not even the header
+        elif self.exists():
+            os.truncate(self.path, position)
+
+    def normalize_money(self):
+        """
+        Rewrite Amount/Balance as exact two-decimal text; returns rows changed
+
+        The file is copied to a temp file and renamed over the original (so a
+        crash leaves either the old or the new file). Old 5-column rows keep
+        their layout - only the two money columns change, plus any line break
+        saved inside a quoted field (before one_line() existed) is flattened.
+        """
+        if not self.exists():
+            return 0
+        changed = 0
+        temp_path = self.path + ".tmp"
+        with open(self.path, "r", newline="", encoding="utf-8") as source, open(
+            temp_path, "w", newline="", encoding="utf-8"
+        ) as target:
+            reader, writer = csv.reader(source), csv.writer(target)
+            header = next(reader, None)
+            if header is not None:
+                writer.writerow(header)
+            for row in reader:
+                # Amount and Balance are columns 2 and 3 in both formats
+                amount, balance = normalize(row[2]), normalize(row[3])
+                flat = [one_line(value) for value in row]
+                if (amount, balance) != (row[2], row[3]) or flat != row:
+                    row = flat
+                    row[2], row[3] = amount, balance
+                    changed += 1
+                writer.writerow(row)
+        if not changed:
+            os.remove(temp_path)
+            return 0
+        os.replace(temp_path, self.path)
+        self.index.clear()  # Byte offsets moved - re-index the new file
+        self._sync_index()
+        return changed
+
+    def sync(self):
+        """Force everything written so far onto the disk"""
+        if self.exists():
+            with open(self.path, "rb") as f:
+                os.fsync(f.fileno())
+
+    def clear(self):
+        """Delete the CSV file (and its date index) completely"""
+        if self.exists():
+            os.remove(self.path)
+        self.index.clear()
+
+
+class SQLiteStorage:
+    """
+    SQLite storage with indexes so filters don't need to read every row
+
+    - WAL (write-ahead log) mode lets readers keep reading while a write happens
+    - (category, date) index answers "show me category X" without a full scan
+    - date index answers date-range questions the same way
+    - money is stored as INTEGER cents, exact like the rest of the tracker
+    """
+
+    # SQL SCHEMA - Like defining the shape of an object in TypeScript
+    TABLE = """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id          INTEGER PRIMARY KEY,
+            date        TEXT NOT NULL,
+            description TEXT NOT NULL,
+            amount      INTEGER NOT NULL,  -- whole cents
+            balance     INTEGER NOT NULL,  -- whole cents
+            category    TEXT NOT NULL,
+            notes       TEXT NOT NULL DEFAULT ''
+        )
+    """
+    INDEXES = (
+        "CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category, date)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)",
+    )
+    # The columns of a Transaction record, in order
+    COLUMNS = "date, description, amount, balance, category, notes"
+
+    def __init__(self, path):
+        self.path = path
+        # check_same_thread=False: group commit may write from whichever thread
+        # leads; the tracker's own locks make sure only one writes at a time
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # PRAGMAs are SQLite settings - WAL + NORMAL sync is the usual fast-and-safe combo
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(self.TABLE)
+        for statement in self.INDEXES:
+            self.conn.execute(statement)
+
+    def exists(self):
+        """True if at least one transaction has been saved"""
+        row = self.conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone()
+        return row is not None
+
+    def append(self, rows):
+        """Insert transaction rows in a single database transaction"""
+        # One COMMIT per call = one disk sync per batch (WAL mode with
+        # synchronous=NORMAL; the tracker's journal covers a power cut)
+        # "with self.conn" commits on success and rolls back on error
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO transactions "
+                "(date, description, amount, balance, category, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,  # Money is already whole cents - stored as it is
+            )
+
+    def iter_rows(
+        self,
+        category=None,
+        limit=None,
+        offset=0,
+        last=None,
+        start_date=None,
+        end_date=None,
+    ):
+        """Yield Transaction records; filtering and paging happen inside SQL"""
+        columns = self.COLUMNS
+        # PREDICATE PUSH-DOWN - WHERE clauses let SQLite use the (category, date)
+        # and date indexes instead of us checking every row in Python
+        conditions, params = [], []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("date <= ?")
+            params.append(end_date + END_OF_DAY)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        if category is not None or start_date is not None or end_date is not None:
+            order, newest_first = "date, id", "date DESC, id DESC"
+        else:
+            order, newest_first = "id", "id DESC"
+        if last is not None:
+            # Newest `last` rows first, then flip them back into oldest-first order
+            query = (
+                f"SELECT * FROM (SELECT {columns}, id FROM transactions {where} "
+                f"ORDER BY {newest_first} LIMIT ?) ORDER BY {order}"
+            )
+            params.append(last)
+        else:
+            query = f"SELECT {columns}, id FROM transactions {where} ORDER BY {order}"
+        # LIMIT -1 means "no limit" in SQLite
+        query += " LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        for row in self.conn.execute(query, params):
+            yield Transaction(*row[:6])
+
+    def end_position(self):
+        """Id of the newest row (0 if the table is empty)"""
+        row = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM transactions").fetchone()
+        return row[0]
+
+    def scan_from(self, position=0):
+        """Yield (row_id, Transaction) for every row with an id after `position`"""
+        # The primary key is an index, so this jumps straight to the new rows
+        cursor = self.conn.execute(
+            f"SELECT id, {self.COLUMNS} FROM transactions WHERE id > ? ORDER BY id",
+            (position,),
+        )
+        for row in cursor:
+            yield row[0], Transaction(*row[1:])
+
+    def rows_at(self, positions):
+        """Yield the row with the next id after each bookmark (primary key lookups)"""
+        for position in positions:
+            row = self.conn.execute(
+                f"SELECT {self.COLUMNS} FROM transactions WHERE id > ? ORDER BY id LIMIT 1",
+                (position,),
+            ).fetchone()
+            if row is not None:
+                yield Transaction(*row)
+
+    def scan_backward(self, position=None):
+        """Yield (id - 1, Transaction) for rows with id <= `position`, newest first"""
+        if position is None:
+            position = self.end_position()
+        # Walking the primary key backwards - no sorting needed
+        cursor = self.conn.execute(
+            f"SELECT id, {self.COLUMNS} FROM transactions WHERE id <= ? ORDER BY id DESC",
+            (position,),
+        )
+        for row in cursor:
+            yield row[0] - 1, Transaction(*row[1:])
+
+    def position_at_date(self, date):
+        """Id of the newest row dated on/before `date` (uses the date index)"""
+        row = self.conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM transactions WHERE date <= ?",
+            (date + END_OF_DAY,),
+        ).fetchone()
+        return row[0]
+
+    def truncate(self, position):
+        """Delete rows after id `position` (undo a half-finished append)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM transactions WHERE id > ?", (position,))
+
+    def normalize_money(self):
+        """Amounts are INTEGER cents, never float text - nothing to do"""
+        return 0
+
+    def sync(self):
+        """Copy the WAL into the main database file and sync it to disk"""
+        self.conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def clear(self):
+        """Delete every transaction (the table and indexes stay in place)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM transactions")
+
+    def import_from(self, other):
+        """Copy every row from another backend - used to migrate CSV -> SQLite"""
+        self.append(other.iter_rows())
+
+
+# FACTORY FUNCTION - Picks the right class from a simple string name
+def open_storage(kind, data_dir="."):
+    """Create a storage backend by name ("csv", "sqlite" or "segments")"""
+    if kind == "csv":
+        return CSVStorage(os.path.join(data_dir, "transactions.csv"))
+    if kind == "sqlite":
+        return SQLiteStorage(os.path.join(data_dir, "transactions.db"))
+    if kind == "segments":
+        from segments import SegmentStorage  # Imported here - it builds on this module
+
+        return SegmentStorage(os.path.join(data_dir, "segments"))
+    raise ValueError(
+        f"Unknown storage backend: {kind!r} (use 'csv', 'sqlite' or 'segments')"
+    )
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test script for the per-category totals cache and category summary"""
+
+import tempfile
+
+from aggregates import CategoryAggregates
+from main import ExpenseTracker
+import side_files
+
+print("🧪 TESTING CATEGORY TOTALS")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    tracker.add_transactions_bulk(
+        [
+            ("Paycheck", 1000, "Income", "", "2025-07-31 09:00:00"),
+            ("Lunch", -12.5, "Food & Dining", "", "2025-08-01 12:00:00"),
+            ("Refund", 2.5, "Food & Dining", "", "2025-08-02 12:00:00"),
+            ("Dinner", -40, "Food & Dining", "", "2025-08-03 19:00:00"),
+        ]
+    )
+    summary = tracker.category_summary()
+    assert summary["Food & Dining"] == (3, 2.5, 52.5, -40.0, 2.5), summary
+    assert tracker.category_summary("2025-07") == {"Income": (1, 1000.0, 0.0, 1000.0, 1000.0)}
+    print("✅ Totals updated on write, with per-month filtering")
+
+    # Totals survive a restart and match a full rebuild
+    reopened = ExpenseTracker(data_dir=data_dir)
+    assert reopened.aggregates.totals == tracker.aggregates.totals
+    before = dict(reopened.aggregates.totals)
+    reopened.rebuild_aggregates()
+    assert reopened.aggregates.totals == before
+    print("✅ Saved totals match a full rebuild")
+
+    # Rows written behind the cache's back are picked up on the next summary
+    tracker.storage.append([["2025-08-04 08:00:00", "Bus", -300, 94700, "Transportation", ""]])
+    assert reopened.category_summary()["Transportation"][0] == 1
+    print("✅ Out-of-band rows are caught up incrementally")
+
+    tracker.reset_tracker()
+    assert tracker.category_summary() == {}
+
+    # Each save appends one line with only the changed totals
+    tracker.add_transactions_bulk([("Lunch", -10, "Food & Dining", "", "2025-08-01 12:00:00")])
+    tracker.add_transactions_bulk([("Bus", -2, "Transportation", "", "2025-08-01 13:00:00")])
+    with open(tracker.aggregates.path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 2 and '"Food & Dining"' not in lines[1], lines
+    assert CategoryAggregates(tracker.aggregates.path).totals == tracker.aggregates.totals
+    # A crash mid-append leaves a cut-off line: it is ignored, the rows after
+    # the last good line are re-read, and the next save rewrites the file
+    with open(tracker.aggregates.path, "a") as f:
+        f.write('{"covered": 99, "tota')
+    reloaded = CategoryAggregates(tracker.aggregates.path)
+    assert reloaded.rewrite and reloaded.totals == tracker.aggregates.totals
+    reloaded.save(reloaded.covered)
+    with open(tracker.aggregates.path) as f:
+        assert len(f.read().splitlines()) == 1
+    # Compacted back to one line every COMPACT_EVERY saves
+    side_files.COMPACT_EVERY = 3
+    for n in range(4):
+        tracker.add_transactions_bulk([(f"Snack {n}", -1, "Food & Dining", "", "2025-08-02 12:00:00")])
+    with open(tracker.aggregates.path) as f:
+        assert len(f.read().splitlines()) == 2  # Rewritten at the 3rd save, then one more
+    assert CategoryAggregates(tracker.aggregates.path).totals == tracker.aggregates.totals
+    print("✅ Saves append only what changed; torn lines and compaction handled")
+
+
+class GrowingStorage:
+    """A storage another tracker appends to while we scan it"""
+
+    def __init__(self, storage, late_row):
+        self.storage, self.late_row = storage, late_row
+
+    def end_position(self):
+        return self.storage.end_position()
+
+    def scan_from(self, position):
+        yield from self.storage.scan_from(position)
+        # Appended after our end_position() call - only reached if the scan
+        # didn't stop at `end`
+        end = self.storage.end_position()
+        self.storage.append([self.late_row])
+        yield from self.storage.scan_from(end)
+
+
+with tempfile.TemporaryDirectory() as data_dir:
+    for kind in ("csv", "sqlite", "segments"):
+        tracker = ExpenseTracker(data_dir=data_dir, storage=kind)
+        tracker.add_transactions_bulk([("Lunch", -10, "Food & Dining", "", "2025-08-01 12:00:00")])
+        totals = CategoryAggregates(tracker.aggregates.path + ".test")
+        late = ["2025-08-02 12:00:00", "Late", -500, -1500, "Food & Dining", ""]
+        totals.catch_up(GrowingStorage(tracker.storage, late))
+        assert totals.totals[("Food & Dining", "2025-08")][0] == 1, totals.totals
+        totals.catch_up(tracker.storage)  # Picked up - once - on the next call
+        assert totals.totals[("Food & Dining", "2025-08")][0] == 2, totals.totals
+    print("✅ catch_up stops at the end it measured - no double counting")
+
+print("\n" + "=" * 50)
+print("✅ Category totals testing complete!")
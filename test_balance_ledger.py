@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test script for balance snapshots and verify/recompute"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+from balance_ledger import BalanceLedger
+from main import ExpenseTracker
+from storage import CSVStorage, SQLiteStorage
+
+print("🧪 TESTING BALANCE SNAPSHOTS")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    for storage in (
+        CSVStorage(os.path.join(data_dir, "transactions.csv")),
+        SQLiteStorage(os.path.join(data_dir, "transactions.db")),
+    ):
+        name = type(storage).__name__
+        ledger = BalanceLedger(storage, os.path.join(data_dir, f"{name}.snap"), interval=3)
+        ledger.snapshot(100.0, rows=0)  # Like set_balance(100) on an empty tracker
+
+        balance = 10000  # Cents, like the rows the tracker writes
+        for i in range(7):
+            balance += 1000
+            storage.append([["2025-08-01 09:00:00", f"Row {i}", 1000, balance, "Income", ""]])
+            ledger.record_append(1, balance / 100)
+
+        # 7 rows with interval=3 -> snapshots after rows 3 and 6, one row of delta
+        assert ledger.last.rows == 6, ledger.last
+        ok, check = ledger.verify(170.0)
+        assert ok and check.rows_replayed == 1, check
+        print(f"✅ {name}: verify replays only the row after the last snapshot")
+
+        # CRASH SIMULATION - a row landed on disk but balance.txt was never updated
+        storage.append([["2025-08-02 09:00:00", "Lost", -2000, 15000, "Other", ""]])
+        ok, check = ledger.verify(170.0)
+        assert not ok and check.balance == 150.0 and check.rows_replayed == 1, check
+        print(f"✅ {name}: stale saved balance detected, recomputed $150.00")
+
+        # A fresh ledger object (new process) picks the snapshot back up from disk
+        reloaded = BalanceLedger(storage, ledger.path)
+        assert reloaded.last == ledger.last
+        print(f"✅ {name}: snapshots reload from disk")
+
+    # An older ledger with no snapshots: "Set Balance" changed balance.txt
+    # without writing a row, so the next row jumps. That's a new starting
+    # point, and a replay from row 1 never overwrites balance.txt
+    legacy_dir = os.path.join(data_dir, "legacy")
+    os.mkdir(legacy_dir)
+    storage = CSVStorage(os.path.join(legacy_dir, "transactions.csv"))
+    storage.append([["2025-08-01 09:00:00", "Pay", 1000, 1000, "Income", ""]])
+    storage.append([["2025-08-02 09:00:00", "Coffee", -400, 49600, "Food & Dining", ""]])
+    ok, check = BalanceLedger(storage, os.path.join(legacy_dir, "snap.csv")).verify(496.0)
+    assert ok and check.balance == 496.0 and len(check.jumps) == 1, check
+    storage.append([["2025-08-03 09:00:00", "Refund", 500, 50100, "Other", ""]])
+    storage.append([["2025-08-04 09:00:00", "Old", -49000, 1100, "Other", ""]])
+    os.remove(os.path.join(legacy_dir, "snap.csv"))
+    with open(os.path.join(legacy_dir, "balance.txt"), "w") as f:
+        f.write("501.00")  # Set by hand after the last row
+    tracker = ExpenseTracker(data_dir=legacy_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok, check = tracker.verify_balance(fix=True)
+    assert not ok and check.from_snapshot is None and check.balance == 11.0
+    assert tracker.load_balance() == 501.0  # Left alone
+    print("✅ Hand-set balances in old ledgers are new starting points, never \"fixed\"")
+
+print("\n" + "=" * 50)
+print("✅ Balance snapshot testing complete!")
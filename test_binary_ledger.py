@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Test script for the binary ledger format and its CSV converters"""
+
+import os
+import tempfile
+
+from binary_ledger import RECORD, BinaryLedger, binary_to_csv, csv_to_binary
+from storage import read_transactions
+
+print("🧪 TESTING BINARY LEDGER")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    csv_path = os.path.join(data_dir, "transactions.csv")
+    with open(csv_path, "w") as f:
+        # Old 5-column format, so every row decodes as "Uncategorized"
+        f.write("Date,Description,Amount,Balance,Notes\n")
+        f.write("2025-07-01 10:00:00,Coffee,-3.5,96.5,\n")
+        f.write('2025-07-02 11:30:15,"Pizza, large",-18.25,78.25,café ☕\n')
+        f.write("2025-07-03 09:00:00,Paycheck,1000.0,1078.25,\n")
+
+    binary_path = os.path.join(data_dir, "transactions.bin")
+    assert csv_to_binary(csv_path, binary_path, ["Income"]) == 3
+    assert os.path.getsize(binary_path) == 4096 + 3 * RECORD.size
+
+    with BinaryLedger(binary_path) as ledger:
+        assert len(ledger) == 3 and ledger.categories == ["Income", "Uncategorized"]
+        pizza = ledger[1]  # Random access - no scanning
+        assert pizza.description == "Pizza, large" and pizza.notes == "café ☕"
+        assert pizza.amount == -1825 and pizza.date == "2025-07-02 11:30:15"
+        assert ledger.totals_by_category() == {"Income": 0, "Uncategorized": 978_25}
+    print("✅ CSV -> binary keeps every field, including commas and unicode")
+
+    export_path = os.path.join(data_dir, "export.csv")
+    binary_to_csv(binary_path, export_path)
+    assert list(read_transactions(export_path)) == list(read_transactions(csv_path))
+    print("✅ binary -> CSV round-trips exactly")
+
+# A record can point at text past the 4 GiB mark of the heap
+record = (-100, 107725, 1751616000, 3, (5 << 32) + 7, 8, 4)
+assert RECORD.size == 44 and RECORD.unpack(RECORD.pack(*record)) == record
+print("✅ 64-bit heap offsets reach past 4 GiB")
+
+print("\n" + "=" * 50)
+print("✅ Binary ledger testing complete!")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test script for budgets: running counters, alerts on insert, reports"""
+
+import contextlib
+import io
+import tempfile
+
+from main import ExpenseTracker
+
+print("🧪 TESTING BUDGETS")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    # History from before any budget existed
+    tracker.add_transactions_bulk(
+        [
+            ("Groceries", -150, "Food & Dining", "", "2025-07-03 10:00:00"),
+            ("Dinner", -90, "Food & Dining", "", "2025-08-02 19:00:00"),
+            ("Bus pass", -60, "Transportation", "", "2025-08-03 08:00:00"),
+            ("Salary", 3000, "Income", "", "2025-08-01 09:00:00"),
+        ]
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.set_budget("Food & Dining", "month", 200)
+        tracker.set_budget("*", "year", 450)
+
+    alerts = []
+    tracker.on_budget_alert = alerts.append
+    tracker.add_transactions_bulk([("Lunch", -50, "Food & Dining", "", "2025-08-10 12:00:00")])
+    # Food: 90 + 50 = 140 of 200 (70%) - no alert yet
+    assert alerts == [], alerts
+    tracker.add_transactions_bulk([("Takeout", -25, "Food & Dining", "", "2025-08-11 12:00:00")])
+    # Food: 165 of 200 crosses 80%; all of 2025: 150+90+60+50+25 = 375 of 450 crosses 80%
+    assert [(a.category, a.period_key, a.threshold, a.spent) for a in alerts] == [
+        ("Food & Dining", "2025-08", 80, 16500),
+        ("*", "2025", 80, 37500),
+    ], alerts
+    alerts.clear()
+    tracker.add_transactions_bulk(
+        [
+            ("Refund", 40, "Food & Dining", "", "2025-08-12 12:00:00"),  # Income - not counted
+            ("Party", -100, "Entertainment", "", "2025-08-13 20:00:00"),
+            ("Feast", -60, "Food & Dining", "", "2025-08-14 20:00:00"),
+        ]
+    )
+    assert [(a.category, a.threshold, a.row) for a in alerts] == [
+        ("*", 100, 1),
+        ("Food & Dining", 100, 2),
+    ], alerts
+    print("✅ Alerts fire once, on the insert that crosses 80% / 100%")
+
+    # Counters agree with a full recount of the rows
+    spent = tracker.budgets.spent
+    assert spent[("Food & Dining", "2025-08")] == 22500
+    assert spent[("*", "2025")] == 53500
+    with contextlib.redirect_stdout(io.StringIO()):
+        lines = tracker.budget_report()
+    assert [(l.category, l.period_key, l.spent, l.limit) for l in lines] == [
+        ("*", "2025", 53500, 45000),
+        ("Food & Dining", "2025-07", 15000, 20000),
+        ("Food & Dining", "2025-08", 22500, 20000),
+    ], lines
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert len(tracker.budget_report("2025-07")) == 2  # That month + its year
+    print("✅ Budget vs actual history served from the counters")
+
+    # Rows added by another tracker are picked up before the next check
+    other = ExpenseTracker(data_dir=data_dir)
+    other.on_budget_alert = lambda alert: None
+    other.add_transactions_bulk([("Snack", -5, "Food & Dining", "", "2025-09-01 12:00:00")])
+    tracker.add_transactions_bulk([("Snack", -5, "Food & Dining", "", "2025-09-02 12:00:00")])
+    assert tracker.budgets.spent[("Food & Dining", "2025-09")] == 1000
+    # ... and so are budgets another tracker sets
+    with contextlib.redirect_stdout(io.StringIO()):
+        other.set_budget("Transportation", "month", 10)
+    tracker.add_transactions_bulk([("Taxi", -12, "Transportation", "", "2025-09-03 12:00:00")])
+    assert [(a.category, a.threshold) for a in alerts[-2:]] == [
+        ("Transportation", 80),
+        ("Transportation", 100),
+    ]
+    print("✅ Other trackers' rows and budgets are seen")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.set_budget("Transportation", "month", 0)
+        try:
+            tracker.set_budget("Food & Dining", "week", 10)
+            raise AssertionError("week budgets are not supported")
+        except ValueError:
+            pass
+        tracker.reset_tracker()
+        assert tracker.budget_report() == []
+    assert set(tracker.budgets.limits) == {("Food & Dining", "month"), ("*", "year")}
+    print("✅ Limits can be removed and survive a reset")
+
+print("\n" + "=" * 50)
+print("✅ Budgets testing complete!")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test script for the non-interactive bulk import API"""
+
+import contextlib
+import csv
+import io
+import tempfile
+
+from main import ExpenseTracker
+
+print("🧪 TESTING BULK IMPORT")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    tracker.set_balance(100)
+
+    rows = [(f"Coffee {i}", -2.5, "Food & Dining", "") for i in range(2500)]
+    rows.append(("Paycheck", 1000, "Income", "August", "2025-08-01 09:00:00"))
+    count, rate = tracker.add_transactions_bulk(rows, batch_size=1000)
+    assert count == 2501 and tracker.balance == 100 - 6250 + 1000
+    print(f"✅ Imported {count} rows at {rate:,.0f} rows/sec")
+
+    # balance.txt is written once at the end and agrees with the rows
+    assert ExpenseTracker(data_dir=data_dir).balance == tracker.balance
+    ok, check = tracker.verify_balance()
+    assert ok, check
+    last = list(tracker.storage.iter_rows(last=1))[0]
+    assert last.date == "2025-08-01 09:00:00" and last.notes == "August"
+
+    # A bad row stops the import, but everything before it is kept
+    try:
+        tracker.add_transactions_bulk(
+            [("Ok", 5, "Other", ""), ("Bad", 5, "Not a category", "")]
+        )
+        raise AssertionError("unknown category should raise ValueError")
+    except ValueError as error:
+        print(f"✅ Rejected bad row: {error}")
+    assert tracker.balance == 100 - 6250 + 1000  # Nothing from the bad batch saved
+    try:
+        tracker.add_transactions_bulk([("Ok", 5, "Other", ""), ("Huge", "1e400", "Other", "")])
+        raise AssertionError("a non-finite amount should raise ValueError")
+    except ValueError as error:
+        assert str(error) == "Row 2: bad amount '1e400'", error
+    assert tracker.balance == 100 - 6250 + 1000
+
+    # Verify compares against balance.txt as it is now, not our cached copy
+    other = ExpenseTracker(data_dir=data_dir)
+    other.add_transactions_bulk([("Other tracker", -5, "Other", "")])
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok, check = tracker.verify_balance()
+    assert ok and tracker.balance == other.balance, check
+    # ...and the snapshot another tracker's Set Balance wrote
+    with contextlib.redirect_stdout(io.StringIO()):
+        other.set_balance(500)
+        ok, check = tracker.verify_balance(fix=True)
+    assert ok and check.rows_replayed == 0 and tracker.load_balance() == 500, check
+    print("✅ verify_balance sees rows and snapshots written by another tracker")
+
+# A pasted multi-line note can't split a CSV row in two
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    tracker.add_transactions_bulk([("Lunch", -5, "Food & Dining", "line1\nline2")] * 3)
+    tracker.add_transactions_bulk([("Two\r\nlines", -1, "Other", "")])
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok, check = tracker.verify_balance()
+        assert tracker.search_transactions("line2") == 3
+        tracker.render_page(None, 10)
+    assert ok, check
+    rows = list(tracker.storage.iter_rows())
+    assert [t.notes for t in rows[:3]] == ["line1 line2"] * 3 and rows[3].description == "Two lines"
+
+    # A file saved before that (a quoted field spanning two lines) is fixed
+    # by --migrate-money
+    with open(tracker.storage.path, "a", newline="") as f:
+        csv.writer(f).writerow(["2025-08-02 10:00:00", "Old", "-1.00", "-17.00", "Other", "a\nb"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert tracker.migrate_money() == 1
+        _, check = tracker.verify_balance()
+    assert check.balance == -17 and not check.jumps, check  # Every row parses again
+    assert list(tracker.storage.iter_rows(last=1))[0].notes == "a b"
+    print("✅ Line breaks in descriptions/notes never split a row")
+
+    # Dates are checked and saved in the one format the reports expect
+    tracker.add_transactions_bulk([("Bare date", -1, "Other", "", "2025-08-03")])
+    assert list(tracker.storage.iter_rows(last=1))[0].date == "2025-08-03 00:00:00"
+    try:
+        tracker.add_transactions_bulk([("Ok", -1, "Other", ""), ("US date", -1, "Other", "", "08/01/2025")])
+        raise AssertionError("08/01/2025 should be rejected")
+    except ValueError as error:
+        assert str(error).startswith("Row 2: bad date '08/01/2025'"), error
+    print("✅ Dates are validated and normalized")
+
+print("\n" + "=" * 50)
+print("✅ Bulk import testing complete!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Stress test: several tracker processes (and threads) adding at the same time
+
+Without the lock, two writers read the same balance, both add to it, and one
+update is lost. With it, every row must land and balance.txt must equal the
+sum of all amounts.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+from main import ExpenseTracker
+
+PROCESSES = 4
+ADDS_PER_PROCESS = 100
+THREADS = 8
+ADDS_PER_THREAD = 25
+
+# Each worker process runs this: lots of tiny one-row writes
+WORKER = """
+import contextlib, io, sys
+from main import ExpenseTracker
+tracker = ExpenseTracker(data_dir=sys.argv[1])
+with contextlib.redirect_stdout(io.StringIO()):  # Keep the output quiet
+    for i in range(int(sys.argv[2])):
+        tracker.add_transaction(f"Worker {sys.argv[3]} #{i}", 1.25, "Other", "")
+"""
+
+print("🧪 TESTING CONCURRENT WRITERS")
+print("=" * 50)
+
+here = os.path.dirname(os.path.abspath(__file__))
+with tempfile.TemporaryDirectory() as data_dir:
+    # 1. Separate processes, all sharing one data folder
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, data_dir, str(ADDS_PER_PROCESS), str(n)],
+            cwd=here,
+        )
+        for n in range(PROCESSES)
+    ]
+    assert all(worker.wait() == 0 for worker in workers)
+
+    tracker = ExpenseTracker(data_dir=data_dir)
+    total_rows = PROCESSES * ADDS_PER_PROCESS
+    assert len(list(tracker.storage.iter_rows())) == total_rows
+    assert tracker.balance == total_rows * 1.25, tracker.balance
+    ok, check = tracker.ledger.verify(tracker.balance)
+    assert ok, check  # Every row's Balance column follows from the one before
+    print(f"✅ {PROCESSES} processes x {ADDS_PER_PROCESS} adds: no lost updates")
+
+    # 2. Threads inside one process share commits (group commit)
+    fsyncs_before = tracker.journal.fsyncs
+
+    def add_many(n):
+        for i in range(ADDS_PER_THREAD):
+            tracker._commit([("2025-08-01 09:00:00", f"Thread {n} #{i}", -0.25, "Other", "")])
+
+    threads = [threading.Thread(target=add_many, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    writes = THREADS * ADDS_PER_THREAD
+    fsyncs = tracker.journal.fsyncs - fsyncs_before
+    assert len(list(tracker.storage.iter_rows())) == total_rows + writes
+    assert ExpenseTracker(data_dir=data_dir).balance == total_rows * 1.25 - writes * 0.25
+    assert fsyncs <= writes
+    print(f"✅ {THREADS} threads x {ADDS_PER_THREAD} adds: {writes} writes shared {fsyncs} fsyncs")
+
+    # 3. Crash recovery: journal record written, storage append never happened
+    position = tracker.storage.end_position()
+    balance = tracker.load_balance_cents() + 500  # Journaled rows hold whole cents
+    tracker.journal.write(position, [["2025-08-02 09:00:00", "Crash", 500, balance, "Other", ""]])
+    recovered = ExpenseTracker(data_dir=data_dir)
+    assert list(recovered.storage.iter_rows(last=1))[0].description == "Crash"
+    assert recovered.balance_cents == balance and recovered.journal.is_clean()
+    print("✅ Unapplied journal record is redone on startup")
+
+print("\n" + "=" * 50)
+print("✅ Concurrency testing complete!")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Test script for date-range queries and the CSV day -> byte offset index"""
+
+import os
+import tempfile
+
+from date_index import DateIndex
+from storage import CSVStorage, SQLiteStorage
+
+print("🧪 TESTING DATE INDEX")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    rows = []
+    balance = 0  # Cents
+    for day in range(1, 31):
+        for hour in (9, 18):
+            balance -= 100
+            rows.append(
+                [f"2025-08-{day:02d} {hour:02d}:00:00", f"Day {day}", -100, balance, "Other", ""]
+            )
+
+    csv_storage = CSVStorage(os.path.join(data_dir, "transactions.csv"))
+    csv_storage.append(rows[:20])
+    csv_storage.append(rows[20:])  # Index is extended, not rebuilt
+    sqlite_storage = SQLiteStorage(os.path.join(data_dir, "transactions.db"))
+    sqlite_storage.append(rows)
+
+    assert len(csv_storage.index.days) == 30
+    assert csv_storage.index.first == sorted(csv_storage.index.first)
+    # Append-only: the second append added one line instead of rewriting the file
+    with open(csv_storage.index.path) as f:
+        assert len(f.read().splitlines()) == 2
+    assert DateIndex(csv_storage.index.path).last == csv_storage.index.last
+    print("✅ One index entry per day, appended to the index file")
+
+    for storage in (csv_storage, sqlite_storage):
+        name = type(storage).__name__
+        week = list(storage.iter_rows(start_date="2025-08-10", end_date="2025-08-16"))
+        assert len(week) == 14, len(week)
+        assert week[0].date == "2025-08-10 09:00:00"
+        assert week[-1].date == "2025-08-16 18:00:00"
+        assert len(list(storage.iter_rows(start_date="2025-08-30"))) == 2
+        assert len(list(storage.iter_rows(end_date="2025-08-01"))) == 2
+        assert list(storage.iter_rows(start_date="2025-09-01")) == []
+        print(f"✅ {name}: inclusive date ranges match")
+
+    # The CSV read really starts mid-file, at the first row of the start day
+    with open(csv_storage.path, "rb") as f:
+        f.seek(csv_storage.index.span("2025-08-10")[0])
+        assert f.readline().startswith(b"2025-08-10 09:00:00")
+    print("✅ span() seeks straight to the first row of the day")
+
+    # An old CSV with no index gets indexed on first use
+    os.remove(csv_storage.index.path)
+    fresh = CSVStorage(csv_storage.path)
+    assert len(list(fresh.iter_rows(start_date="2025-08-10", end_date="2025-08-10"))) == 2
+    assert len(fresh.index.days) == 30
+    print("✅ Missing index is rebuilt automatically")
+
+    # A back-dated row only stretches its own day's span
+    fresh.append([["2025-08-05 12:00:00", "Late", -100, balance - 100, "Other", ""]])
+    assert len(list(fresh.iter_rows(start_date="2025-08-05", end_date="2025-08-05"))) == 3
+    assert len(list(fresh.iter_rows(start_date="2025-08-04", end_date="2025-08-06"))) == 7
+    assert fresh.index.find_end("2025-08-05") == fresh.end_position()
+    with open(fresh.path, "rb") as f:
+        f.seek(fresh.index.span("2025-08-20", "2025-08-22")[1])  # Other days: still exact
+        assert f.readline().startswith(b"2025-08-23 09:00:00")
+    week = list(fresh.iter_rows(start_date="2025-08-20", end_date="2025-08-22"))
+    assert [t.date[:10] for t in week[::2]] == ["2025-08-20", "2025-08-21", "2025-08-22"]
+    late = [t for t in fresh.iter_rows(end_date="2025-08-05") if t.description == "Late"]
+    assert len(late) == 1
+    print("✅ Out-of-order rows stay findable without a full scan")
+
+print("\n" + "=" * 50)
+print("✅ Date index testing complete!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test script for --stats instrumentation: latencies, rows, bytes, fsyncs"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from main import ExpenseTracker, report_stats
+
+print("🧪 TESTING INSTRUMENTATION")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    original_fsync = os.fsync
+    stats = tracker.enable_stats()
+    assert "append" in vars(tracker.storage)  # Wrapped on this object only
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for n in range(3):
+            tracker.add_transaction(f"Coffee {n}", -3.5, "Food & Dining", "")
+        tracker.add_transactions_bulk([("Row", -1, "Other", "")] * 1000, batch_size=500)
+        tracker.view_transactions(last=10)
+        tracker.filter_transactions_by_category("Food & Dining")
+        tracker.load_balance()
+
+    data = stats.dump()
+    operations = data["operations"]
+    assert operations["add_transaction"]["calls"] == 3
+    assert operations["_commit"]["calls"] == 5  # 3 single adds + 2 bulk batches
+    assert operations["storage.append"]["rows"] == 1003
+    assert operations["journal.write"]["rows"] == 1003
+    assert operations["storage.iter_rows"]["rows"] == 10 + 3  # Last 10 + 3 coffees
+    assert operations["load_balance_cents"]["calls"] >= 6  # Once per commit + ours
+    assert data["fsyncs"] >= 5  # At least one journal fsync per commit
+    commit = operations["_commit"]
+    assert sum(commit["histogram_us"].values()) == commit["calls"]
+    assert commit["min_us"] <= commit["mean_us"] <= commit["max_us"]
+    assert commit["p50_us"] <= commit["p99_us"]
+    if commit["bytes_written"] is not None:  # Linux: /proc/self/io
+        assert operations["storage.append"]["bytes_written"] > 1003 * 20
+        assert operations["storage.iter_rows"]["bytes_read"] > 0
+    print("✅ Calls, latency histograms, rows, bytes and fsyncs are counted")
+
+    # Table for --stats and JSON for --stats-json
+    json_path = os.path.join(data_dir, "stats.json")
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        report_stats(tracker, show=True, json_path=json_path)
+    assert "storage.append" in output.getvalue() and "fsync" in output.getvalue()
+    with open(json_path) as f:
+        assert json.load(f)["operations"]["storage.append"]["rows"] == 1003
+    print("✅ --stats table and machine-readable JSON dump")
+
+    # Off again: no wrappers left, os.fsync restored
+    tracker.disable_stats()
+    assert "append" not in vars(tracker.storage) and "add_transaction" not in vars(tracker)
+    assert os.fsync is original_fsync
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.add_transaction("After", -1, "Other", "")
+    assert operations["add_transaction"]["calls"] == 3
+    print("✅ Turning stats off removes every wrapper")
+
+print("\n" + "=" * 50)
+print("✅ Instrumentation testing complete!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test script for integer-cents money handling and the money migration"""
+
+import contextlib
+import io
+import os
+import tempfile
+from decimal import Decimal
+
+from main import ExpenseTracker
+from money import format_cents, parse_amount, parse_cents, to_cents
+
+print("🧪 TESTING MONEY (WHOLE CENTS)")
+print("=" * 50)
+
+assert to_cents("12.50") == 1250 and to_cents("-0.005") == 0 and to_cents("0.015") == 2
+assert to_cents(0.1 + 0.2) == 30 and to_cents(Decimal("1.999")) == 200 and to_cents(7) == 700
+assert format_cents(-5) == "-0.05" and format_cents(123456) == "1234.56"
+assert parse_cents("-12.50") == -1250 and parse_cents("-0.05") == -5 and parse_cents("1000.0") == 100000
+assert parse_cents("0.30000000000000004") == 30 and parse_cents("12345678901234567.89") == 1234567890123456789
+print("✅ Conversions are exact and round half-to-even")
+
+# float() accepts these, but none of them is an amount of money
+for text in ("inf", "-Infinity", "nan", "1e400"):
+    try:
+        parse_amount(text)
+        raise AssertionError(f"{text} should be rejected")
+    except ValueError:
+        pass
+assert parse_amount(" -3.50 ") == -3.5
+print("✅ Non-finite amounts are rejected with ValueError")
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    # 0.1 can't be stored exactly as a float - 10,000 float additions drift,
+    # 10,000 integer-cent additions don't
+    tracker.add_transactions_bulk([("Dime", 0.1, "Income", "")] * 10_000)
+    assert tracker.balance_cents == 100_000
+    with open(os.path.join(data_dir, "balance.txt")) as f:
+        assert f.read() == "1000.00"
+    with open(os.path.join(data_dir, "transactions.csv")) as f:
+        assert f.readlines()[-1].split(",")[2:4] == ["0.10", "1000.00"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok, _ = tracker.verify_balance()
+        assert tracker.category_summary()["Income"][1] == 1000.0
+    assert ok
+    print("✅ 10,000 additions of $0.10 add up to exactly $1,000.00")
+
+with tempfile.TemporaryDirectory() as data_dir:
+    # An older ledger written with float text (and one old 5-column row)
+    with open(os.path.join(data_dir, "transactions.csv"), "w", newline="") as f:
+        f.write("Date,Description,Amount,Balance,Category,Notes\r\n")
+        f.write("2025-08-01 09:00:00,Pay,1000.0,1000.0,Income,\r\n")
+        f.write("2025-08-02 09:00:00,Old row,-0.1,999.9,\r\n")
+        f.write("2025-08-03 09:00:00,Snack,-0.2,999.6999999999999,Food & Dining,\r\n")
+    with open(os.path.join(data_dir, "balance.txt"), "w") as f:
+        f.write("999.6999999999999")
+
+    tracker = ExpenseTracker(data_dir=data_dir)
+    assert tracker.balance_cents == 99970  # Old files load without migrating
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert tracker.migrate_money() == 3
+        ok, _ = tracker.verify_balance()
+    assert ok
+    with open(os.path.join(data_dir, "transactions.csv")) as f:
+        lines = f.read().splitlines()
+    assert lines[2] == "2025-08-02 09:00:00,Old row,-0.10,999.90,"  # Layout kept
+    assert lines[3].split(",")[2:4] == ["-0.20", "999.70"]
+    with open(os.path.join(data_dir, "balance.txt")) as f:
+        assert f.read() == "999.70"
+    # Byte offsets moved - the date index was rebuilt for the new file
+    found = list(tracker.storage.iter_rows(start_date="2025-08-03"))
+    assert [t.description for t in found] == ["Snack"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert tracker.migrate_money() == 0  # Already migrated - nothing to do
+    print("✅ Old float-text CSV and balance.txt migrated to two decimals")
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(storage="sqlite", data_dir=data_dir)
+    tracker.storage.append([["2025-08-02 09:00:00", "Lunch", -1250, 98750, "Food & Dining", ""]])
+    conn = tracker.storage.conn
+    assert conn.execute("SELECT amount, balance, typeof(amount) FROM transactions").fetchall() == [
+        (-1250, 98750, "integer")
+    ]
+    row = next(tracker.storage.iter_rows())
+    assert (row.amount, row.balance) == (-1250, 98750)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert tracker.migrate_money() == 0  # Nothing to round
+    print("✅ SQLite stores INTEGER cents")
+
+print("\n" + "=" * 50)
+print("✅ Money testing complete!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test script for the newest-first paged viewer"""
+
+import contextlib
+import io
+import tempfile
+from unittest import mock
+
+import storage
+import main
+from main import ExpenseTracker
+
+print("🧪 TESTING PAGED VIEWER")
+print("=" * 50)
+
+ROWS = [
+    (f"Item {i}", -1.0 - i, "Other", "note" if i % 3 == 0 else "", f"2025-08-{1 + i // 4:02d} 10:{i:02d}:00")
+    for i in range(30)
+]
+
+for backend in ["csv", "sqlite"]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        tracker = ExpenseTracker(storage=backend, data_dir=data_dir)
+        tracker.add_transactions_bulk(ROWS)
+        expected = [f"Item {i}" for i in reversed(range(30))]
+
+        # Tiny blocks so rows get split across block boundaries
+        with mock.patch.object(storage, "BACKWARD_BLOCK", 37):
+            newest_first = [t.description for _, t in tracker.storage.scan_backward()]
+        assert newest_first == expected, newest_first
+
+        # Walk every page; the bookmarks chain without gaps or repeats
+        position, seen = None, []
+        while True:
+            text, shown, position = tracker.render_page(position, page_size=7)
+            seen += [line.split(" | ")[1].strip() for line in text.splitlines() if " | " in line]
+            if position is None:
+                break
+        assert seen == expected, seen
+        print(f"✅ {backend}: newest-first pages cover every row once")
+
+        # Jump to a date: the page starts at the newest row of that day
+        position = tracker.storage.position_at_date("2025-08-03")
+        text, _, _ = tracker.render_page(position, page_size=2)
+        assert "Item 11" in text.splitlines()[0] and "Item 10" in text, text
+        early = tracker.storage.position_at_date("2024-01-01")
+        assert tracker.render_page(early)[1] == 0  # Nothing that old
+        print(f"✅ {backend}: jump to date")
+
+        # Interactive viewer: older, newer, quit - one write per page
+        answers = iter(["", "n", "d", "2025-08-02", "q"])
+        with mock.patch("builtins.input", lambda prompt="": next(answers)):
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                tracker.page_transactions(page_size=5)
+        pages = output.getvalue().split("TRANSACTION HISTORY")[1:]
+        assert len(pages) == 4
+        assert "Item 29" in pages[0] and "Item 24" in pages[1] and "Item 29" in pages[2]
+        assert "Item 7" in pages[3] and "Item 8" not in pages[3]
+        print(f"✅ {backend}: interactive paging")
+
+        # Page size: from --page-size, and changeable with "s" while paging
+        assert main.parse_args(["--page-size", "3"]).page_size == 3
+        answers = iter(["s", "2", "q"])
+        with mock.patch("builtins.input", lambda prompt="": next(answers)):
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                tracker.page_transactions(page_size=5)
+        pages = output.getvalue().split("TRANSACTION HISTORY")[1:]
+        assert [page.count("Item ") for page in pages] == [5, 2]
+        print(f"✅ {backend}: page size option")
+
+print("\n" + "=" * 50)
+print("✅ Paged viewer testing complete!")
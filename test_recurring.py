@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test script for recurring transactions: schedules, heap catch-up, crash safety"""
+
+import contextlib
+import io
+import tempfile
+import time
+from datetime import datetime
+
+from main import ExpenseTracker
+from recurring import RecurringScheduler, next_occurrence, parse_cron, _next_cron
+
+print("🧪 TESTING RECURRING TRANSACTIONS")
+print("=" * 50)
+
+# Monthly rules keep their day of the month, clamped in short months
+rule = {"schedule": "monthly", "day": 31}
+dates = [datetime(2024, 1, 31, 9)]
+for _ in range(3):
+    dates.append(next_occurrence(rule, dates[-1]))
+assert [d.strftime("%m-%d") for d in dates] == ["01-31", "02-29", "03-31", "04-30"]
+assert next_occurrence(rule, datetime(2024, 12, 31)) == datetime(2025, 1, 31)
+
+# Cron lines: 09:00 on the 1st and 15th; weekdays at 08:30; day OR weekday
+first_and_15th = parse_cron("0 9 1,15 * *")
+assert _next_cron(first_and_15th, datetime(2025, 8, 1, 9, 0)) == datetime(2025, 8, 15, 9, 0)
+weekdays = parse_cron("30 8 * * 1-5")
+assert _next_cron(weekdays, datetime(2025, 8, 15, 9, 0)) == datetime(2025, 8, 18, 8, 30)  # Fri -> Mon
+either = parse_cron("0 0 13 * 5")  # The 13th or any Friday
+assert _next_cron(either, datetime(2025, 8, 9)) == datetime(2025, 8, 13)
+assert _next_cron(parse_cron("*/15 * * * *"), datetime(2025, 8, 1, 10, 7)) == datetime(2025, 8, 1, 10, 15)
+try:
+    parse_cron("61 * * * *")
+    raise AssertionError("minute 61 should be rejected")
+except ValueError:
+    pass
+print("✅ daily / weekly / monthly / cron schedules")
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.add_recurring("Rent", -1200, "Bills & Utilities", "monthly", "2015-01-01 08:00:00")
+        tracker.add_recurring("Salary", 4000, "Income", "0 9 1,15 * *", "2015-01-01")
+        tracker.add_recurring("Coffee", -3.5, "Food & Dining", "daily", "2015-01-01 07:30:00")
+        tracker.add_recurring("Gym", -15, "Healthcare", "weekly", "2015-01-05 18:00:00")
+
+    # Ten years of missed occurrences: one commit, one fsync, rows in date order
+    fsyncs = tracker.journal.fsyncs
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        added = tracker.run_recurring(now=datetime(2025, 1, 1))
+    elapsed = time.perf_counter() - start
+    assert added == 120 + 240 + 3653 + 522, added
+    assert tracker.journal.fsyncs == fsyncs + 1
+    rows = list(tracker.storage.iter_rows())
+    assert [t.date for t in rows] == sorted(t.date for t in rows)
+    assert rows[0].description == "Coffee" and rows[0].date == "2015-01-01 07:30:00"
+    expected = 120 * -120000 + 240 * 400000 + 3653 * -350 + 522 * -1500
+    assert tracker.balance_cents == expected
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert tracker.run_recurring(now=datetime(2025, 1, 1)) == 0  # Nothing new is due
+        assert tracker.run_recurring(now=datetime(2025, 1, 1, 8)) == 2  # Coffee + rent
+    print(f"✅ 10 years ({added} rows) caught up in one write - {elapsed * 1000:.0f} ms")
+
+    # Crash after the rules were advanced but before the rows were written:
+    # the next run rolls the rules back and adds the rows exactly once
+    scheduler = tracker.recurring
+    previous = {rule_id: rule["next_due"] for rule_id, rule in scheduler.rules.items()}
+    entries = scheduler.due(datetime(2025, 1, 4))
+    scheduler.begin(tracker.storage.end_position(), previous, entries[0])
+    other = ExpenseTracker(data_dir=data_dir)  # Starts from the files on disk
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert other.run_recurring(now=datetime(2025, 1, 4)) == 3  # Salary + 2 coffees
+
+    # Crash after the rows were written but before finish(): nothing is repeated
+    scheduler = other.recurring
+    previous = {rule_id: rule["next_due"] for rule_id, rule in scheduler.rules.items()}
+    entries = scheduler.due(datetime(2025, 1, 5))
+    scheduler.begin(other.storage.end_position(), previous, entries[0])
+    other._commit_groups([entries])
+    again = ExpenseTracker(data_dir=data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert again.run_recurring(now=datetime(2025, 1, 5)) == 0
+        ok, _ = again.verify_balance()
+    assert ok
+    coffees = [t for t in again.storage.iter_rows(start_date="2025-01-01") if t.description == "Coffee"]
+    assert [t.date[:10] for t in coffees] == [f"2025-01-0{day}" for day in range(1, 5)]
+    print("✅ A crash between the rules file and the rows never loses or repeats a row")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert again.remove_recurring(3) and not again.remove_recurring(99)
+        assert again.run_recurring(now=datetime(2025, 1, 10)) == 1  # Gym on Monday the 6th, no coffee
+    assert RecurringScheduler(again.recurring.path).rules.keys() == {1, 2, 4}
+    print("✅ Removing a rule stops it")
+
+print("\n" + "=" * 50)
+print("✅ Recurring transactions testing complete!")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Test script for the Phase 4 reporting engine"""
+
+import reports
+from storage import Transaction
+
+print("🧪 TESTING REPORTS")
+print("=" * 50)
+
+rows = [
+    Transaction("2025-08-01 09:00:00", "Paycheck", 100000, 100000, "Income", ""),  # Cents
+    Transaction("2025-08-03 12:00:00", "Lunch", -1250, 98750, "Food & Dining", ""),
+    Transaction("2025-08-04 08:00:00", "Bus", -300, 98450, "Transportation", ""),
+    Transaction("2025-09-01 12:00:00", "Coffee", -400, 98050, "Uncategorized", ""),
+]
+columns = reports.load_columns(rows, ["Income", "Food & Dining", "Transportation"])
+assert columns.categories[-1] == "Uncategorized"  # New names get the next code
+assert columns.timestamps[0] == 1754038800  # 2025-08-01 09:00:00 UTC
+
+monthly = reports.period_report_python(columns, "month")
+assert [(m.period, m.count, m.income, m.expenses) for m in monthly] == [
+    ("2025-08", 3, 1000.0, 15.5),
+    ("2025-09", 1, 0.0, 4.0),
+]
+weekly = reports.period_report_python(columns, "week")
+assert [w.period for w in weekly] == [
+    "Week of 2025-07-28",  # Friday Aug 1st belongs to the week starting Monday Jul 28th
+    "Week of 2025-08-04",
+    "Week of 2025-09-01",
+], weekly
+assert len(reports.period_report_python(columns, "day")) == 4
+by_category = {c.category: c for c in reports.category_report_python(columns)}
+assert by_category["Food & Dining"].expenses == 12.5
+print("✅ Pure-Python reports are correct")
+
+if reports.np is not None:
+    big = reports.synthetic_columns(50_000)
+    for period in reports.PERIODS:
+        fast = reports.period_report_numpy(big, period)
+        slow = reports.period_report_python(big, period)
+        assert [(f.period, f.count) for f in fast] == [(s.period, s.count) for s in slow]
+        assert all(abs(f.net - s.net) < 1e-6 for f, s in zip(fast, slow))
+    fast = reports.category_report_numpy(big)
+    assert [f.count for f in fast] == [s.count for s in reports.category_report_python(big)]
+    print("✅ NumPy reports match the pure-Python ones")
+else:
+    print("⏭️  NumPy not installed - vectorized reports skipped")
+
+print("\n" + "=" * 50)
+print("✅ Reports testing complete!")
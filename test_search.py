@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Test script for full-text search over descriptions and notes"""
+
+import contextlib
+import io
+import tempfile
+
+from main import ExpenseTracker
+
+print("🧪 TESTING SEARCH")
+print("=" * 50)
+
+
+def found(tracker, query):
+    """Descriptions of the rows a search returns"""
+    tracker.search_index.catch_up(tracker.storage)
+    bookmarks = tracker.search_index.search(query)
+    return [t.description for t in tracker.storage.rows_at(bookmarks)]
+
+
+for backend in ["csv", "sqlite"]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        tracker = ExpenseTracker(storage=backend, data_dir=data_dir)
+        tracker.add_transactions_bulk(
+            [
+                ("Groceries", -50, "Food & Dining", "weekly shop"),
+                ("Coffee", -4, "Food & Dining", ""),
+                ("Grocery run", -20, "Food & Dining", "Weekly"),
+                ("Gas", -30, "Transportation", "road trip"),
+            ]
+        )
+        assert found(tracker, "coffee") == ["Coffee"]
+        assert found(tracker, "gro*") == ["Groceries", "Grocery run"]
+        assert found(tracker, "gro* WEEKLY") == ["Groceries", "Grocery run"]
+        assert found(tracker, "trip") == ["Gas"]
+        assert found(tracker, "coffee weekly") == []
+        print(f"✅ {backend}: word, prefix and multi-word AND queries")
+
+        # The loaded index follows every add
+        tracker.add_transaction("Coffee beans", -12, "Food & Dining", "")
+        assert found(tracker, "coffee") == ["Coffee", "Coffee beans"]
+
+        # A fresh tracker loads the saved index and catches up the rest
+        reopened = ExpenseTracker(storage=backend, data_dir=data_dir)
+        assert not reopened.search_index.loaded
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            assert reopened.search_transactions("coffee", last=1) == 2
+        assert "Coffee beans" in output.getvalue()
+        assert "1 of 2 matches shown" in output.getvalue()
+        print(f"✅ {backend}: index picked up by a new tracker")
+
+        tracker.reset_tracker()
+        assert found(tracker, "coffee") == []
+        tracker.add_transaction("Coffee", -3, "Food & Dining", "")
+        assert found(tracker, "coffee") == ["Coffee"]
+        print(f"✅ {backend}: reset clears the index")
+
+print("\n" + "=" * 50)
+print("✅ Search testing complete!")
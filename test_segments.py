@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test script for monthly segmented storage"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+from main import ExpenseTracker
+from segments import SegmentStorage
+
+print("🧪 TESTING SEGMENTED STORAGE")
+print("=" * 50)
+
+# 4 rows a day for the first 5 days of Jan-Jun 2025
+ROWS = [
+    (f"Row {month}-{day}-{n}", -1.5 if n else 100, "Income" if n == 0 else "Other", "", f"2025-{month:02d}-{day:02d} 1{n}:00:00")
+    for month in range(1, 7)
+    for day in range(1, 6)
+    for n in range(4)
+]
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(storage="segments", data_dir=data_dir)
+    tracker.add_transactions_bulk(ROWS)
+    storage = tracker.storage
+    files = sorted(os.listdir(storage.path))
+    assert files == [f"2025-0{m}.csv.gz" for m in range(1, 6)] + ["2025-06.csv", "segments.json"], files
+    first = storage.summaries()[0]
+    assert first["rows"] == 20 and first["footer"]["count"] == 20
+    assert first["footer"]["categories"]["Income"] == [5, 50000, 0]
+    assert first["footer"]["final_balance"] == "477.50"
+    assert storage.end_position() == len(ROWS) == len(list(storage.iter_rows()))
+    print("✅ One segment per month; older months sealed, gzipped, with footers")
+
+    # Count which segment files each query opens
+    opened = []
+    original_read = storage._read
+    storage._read = lambda entry: (opened.append(entry["file"]), original_read(entry))[1]
+
+    rows = list(storage.iter_rows(start_date="2025-03-02", end_date="2025-03-04"))
+    assert len(rows) == 12 and opened == ["2025-03.csv.gz"], opened
+    opened.clear()
+    assert [t.description for t in storage.iter_rows(last=2)] == ["Row 6-5-2", "Row 6-5-3"]
+    assert opened == ["2025-06.csv"]
+    opened.clear()
+    text, shown, _ = tracker.render_page(page_size=5)
+    assert shown == 5 and opened == ["2025-06.csv"]
+    storage._read = original_read
+    print("✅ Date ranges and recent history only open the segments they need")
+
+    # A second storage object (another process) sees new rows and rotations
+    other = SegmentStorage(storage.path)
+    assert other.end_position() == len(ROWS)
+    tracker.add_transactions_bulk([("July", -2, "Other", "", "2025-07-01 09:00:00")])
+    assert other.end_position() == len(ROWS) + 1
+    assert len(other.summaries()) == 6
+
+    # Everything that works off bookmarks keeps working
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok, _ = tracker.verify_balance()
+        assert tracker.search_transactions("row") == 120
+        assert tracker.search_transactions("jul*") == 1
+        assert tracker.category_summary("2025-02")["Income"][0] == 5
+    assert ok
+    position = storage.position_at_date("2025-04-03")
+    assert tracker.render_page(position, page_size=1)[0].count("Row 4-3-3") == 1
+    print("✅ Refresh across instances, verify, search, summary, jump-to-date")
+
+    # Compaction: small sealed months merge, rows and row numbers unchanged
+    before = list(storage.scan_from(0))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert tracker.compact_segments(min_rows=50) == (6, 2)
+    assert [e["months"] for e in storage.summaries()] == [
+        ["2025-01", "2025-03"],
+        ["2025-04", "2025-06"],
+    ]
+    assert storage.summaries()[0]["footer"]["count"] == 60
+    assert list(storage.scan_from(0)) == before
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        assert tracker.search_transactions("jul*") == 1
+    assert "July" in output.getvalue()
+    print("✅ Compaction merges small segments without moving any row")
+
+    # Crash recovery cuts back into a sealed segment
+    storage.truncate(30)
+    assert storage.end_position() == 30
+    assert [t.description for t in storage.iter_rows(last=1)] == ["Row 2-3-1"]
+    tracker.add_transactions_bulk([("Again", -1, "Other", "", "2025-02-10 09:00:00")])
+    assert storage.end_position() == 31
+    print("✅ Truncate reopens the segment holding the cut point")
+
+    tracker.reset_tracker()
+    assert not storage.exists() and os.listdir(storage.path) == []
+
+print("\n" + "=" * 50)
+print("✅ Segmented storage testing complete!")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Test script for service mode: one warm tracker, many socket clients"""
+
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from main import ExpenseTracker
+from server import TrackerClient, TrackerServer, serve
+
+CLIENTS = 8
+ADDS_PER_CLIENT = 25
+
+print("🧪 TESTING SERVICE MODE")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    socket_path = os.path.join(data_dir, "tracker.sock")
+
+    # Run the server's event loop in a background thread
+    loop = asyncio.new_event_loop()
+    server_task = loop.create_task(serve(tracker, socket_path=socket_path))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    while not os.path.exists(socket_path):
+        time.sleep(0.01)
+
+    def client_adds(n):
+        with TrackerClient(socket_path) as client:
+            for i in range(ADDS_PER_CLIENT):
+                client.call("add", description=f"C{n} #{i}", amount=2, category="Income")
+
+    clients = [threading.Thread(target=client_adds, args=(n,)) for n in range(CLIENTS)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+
+    with TrackerClient(socket_path) as client:
+        total = CLIENTS * ADDS_PER_CLIENT
+        assert client.call("balance")["balance"] == total * 2
+        assert len(client.call("query", last=5)["transactions"]) == 5
+        assert len(client.call("filter", category="Income")["transactions"]) == total
+        assert client.call("summary")["categories"]["Income"]["count"] == total
+        try:
+            client.call("add", description="x", amount=1, category="Nope")
+            raise AssertionError("bad category should be rejected")
+        except ValueError:
+            pass
+        try:
+            client.call("add", description="x", amount=1, category="Income", date="08/01/2025")
+            raise AssertionError("bad date should be rejected")
+        except ValueError:
+            pass
+        for amount in ("nan", "1e400", "abc"):
+            try:
+                client.call("add", description="x", amount=amount, category="Income")
+                raise AssertionError(f"amount {amount} should be rejected")
+            except ValueError:
+                pass
+        dated = client.call("add", description="x", amount=0, category="Income", date="2025-08-01")
+        assert dated["transaction"]["date"] == "2025-08-01 00:00:00"
+        print(f"✅ {total} concurrent adds all saved; query/filter/summary agree")
+
+        # Warm tracker = small requests are fast (no startup or file parsing)
+        start = time.perf_counter()
+        for _ in range(200):
+            client.call("balance")
+        per_call = (time.perf_counter() - start) / 200
+        print(f"✅ balance round trip: {per_call * 1000:.3f} ms")
+
+    loop.call_soon_threadsafe(server_task.cancel)
+    time.sleep(0.1)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+# A recurring catch-up on the worker thread raises its own alerts while a
+# client's add is being committed: the client only gets the alert its add
+# raised, and the recurring ones go to the console
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.set_budget("Bills & Utilities", "month", 1000)
+        tracker.add_recurring("Rent", -1200, "Bills & Utilities", "monthly", "2020-01-01")
+    service = TrackerServer(tracker)
+
+    async def recurring_then_add():
+        catch_up = asyncio.ensure_future(service._run(tracker.run_recurring, datetime(2025, 1, 1)))
+        add = {"description": "Repair", "amount": -900, "category": "Bills & Utilities"}
+        response = await service.add({**add, "date": "2025-03-05 10:00:00"})
+        return await catch_up, response
+
+    with contextlib.redirect_stdout(io.StringIO()) as console:
+        added, response = asyncio.run(asyncio.wait_for(recurring_then_add(), timeout=10))
+    service.executor.shutdown()
+    assert added == 61
+    assert response["alerts"] == [
+        "⚠️  Bills & Utilities is at 80% of budget for 2025-03: $900.00 of $1000.00"
+    ], response
+    assert console.getvalue().count("over budget") == 61
+    print("✅ Alerts from recurring rows never reach (or break) a client's add")
+
+# A bad amount fails only its own add, not the batch it arrived with
+with tempfile.TemporaryDirectory() as data_dir:
+    tracker = ExpenseTracker(data_dir=data_dir)
+    service = TrackerServer(tracker)
+
+    async def good_and_bad_adds():
+        adds = [
+            service.add({"description": "Good", "amount": 5, "category": "Income"}),
+            service.add({"description": "Bad", "amount": "1e400", "category": "Income"}),
+            service.add({"description": "Good too", "amount": 2.5, "category": "Income"}),
+        ]
+        return await asyncio.gather(*adds, return_exceptions=True)
+
+    first, bad, last = asyncio.run(asyncio.wait_for(good_and_bad_adds(), timeout=10))
+    service.executor.shutdown()
+    assert isinstance(bad, ValueError), bad
+    assert first["balance"] == 5 and last["balance"] == 7.5 and tracker.load_balance() == 7.5
+    assert service.batches == 1 and service.adds == 2
+    print("✅ A non-finite amount is rejected without failing the rest of its batch")
+
+    # A commit that fails part-way leaves the in-memory balance alone
+    good = ("2025-08-02 09:00:00", "Good", 5, "Income", "")
+    try:
+        tracker._commit([good, ("2025-08-02 09:00:00", "Bad", "nan", "Income", "")])
+        raise AssertionError("a nan amount should fail the commit")
+    except ValueError:
+        pass
+    assert tracker.balance == tracker.load_balance() == 7.5
+    print("✅ A failed commit never moves the in-memory balance")
+
+print("\n" + "=" * 50)
+print("✅ Service mode testing complete!")
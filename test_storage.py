@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Test script for the Phase 3 storage backends (CSV and SQLite)"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from storage import CSVStorage, SQLiteStorage
+
+print("🧪 TESTING STORAGE BACKENDS")
+print("=" * 50)
+
+with tempfile.TemporaryDirectory() as data_dir:
+    rows = [  # Money in whole cents, like the tracker hands it to storage
+        ["2025-08-01 09:00:00", "Paycheck", 100000, 100000, "Income", ""],
+        ["2025-08-02 12:30:00", "Lunch", -1250, 98750, "Food & Dining", "tacos"],
+        ["2025-08-03 08:15:00", "Bus pass", -4000, 94750, "Transportation", ""],
+        ["2025-08-04 19:00:00", "Groceries", -6000, 88750, "Food & Dining", ""],
+    ]
+
+    csv_storage = CSVStorage(os.path.join(data_dir, "transactions.csv"))
+    csv_storage.append(rows)
+
+    # Old 5-column files should still read back as "Uncategorized"
+    legacy = CSVStorage(os.path.join(data_dir, "legacy.csv"))
+    with open(legacy.path, "w") as f:
+        f.write("Date,Description,Amount,Balance,Notes\n")
+        f.write("2025-07-01 10:00:00,Coffee,-3.5,96.5,\n")
+    assert list(legacy.iter_rows())[0][4] == "Uncategorized"
+    print("✅ Legacy 5-column rows decode as Uncategorized")
+
+    sqlite_storage = SQLiteStorage(os.path.join(data_dir, "transactions.db"))
+    sqlite_storage.import_from(csv_storage)
+
+    for storage in (csv_storage, sqlite_storage):
+        name = type(storage).__name__
+        assert len(list(storage.iter_rows())) == 4
+        food = list(storage.iter_rows(category="Food & Dining"))
+        assert [row[1] for row in food] == ["Lunch", "Groceries"], food
+        assert food[0][2] == -1250 and food[0][5] == "tacos"
+        print(f"✅ {name}: all rows + category filter match")
+
+    # PAGINATION - offset/limit and last=N should agree across backends
+    for storage in (csv_storage, sqlite_storage):
+        name = type(storage).__name__
+        page = [t.description for t in storage.iter_rows(limit=2, offset=1)]
+        assert page == ["Lunch", "Bus pass"], page
+        tail = [t.description for t in storage.iter_rows(last=2)]
+        assert tail == ["Bus pass", "Groceries"], tail
+        food_tail = list(storage.iter_rows(category="Food & Dining", last=1))
+        assert food_tail[0].description == "Groceries"
+        print(f"✅ {name}: limit/offset and last=N paging match")
+
+    # The filter query should be answered by the (category, date) index
+    plan = sqlite_storage.conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM transactions "
+        "WHERE category = ? ORDER BY date, id",
+        ("Food & Dining",),
+    ).fetchall()
+    assert "idx_transactions_category_date" in str(plan), plan
+    print("✅ SQLite filter uses idx_transactions_category_date")
+
+    sqlite_storage.clear()
+    csv_storage.clear()
+    assert not sqlite_storage.exists() and not csv_storage.exists()
+    sqlite_storage.conn.close()
+    print("✅ clear() empties both backends")
+
+# Files are UTF-8 whatever the system's locale says (e.g. cp1252 on Windows):
+# this child process runs with an ASCII-only locale encoding
+LOCALE_CHECK = r"""
+import contextlib, io, locale, sys
+from main import ExpenseTracker
+assert locale.getpreferredencoding(False) != "UTF-8"
+cafe, note = "Caf\u00e9 \u2615", "cr\u00e8me br\u00fbl\u00e9e"  # Escaped: argv is ASCII here
+for kind in ("csv", "segments"):
+    tracker = ExpenseTracker(storage=kind, data_dir=sys.argv[1])
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.add_transaction(cafe, -4.5, "Food & Dining", note)
+        tracker.add_transaction("Bus", -2, "Transportation", "")
+        assert tracker.search_transactions("caf\u00e9") == 1
+    assert list(tracker.storage.iter_rows())[0].description == cafe
+    assert [t.notes for _, t in tracker.storage.scan_backward()] == ["", note]
+"""
+with tempfile.TemporaryDirectory() as data_dir:
+    ascii_locale = dict(os.environ, LC_ALL="C", PYTHONCOERCECLOCALE="0", PYTHONUTF8="0", PYTHONIOENCODING="utf-8")
+    here = os.path.dirname(os.path.abspath(__file__))
+    subprocess.run([sys.executable, "-c", LOCALE_CHECK, data_dir], cwd=here, env=ascii_locale, check=True)
+    print("✅ Non-ASCII text round-trips under a non-UTF-8 locale")
+
+print("\n" + "=" * 50)
+print("✅ Storage backend testing complete!")